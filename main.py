@@ -1,12 +1,7 @@
 import uvicorn
 from src.margdarshak_backend.main import app
+from src.margdarshak_backend.core.server import APP_IMPORT_STRING, uvicorn_options
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "src.margdarshak_backend.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,  # Enable auto-reload for development
-        workers=1,    # Number of worker processes
-        log_level="info"
-    )
\ No newline at end of file
+    # SERVER_ENV=production for multi-worker uvloop/httptools, otherwise auto-reload
+    uvicorn.run(APP_IMPORT_STRING, **uvicorn_options())
@@ -1,84 +1,294 @@
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any, List, Literal
+from fastapi import APIRouter, HTTPException, Path, Request, Response
+from typing import Dict, Any, AsyncIterator, List
 from datetime import datetime, time
+import asyncio
+import copy
 import logging
-import requests
-from enum import Enum
+import httpx
 from pydantic import BaseModel, Field, HttpUrl
-from PIL import Image
-import io
-from src.margdarshak_backend.core.gemini import model as gemini_model
+from src.margdarshak_backend.core.gemini import gemini
+from src.margdarshak_backend.core.gems import describe_gem, stream_gem_description
+from src.margdarshak_backend.core.streaming import sse_event, sse_response
 
-from margdarshak_backend.models.user import UserData
-from src.margdarshak_backend.core.database import db
+from src.margdarshak_backend.models.user import UserData
+from src.margdarshak_backend.core import users
 from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.http import http
+from src.margdarshak_backend.core.cache import chart_cache, make_key
+from src.margdarshak_backend.core.horoscope_feed import (
+    seconds_until_refresh,
+    sign_horoscopes,
+)
+from src.margdarshak_backend.core.http_caching import cache_control
+from src.margdarshak_backend.core.jobs import job_queue
+from src.margdarshak_backend.api.jobs import submit_job
+from src.margdarshak_backend.core.gazetteer import Place, gazetteer
+# ephemeris and vargas pull in NumPy, so they are imported where used
+from src.margdarshak_backend.core import chart_image
+from src.margdarshak_backend.models.horoscope import ZodiacSign, Day, ChartType
 
 router = APIRouter()
 
-class ZodiacSign(str, Enum):
-    ARIES = "Aries"
-    TAURUS = "Taurus"
-    GEMINI = "Gemini"
-    CANCER = "Cancer"
-    LEO = "Leo"
-    VIRGO = "Virgo"
-    LIBRA = "Libra"
-    SCORPIO = "Scorpio"
-    SAGITTARIUS = "Sagittarius"
-    CAPRICORN = "Capricorn"
-    AQUARIUS = "Aquarius"
-    PISCES = "Pisces"
-
-class Day(str, Enum):
-    TODAY = "TODAY"
-    TOMORROW = "TOMORROW"
-    YESTERDAY = "YESTERDAY"
-
-location = {
-    "Delhi": ("28.6139", "77.2090"),
-    "Mumbai": ("19.0760", "72.8777"),
-    "Kolkata": ("22.5726", "88.3639"),
-    "Chennai": ("13.0825", "80.2707"),
-    "Bengaluru": ("12.9716", "77.5946")
-}
-
-class ChartType(str, Enum):
-    D1 = "d1"
-    D2 = "d2"
-    D3 = "d3"
-    D4 = "d4"
-    D5 = "d5"
-    D6 = "d6"
-    D7 = "d7"
-    D8 = "d8"
-    D9 = "d9"
-    D10 = "d10"
-    D11 = "d11"
-    D12 = "d12"
-    D16 = "d16"
-    D20 = "d20"
-    D24 = "d24"
-    D27 = "d27"
-    D30 = "d30"
-    D40 = "d40"
-    D45 = "d45"
-    D60 = "d60"
-
 def chart_type_to_endpoint(chart_type: ChartType) -> str:
     if chart_type == ChartType.D1:
         return "horoscope-chart-url"
     elif chart_type == ChartType.D9:
         return "navamsa-chart-url"
     else:
-        return f"{chart_type}-chart-url"
+        return f"{chart_type.value}-chart-url"
+
+async def load_user(user_id: str) -> UserData:
+    """
+    Load and validate a user's birth data from MongoDB.
+    
+    Raises:
+        HTTPException: If user not found
+    """
+    user = await users.get_user(user_id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User data not found")
+    return user
+
+def resolve_place(user: UserData) -> Place:
+    """
+    Look up the coordinates and timezone of a user's birthplace.
+    
+    Raises:
+        HTTPException: If the user's location is unknown
+    """
+    place = gazetteer.lookup(user.city, user.state)
+    if place is None:
+        raise HTTPException(status_code=400, detail="Invalid location")
+    return place
+
+def build_chart_payload(user: UserData) -> Dict[str, Any]:
+    """
+    Build the Astrology API request body for a user's birth data.
+    
+    Raises:
+        HTTPException: If the user's location is unknown
+    """
+    place = resolve_place(user)
+    
+    # Extract date and time components
+    birth_date = user.date_of_birth
+    birth_time = user.time_of_birth
+    
+    return {
+        "year": birth_date.year,
+        "month": birth_date.month,
+        "date": birth_date.day,
+        "hours": birth_time.hour,
+        "minutes": birth_time.minute,
+        "seconds": birth_time.second,
+        "latitude": place.latitude,
+        "longitude": place.longitude,
+        "timezone": place.timezone,
+        "config": {
+            "observation_point": "topocentric",
+            "ayanamsha": "lahiri"
+        }
+    }
+
+def birth_from_payload(chart_data: Dict[str, Any]) -> datetime:
+    """Local birth date and time from a prepared birth payload."""
+    return datetime(
+        chart_data["year"],
+        chart_data["month"],
+        chart_data["date"],
+        chart_data["hours"],
+        chart_data["minutes"],
+        chart_data["seconds"]
+    )
+
+def compute_local_chart(
+    chart_data: Dict[str, Any],
+    chart_type: ChartType
+) -> Dict[str, Any]:
+    """
+    Compute a chart's placements in-process from a prepared birth payload.
+    
+    Positions are geocentric with Lahiri ayanamsa and whole-sign houses.
+    D1 includes degrees and retrograde flags; other chart types are
+    derived from the D1 longitudes. There is no chart image, so the
+    placements are returned under "placements" rather than "output".
+    """
+    from src.margdarshak_backend.core import ephemeris, vargas
+
+    birth = birth_from_payload(chart_data)
+    if chart_type == ChartType.D1:
+        chart = ephemeris.compute_chart(
+            birth,
+            chart_data["timezone"],
+            chart_data["latitude"],
+            chart_data["longitude"]
+        )
+    else:
+        chart = vargas.derive_vargas(
+            local_longitudes(chart_data),
+            [chart_type]
+        )[chart_type.value]
+    return {
+        "statusCode": 200,
+        "backend": "local",
+        "chart_type": chart_type.value,
+        "placements": chart
+    }
+
+def local_longitudes(chart_data: Dict[str, Any]) -> Dict[str, float]:
+    """Sidereal longitudes of the ascendant and planets from the local ephemeris."""
+    from src.margdarshak_backend.core import ephemeris
+
+    positions = ephemeris.sidereal_positions(
+        birth_from_payload(chart_data),
+        chart_data["timezone"],
+        chart_data["latitude"],
+        chart_data["longitude"]
+    )
+    return {"Ascendant": positions["ascendant"], **positions["longitudes"]}
+
+def parse_planet_longitudes(result: Any) -> Dict[str, float]:
+    """
+    Extract sidereal longitudes from an Astrology API planets response.
+    
+    Raises:
+        ValueError: If the response has no ascendant
+    """
+    longitudes: Dict[str, float] = {}
+    
+    def visit(node: Any, key: Any = None) -> None:
+        if isinstance(node, dict):
+            if "fullDegree" in node:
+                longitudes[node.get("name", key)] = float(node["fullDegree"])
+                return
+            for child_key, child in node.items():
+                visit(child, child_key)
+        elif isinstance(node, list):
+            for child in node:
+                visit(child)
+    
+    visit(result.get("output", result) if isinstance(result, dict) else result)
+    if "Ascendant" not in longitudes:
+        raise ValueError("Astrology API planets response has no ascendant")
+    return longitudes
+
+async def fetch_planet_longitudes(chart_data: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Get the D1 sidereal longitudes for a prepared birth payload, from the
+    local ephemeris or one cached Astrology API planets call.
+    
+    Raises:
+        httpx.HTTPError: If the Astrology API call fails
+    """
+    if settings.CHART_BACKEND == "local":
+        return local_longitudes(chart_data)
+    
+    cache_key = make_key("planets", chart_data)
+    cached = await chart_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    headers = {
+        'Content-Type': 'application/json',
+        'x-api-key': settings.ASTROLOGY_API_KEY
+    }
+    result = await http.request_json(
+        "astrology",
+        "POST",
+        "/planets",
+        headers=headers,
+        json=chart_data
+    )
+    longitudes = parse_planet_longitudes(result)
+    await chart_cache.set(cache_key, longitudes)
+    return longitudes
+
+async def localize_chart_image(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Replace the remote image URL in a chart URL response with our stored copy.
+    
+    "output" becomes the image's path on our API, which public_chart turns
+    into an absolute URL per request; the remote URL is kept as
+    "source_url". If the image cannot be stored, the response is returned
+    unchanged.
+    """
+    url = result.get("output") if isinstance(result, dict) else None
+    if not settings.CHART_IMAGE_STORE_ENABLED or not isinstance(url, str):
+        return result
+    if not url.startswith(("http://", "https://")):
+        return result
+    try:
+        content_hash = await chart_image.store_chart_image(url)
+    except Exception as e:
+        logging.error(f"Error storing chart image {url}: {str(e)}")
+        return result
+    # The upstream result may be shared with coalesced callers, so copy it
+    return {
+        **result,
+        "output": chart_image.chart_image_path(content_hash),
+        "source_url": url
+    }
 
-async def get_chart_data(user_id: str, chart_type: ChartType) -> Dict[str, Any]:
+def public_chart(result: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+    """
+    A chart result as returned to clients, with a stored image's path in
+    "output" made absolute against CHART_IMAGE_BASE_URL, or ``base_url``
+    (where the request came in) when that is not set.
+    """
+    url = result.get("output") if isinstance(result, dict) else None
+    if not isinstance(url, str) or not url.startswith("/"):
+        return result
+    base = settings.CHART_IMAGE_BASE_URL or base_url
+    return {**result, "output": base.rstrip("/") + url}
+
+async def fetch_chart(
+    chart_data: Dict[str, Any],
+    chart_type: ChartType
+) -> Dict[str, Any]:
+    """
+    Fetch one chart for a prepared birth payload, using the chart cache.
+    
+    Chart images always come from the Astrology API, whatever
+    CHART_BACKEND is, so "output" is always an image URL.
+    
+    Raises:
+        httpx.HTTPError: If the Astrology API call fails
+    """
+    # Chart results are deterministic for a given birth payload
+    cache_key = make_key(chart_type.value, chart_data)
+    cached = await chart_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    # Call astrology API
+    headers = {
+        'Content-Type': 'application/json',
+        'x-api-key': settings.ASTROLOGY_API_KEY
+    }
+    
+    result = await http.request_json(
+        "astrology",
+        "POST",
+        f"/{chart_type_to_endpoint(chart_type)}",
+        headers=headers,
+        json=chart_data
+    )
+    result = await localize_chart_image(result)
+    await chart_cache.set(cache_key, result)
+    return result
+
+async def get_chart_data(
+    user_id: str,
+    chart_type: ChartType,
+    base_url: str
+) -> Dict[str, Any]:
     """
     Common function to get chart data from Astrology API.
     
     Args:
         user_id: User's unique identifier
         chart_type: Type of chart to generate (ChartType)
+        base_url: Public base URL of this API, for stored chart image URLs
     
     Returns:
         dict: Response containing the chart URL
@@ -87,67 +297,145 @@ async def get_chart_data(user_id: str, chart_type: ChartType) -> Dict[str, Any]:
         HTTPException: If user not found or invalid location
     """
     try:
-        # Get user data from MongoDB
-        user_data = await db.get_db()["user_data"].find_one({"user_id": user_id})
-        if not user_data:
-            raise HTTPException(status_code=404, detail="User data not found")
-        
-        # Convert user data to model for validation
-        user = UserData(**user_data)
-        
-        # Get location coordinates
-        if user.city not in location:
-            raise HTTPException(status_code=400, detail="Invalid location")
-        latitude, longitude = location[user.city]
-        
-        # Extract date and time components
-        birth_date = user.date_of_birth
-        birth_time = user.time_of_birth
+        user = await load_user(user_id)
+        chart = await fetch_chart(build_chart_payload(user), chart_type)
+        return public_chart(chart, base_url)
         
-        # Prepare request data
-        chart_data = {
-            "year": birth_date.year,
-            "month": birth_date.month,
-            "date": birth_date.day,
-            "hours": birth_time.hour,
-            "minutes": birth_time.minute,
-            "seconds": birth_time.second,
-            "latitude": float(latitude),
-            "longitude": float(longitude),
-            "timezone": 5.5,  # IST
-            "config": {
-                "observation_point": "topocentric",
-                "ayanamsha": "lahiri"
-            }
-        }
-        
-        url = f"https://json.freeastrologyapi.com/{chart_type_to_endpoint(chart_type)}"
-        
-        # Call astrology API
-        headers = {
-            'Content-Type': 'application/json',
-            'x-api-key': settings.ASTROLOGY_API_KEY
-        }
-        
-        response = requests.post(
-            url,
-            headers=headers,
-            json=chart_data
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(f"Error fetching {chart_type.value} chart: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching {chart_type.value} chart: {str(e)}"
         )
-        response.raise_for_status()
-        return response.json()
-        
+
+class ChartsRequest(BaseModel):
+    user_id: str
+    chart_types: List[ChartType] = Field(default_factory=lambda: list(ChartType))
+
+@router.post("/charts")
+async def get_charts(
+    request: ChartsRequest,
+    http_request: Request
+) -> Dict[str, Any]:
+    """
+    Get several divisional charts for a user in one call.
+    
+    The user is loaded once and the charts are fetched concurrently, bounded
+    by CHART_BATCH_CONCURRENCY. A failing chart does not fail the batch.
+    
+    Args:
+        request: Contains user_id and the chart types to fetch
+            (defaults to every ChartType)
+    
+    Returns:
+        dict: "charts" mapping chart type to chart data, and "errors"
+            mapping chart type to the error for charts that failed
+    """
+    user = await load_user(request.user_id)
+    chart_data = build_chart_payload(user)
+    base_url = str(http_request.base_url)
+    
+    charts: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+    semaphore = asyncio.Semaphore(settings.CHART_BATCH_CONCURRENCY)
+    
+    async def fetch_one(chart_type: ChartType) -> None:
+        async with semaphore:
+            try:
+                chart = await fetch_chart(chart_data, chart_type)
+                charts[chart_type.value] = public_chart(chart, base_url)
+            except Exception as e:
+                logging.error(f"Error fetching {chart_type.value} chart: {str(e)}")
+                errors[chart_type.value] = str(e)
+    
+    # dict.fromkeys drops duplicates while keeping request order
+    await asyncio.gather(*(fetch_one(ct) for ct in dict.fromkeys(request.chart_types)))
+    
+    return {
+        "charts": {
+            ct.value: charts[ct.value]
+            for ct in request.chart_types if ct.value in charts
+        },
+        "errors": errors
+    }
+
+class VargasRequest(BaseModel):
+    user_id: str
+    chart_types: List[ChartType] = Field(default_factory=lambda: list(ChartType))
+
+class PlacementsRequest(BaseModel):
+    user_id: str
+    chart_type: ChartType = ChartType.D1
+
+@router.post("/placements")
+async def get_placements(request: PlacementsRequest) -> Dict[str, Any]:
+    """
+    Compute a chart's placements in-process with the local ephemeris.
+    
+    Unlike the chart image routes this needs no upstream call.
+    
+    Args:
+        request: Contains user_id and the chart type (defaults to D1)
+    
+    Returns:
+        dict: "placements" with the ascendant and each planet's sign and
+            house, plus degrees and retrograde flags for D1
+    
+    Raises:
+        HTTPException: If user not found or invalid location
+    """
+    try:
+        user = await load_user(request.user_id)
+        return compute_local_chart(build_chart_payload(user), request.chart_type)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logging.error(
+            f"Error computing {request.chart_type.value} placements: {str(e)}"
+        )
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error computing {request.chart_type.value} placements: {str(e)}"
+        )
+
+@router.post("/vargas")
+async def get_vargas(request: VargasRequest) -> Dict[str, Any]:
+    """
+    Derive divisional charts locally from one set of D1 longitudes.
+    
+    The longitudes come from a single (cached) Astrology API call, or the
+    local ephemeris, instead of one upstream call per chart.
+    
+    Args:
+        request: Contains user_id and the chart types to derive
+            (defaults to every ChartType)
+    
+    Returns:
+        dict: D1 sidereal "longitudes" and per chart type the ascendant
+            sign and each planet's sign and whole-sign house
+    """
+    from src.margdarshak_backend.core import vargas
+
+    try:
+        user = await load_user(request.user_id)
+        longitudes = await fetch_planet_longitudes(build_chart_payload(user))
+        return {
+            "longitudes": longitudes,
+            "charts": vargas.derive_vargas(longitudes, request.chart_types)
+        }
     except HTTPException:
         raise
     except Exception as e:
-        logging.error(f"Error fetching {chart_type} chart: {str(e)}")
+        logging.error(f"Error deriving divisional charts: {str(e)}")
         raise HTTPException(
             status_code=500,
-            detail=f"Error fetching {chart_type} chart: {str(e)}"
+            detail=f"Error deriving divisional charts: {str(e)}"
         )
 
 @router.post("/navamsa-chart")
-async def get_navamsa_chart(user_id: str) -> Dict[str, Any]:
+async def get_navamsa_chart(user_id: str, http_request: Request) -> Dict[str, Any]:
     """
     Get Navamsa chart URL from Astrology API using user's birth data.
     
@@ -157,10 +445,10 @@ async def get_navamsa_chart(user_id: str) -> Dict[str, Any]:
     Returns:
         dict: Response containing the chart URL
     """
-    return await get_chart_data(user_id, "navamsa")
+    return await get_chart_data(user_id, ChartType.D9, str(http_request.base_url))
 
 @router.post("/rasi-chart")
-async def get_rasi_chart(user_id: str) -> Dict[str, Any]:
+async def get_rasi_chart(user_id: str, http_request: Request) -> Dict[str, Any]:
     """
     Get Rasi (Birth) chart URL from Astrology API using user's birth data.
     
@@ -170,10 +458,10 @@ async def get_rasi_chart(user_id: str) -> Dict[str, Any]:
     Returns:
         dict: Response containing the chart URL
     """
-    return await get_chart_data(user_id, "rasi")
+    return await get_chart_data(user_id, ChartType.D1, str(http_request.base_url))
 
 @router.post("/d10-chart")
-async def get_d10_chart(user_id: str) -> Dict[str, Any]:
+async def get_d10_chart(user_id: str, http_request: Request) -> Dict[str, Any]:
     """
     Get D10 (Dasamsa) chart URL from Astrology API using user's birth data.
     The D10 chart is particularly used for career and profession analysis.
@@ -184,9 +472,10 @@ async def get_d10_chart(user_id: str) -> Dict[str, Any]:
     Returns:
         dict: Response containing the chart URL
     """
-    return await get_chart_data(user_id, "d10")
+    return await get_chart_data(user_id, ChartType.D10, str(http_request.base_url))
 
-@router.get("/daily")
+# The feed refreshes every sign shortly after IST midnight
+@router.get("/daily", dependencies=[cache_control(seconds_until_refresh)])
 async def get_daily_horoscope(
     sign: ZodiacSign,
     day: Day = Day.TODAY
@@ -202,20 +491,15 @@ async def get_daily_horoscope(
         dict: Horoscope data including date and prediction
     """
     try:
-        response = requests.get(
-            f"https://horoscope-app-api.vercel.app/api/v1/get-horoscope/daily",
-            params={"sign": sign, "day": day}
-        )
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
+        return await sign_horoscopes.get_daily(sign, day)
+    except httpx.HTTPError as e:
         logging.error(f"Error fetching horoscope: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Error fetching horoscope: {str(e)}"
         )
     
-@router.get("/monthly")
+@router.get("/monthly", dependencies=[cache_control(seconds_until_refresh)])
 async def get_monthly_horoscope(
     sign: ZodiacSign
 ) -> Dict[str, Any]:
@@ -229,58 +513,151 @@ async def get_monthly_horoscope(
         dict: Horoscope data including date and prediction
     """
     try:
-        response = requests.get(
-            f"https://horoscope-app-api.vercel.app/api/v1/get-horoscope/monthly",
-            params={"sign": sign}
-        )
-        response.raise_for_status()
-        return response.json()
-    except requests.RequestException as e:
+        return await sign_horoscopes.get_monthly(sign)
+    except httpx.HTTPError as e:
         logging.error(f"Error fetching horoscope: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail=f"Error fetching horoscope: {str(e)}"
         )
 
+@router.get("/chart-image/{content_hash}")
+async def get_chart_image(
+    content_hash: str = Path(..., pattern="^[0-9a-f]{64}$")
+) -> Response:
+    """
+    Serve a stored chart image.
+    
+    Images are addressed by the SHA-256 of their bytes, so a URL always
+    returns the same image and may be cached indefinitely.
+    
+    Args:
+        content_hash: SHA-256 hex digest from a chart response's "output" URL
+    
+    Returns:
+        Response: The image
+    
+    Raises:
+        HTTPException: If no image with that hash is stored
+    """
+    stored = await chart_image.load_chart_image(content_hash)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Chart image not found")
+    return Response(
+        content=stored["data"],
+        media_type=stored["content_type"],
+        headers={
+            "Cache-Control": "public, max-age=31536000, immutable",
+            "ETag": f'"{content_hash}"',
+            "X-Content-Type-Options": "nosniff",
+            # SVGs are served from the API origin; never let them run scripts
+            "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'"
+        }
+    )
+
 class ChartAnalysisRequest(BaseModel):
     image_url: HttpUrl
     chart_type: ChartType
 
+def chart_analysis_prompt(chart_type: ChartType) -> str:
+    # Fixed prompt for astrological chart analysis
+    return (
+        f"You are an expert astrologer. Analyze this {chart_type.value} astrological "
+        "chart and provide insights about the planetary positions and their "
+        "significance."
+    )
+
+async def stream_analysis(contents: List[Any], cache_key: str) -> AsyncIterator[str]:
+    """
+    Server-sent events forwarding analysis text chunks as Gemini produces
+    them, followed by "done". The analysis is cached once complete.
+    """
+    parts = []
+    try:
+        async for text in gemini.stream(contents):
+            parts.append(text)
+            yield sse_event("chunk", {"text": text})
+    except Exception as e:
+        logging.error(f"Error analyzing chart: {str(e)}")
+        yield sse_event("error", {"detail": f"Error analyzing chart: {str(e)}"})
+        return
+    await chart_image.chart_analysis_cache.set(cache_key, "".join(parts))
+    yield sse_event("done", {})
+
+async def replay_analysis(text: str) -> AsyncIterator[str]:
+    yield sse_event("chunk", {"text": text})
+    yield sse_event("done", {})
+
 @router.post("/analyze-chart")
-async def analyze_chart(request: ChartAnalysisRequest) -> Dict[str, Any]:
+async def analyze_chart(
+    request: ChartAnalysisRequest,
+    stream: bool = False,
+    background: bool = False
+) -> Dict[str, Any]:
     """
     Analyze an astrological chart image using Google's Gemini AI model.
     
     Args:
         request: Contains image URL of the astrological chart
             - image_url: URL of the chart image to analyze
+        stream: Stream the analysis as server-sent events instead
+        background: Run as a background job and answer 202 with its id
+            right away; poll /jobs/{job_id} for the analysis
     
     Returns:
         dict: Gemini's analysis of the astrological chart
     """
     try:
-        # Download image from URL
-        response = requests.get(str(request.image_url))
-        response.raise_for_status()
+        if background:
+            return await submit_job("chart_analysis", request.model_dump(mode="json"))
         
-        if not response.content:
+        # Our own chart images are read from the store, anything else is
+        # streamed with a size cap
+        stored = None
+        local_hash = chart_image.local_image_hash(str(request.image_url))
+        if local_hash is not None:
+            stored = await chart_image.load_chart_image(local_hash)
+        if stored is not None:
+            image, content_hash = stored["data"], local_hash
+        else:
+            image_url = str(request.image_url)
+            image, content_hash = await chart_image.download_image(image_url)
+        
+        if not image:
             raise HTTPException(status_code=400, detail="Empty image content")
-            
-        # Convert to PIL Image
-        img = Image.open(io.BytesIO(response.content))
         
-        # Fixed prompt for astrological chart analysis
-        prompt = f"You are an expert astrologer. Analyze this {request.chart_type} astrological chart and provide insights about the planetary positions and their significance."
+        # Same image and chart type always get the cached analysis
+        cache_key = chart_image.analysis_key(content_hash, request.chart_type.value)
+        cached = await chart_image.chart_analysis_cache.get(cache_key)
+        if cached is not None:
+            if stream:
+                return sse_response(replay_analysis(cached))
+            return {
+                "text": cached
+            }
+        
+        # Downsize and re-encode off the event loop
+        image_part = await asyncio.to_thread(chart_image.normalize_image, image)
+        contents = [chart_analysis_prompt(request.chart_type), image_part]
+        
+        if stream:
+            return sse_response(stream_analysis(contents, cache_key))
         
         # Generate response from Gemini
-        response = gemini_model.generate_content([prompt, img])
-        response.resolve()
+        text = await gemini.generate(contents)
+        await chart_image.chart_analysis_cache.set(cache_key, text)
         
         return {
-            "text": response.text
+            "text": text
         }
         
-    except requests.RequestException as e:
+    except HTTPException:
+        raise
+    except chart_image.ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except chart_image.UnsupportedImageError:
+        raise HTTPException(status_code=400, detail="Unsupported image format")
+    except httpx.HTTPError as e:
         logging.error(f"Error downloading image: {str(e)}")
         raise HTTPException(
             status_code=400,
@@ -293,99 +670,164 @@ async def analyze_chart(request: ChartAnalysisRequest) -> Dict[str, Any]:
             detail=f"Error analyzing chart: {str(e)}"
         )
 
+async def fetch_gem_suggestion(user: UserData) -> Dict[str, Any]:
+    """
+    Get gemstone suggestions for a user from the Vedic Rishi API.
+    
+    Returns:
+        dict: A private copy of the Vedic Rishi response, safe to modify
+    
+    Raises:
+        HTTPException: If the user's location is unknown
+        httpx.HTTPError: If the Vedic Rishi call fails
+    """
+    place = resolve_place(user)
+    
+    # Extract date and time components
+    birth_date = user.date_of_birth
+    birth_time = user.time_of_birth
+    
+    # Prepare request payload
+    payload = {
+        "apiName": "basic_gem_suggestion",
+        "userData": {
+            "nameu": user.name,
+            "birth": f"{user.city}, {user.state}",
+            "day": birth_date.day,
+            "month": birth_date.month,
+            "year": birth_date.year,
+            "min": birth_time.minute,
+            "hour": birth_time.hour,
+            "language": "english",
+            "gender": user.gender.value,
+            "tzone": place.timezone,
+            "country": "India",
+            "lat": str(place.latitude),
+            "lon": str(place.longitude)
+        }
+    }
+    
+    # Call Vedic Rishi API
+    headers = {
+        'Content-Type': 'application/json',
+        'Origin': 'https://vedicrishi.in',
+        'Referer': 'https://vedicrishi.in/'
+    }
+    
+    # Copy the shared upstream result before adding descriptions to it
+    return copy.deepcopy(await http.request_json(
+        "vedicrishi",
+        "POST",
+        '/vedicrishi',
+        headers=headers,
+        json=payload
+    ))
+
+async def add_gem_descriptions(vedic_response: Dict[str, Any]) -> None:
+    """Describe every suggested gem concurrently, in place."""
+    async def get_gem_description(key: str, value: dict) -> None:
+        value["gem_description"] = await describe_gem(
+            key, value["name"], value["semi_gem"]
+        )
+    
+    await asyncio.gather(*(
+        get_gem_description(key, value)
+        for key, value in vedic_response["response"].items()
+    ))
+
+async def stream_gem_suggestion(vedic_response: Dict[str, Any]) -> AsyncIterator[str]:
+    """
+    Server-sent events for a gem suggestion: the suggestion itself, then
+    description chunks for all gems as they are generated, then "done".
+    """
+    yield sse_event("suggestion", vedic_response)
+    
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    async def describe(key: str, value: dict) -> None:
+        try:
+            descriptions = stream_gem_description(key, value["name"], value["semi_gem"])
+            async for text in descriptions:
+                event = sse_event("gem_description", {"gem": key, "text": text})
+                await queue.put(event)
+        except Exception as e:
+            logging.error(f"Error describing gem {key}: {str(e)}")
+            await queue.put(sse_event("error", {"gem": key, "detail": str(e)}))
+    
+    tasks = [
+        asyncio.create_task(describe(key, value))
+        for key, value in vedic_response["response"].items()
+    ]
+    for task in tasks:
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+    try:
+        remaining = len(tasks)
+        while remaining:
+            event = await queue.get()
+            if event is None:
+                remaining -= 1
+                continue
+            yield event
+        yield sse_event("done", {})
+    finally:
+        # Client went away: stop generating descriptions nobody will read
+        for task in tasks:
+            task.cancel()
+
+async def replay_gem_suggestion(response: Dict[str, Any]) -> AsyncIterator[str]:
+    """The events of ``stream_gem_suggestion`` for an already described suggestion."""
+    suggestion = copy.deepcopy(response)
+    descriptions = {
+        key: value.pop("gem_description", "")
+        for key, value in suggestion["response"].items()
+    }
+    yield sse_event("suggestion", suggestion)
+    for key, text in descriptions.items():
+        yield sse_event("gem_description", {"gem": key, "text": text})
+    yield sse_event("done", {})
+
 @router.post("/gem-suggestion")
-async def get_gem_suggestion(user_id: str) -> Dict[str, Any]:
+async def get_gem_suggestion(
+    user_id: str,
+    stream: bool = False,
+    background: bool = False
+) -> Dict[str, Any]:
     """
     Get gemstone suggestions based on user's birth details from Vedic Rishi API,
     enriched with detailed descriptions from Gemini.
     
     Args:
         user_id: User's unique identifier
+        stream: Stream the descriptions as server-sent events instead
+        background: Run as a background job and answer 202 with its id
+            right away; poll /jobs/{job_id} for the suggestions
     
     Returns:
         dict: Gemstone suggestions with detailed descriptions
     """
     try:
-        # Get user data from MongoDB
-        user_data = await db.get_db()["user_data"].find_one({"user_id": user_id})
-        if not user_data:
-            raise HTTPException(status_code=404, detail="User data not found")
+        user = await load_user(user_id)
+        if background:
+            return await submit_job("gem_suggestion", {"user_id": user_id})
         
-        # Convert user data to model for validation
-        user = UserData(**user_data)
+        if settings.PREFETCH_ON_CREATE:
+            precomputed = (await users.get_precomputed(user_id)).get("gem_suggestion")
+            if precomputed is not None:
+                if stream:
+                    return sse_response(replay_gem_suggestion(precomputed))
+                return precomputed
         
-        # Get location coordinates
-        if user.city not in location:
-            raise HTTPException(status_code=400, detail="Invalid location")
-        latitude, longitude = location[user.city]
+        vedic_response = await fetch_gem_suggestion(user)
         
-        # Extract date and time components
-        birth_date = user.date_of_birth
-        birth_time = user.time_of_birth
+        if stream:
+            return sse_response(stream_gem_suggestion(vedic_response))
         
-        # Prepare request payload
-        payload = {
-            "apiName": "basic_gem_suggestion",
-            "userData": {
-                "nameu": user.name,
-                "birth": f"{user.city}, {user.state}",
-                "day": birth_date.day,
-                "month": birth_date.month,
-                "year": birth_date.year,
-                "min": birth_time.minute,
-                "hour": birth_time.hour,
-                "language": "english",
-                "gender": user.gender.value,
-                "tzone": 5.5,  # IST
-                "country": "India",
-                "lat": latitude,
-                "lon": longitude
-            }
-        }
-        
-        # Call Vedic Rishi API
-        headers = {
-            'Content-Type': 'application/json',
-            'Origin': 'https://vedicrishi.in',
-            'Referer': 'https://vedicrishi.in/'
-        }
-        
-        response = requests.post(
-            'https://workers.vedicrishi.in/vedicrishi',
-            headers=headers,
-            json=payload
-        )
-        response.raise_for_status()
-        vedic_response = response.json()
-
-        import asyncio
-        
-        async def get_gem_description(key: str, value: dict) -> None:
-            prompt = f"""You are an expert gemologist and astrologer. 
-            Provide a detailed description of the {key.lower()} gemstone and its astrological significance: {value["name"]} with semi gem {value["semi_gem"]}.
-            Include information about:
-            1. Physical properties
-            2. Astrological benefits
-            3. How to wear them
-            4. Best practices for using these gemstones
-            Format the response in clear sections."""
-
-            gemini_response = gemini_model.generate_content(prompt)
-            gemini_response.resolve()
-            value["gem_description"] = gemini_response.text
-
-        # Create tasks for each gem
-        tasks = []
-        for key, value in vedic_response["response"].items():
-            task = asyncio.create_task(get_gem_description(key, value))
-            tasks.append(task)
-            
-        # Wait for all tasks to complete
-        await asyncio.gather(*tasks)
-            
+        await add_gem_descriptions(vedic_response)
         return vedic_response
         
-    except requests.RequestException as e:
+    except HTTPException:
+        raise
+    except httpx.HTTPError as e:
         logging.error(f"Error fetching gem suggestions: {str(e)}")
         raise HTTPException(
             status_code=500,
@@ -398,3 +840,52 @@ async def get_gem_suggestion(user_id: str) -> Dict[str, Any]:
             detail=f"Error processing gem suggestions: {str(e)}"
         )
 
+async def run_gem_suggestion_job(params: Dict[str, Any]) -> Dict[str, Any]:
+    return await get_gem_suggestion(params["user_id"])
+
+async def run_chart_analysis_job(params: Dict[str, Any]) -> Dict[str, Any]:
+    return await analyze_chart(ChartAnalysisRequest(**params))
+
+# Charts and gems a new user is likely to open first
+PREFETCH_CHART_TYPES = (ChartType.D1, ChartType.D9, ChartType.D10)
+
+async def precompute_user(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute a new user's first-view charts and gem suggestion ahead of time.
+    
+    Charts land in the shared chart cache like any other fetch; the gem
+    suggestion is stored with the profile, where the gem route picks it up.
+    
+    Returns:
+        dict: Keys that were precomputed, and errors for those that failed
+    """
+    user_id = params["user_id"]
+    user = await load_user(user_id)
+    chart_data = build_chart_payload(user)
+    
+    async def chart(chart_type: ChartType) -> str:
+        await fetch_chart(chart_data, chart_type)
+        return f"chart_{chart_type.value}"
+    
+    async def gems() -> str:
+        vedic_response = await fetch_gem_suggestion(user)
+        await add_gem_descriptions(vedic_response)
+        await users.save_precomputed(user_id, "gem_suggestion", vedic_response)
+        return "gem_suggestion"
+    
+    tasks = [chart(chart_type) for chart_type in PREFETCH_CHART_TYPES] + [gems()]
+    names = [f"chart_{ct.value}" for ct in PREFETCH_CHART_TYPES] + ["gem_suggestion"]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    errors = {}
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            logging.error(f"Error precomputing {name} for {user_id}: {str(result)}")
+            errors[name] = str(result)
+    return {
+        "precomputed": [r for r in results if not isinstance(r, Exception)],
+        "errors": errors
+    }
+
+job_queue.register("gem_suggestion", run_gem_suggestion_job)
+job_queue.register("chart_analysis", run_chart_analysis_job)
+job_queue.register("user_prefetch", precompute_user)
@@ -0,0 +1,69 @@
+import logging
+from typing import Any, Dict
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.jobs import JobQueueFullError, job_queue
+
+router = APIRouter()
+
+async def submit_job(kind: str, params: Dict[str, Any]) -> ORJSONResponse:
+    """
+    Queue a background job and answer 202 Accepted with where to poll it.
+    
+    Raises:
+        HTTPException: 503 if this server already has too many pending jobs
+    """
+    try:
+        job_id = await job_queue.submit(kind, params)
+    except JobQueueFullError as e:
+        logging.warning(f"Rejected {kind} job: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Too many pending jobs, retry later",
+            headers={"Retry-After": "5"}
+        )
+    status_url = f"{settings.API_V1_STR}/jobs/{job_id}"
+    return ORJSONResponse(
+        status_code=202,
+        content={"job_id": job_id, "status": "queued", "status_url": status_url},
+        headers={"Location": status_url}
+    )
+
+@router.get("/stats")
+async def get_job_stats() -> Dict[str, Any]:
+    return job_queue.stats()
+
+@router.get("/{job_id}")
+async def get_job(
+    job_id: str,
+    wait: float = Query(0.0, ge=0, le=settings.JOB_MAX_WAIT_SECONDS,
+                        description="Seconds to wait for the job to finish (long poll)")
+) -> Dict[str, Any]:
+    """
+    Get a background job's status, and its result once finished.
+    
+    Args:
+        job_id: Id returned when the job was submitted
+        wait: Hold the request until the job finishes or this many seconds pass
+    
+    Returns:
+        dict: status ("queued", "running", "succeeded" or "failed"), plus
+            result on success or error (status_code, detail) on failure
+    
+    Raises:
+        HTTPException: If the job is unknown or has expired
+    """
+    try:
+        job = await job_queue.get(job_id, wait)
+    except Exception as e:
+        logging.error(f"Error fetching job {job_id}: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching job: {str(e)}"
+        )
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
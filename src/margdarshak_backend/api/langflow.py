@@ -1,16 +1,15 @@
-import json
+import asyncio
+import logging
 from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
-import requests
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
+import httpx
 
-from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.langflow import langflow
 
 router = APIRouter()
 
-with open('flow_endpoint.json', 'r') as file:
-    flow_endpoint = json.load(file)
-
 class AIRequest(BaseModel):
     message: str
     endpoint: str
@@ -18,7 +17,7 @@ class AIRequest(BaseModel):
     input_type: str = "chat"
 
 @router.post("/execute_ai")
-def run_flow(request: AIRequest) -> dict:
+async def run_flow(request: AIRequest, stream: bool = False) -> dict:
     """
     Run a flow with a given message.
 
@@ -28,18 +27,45 @@ def run_flow(request: AIRequest) -> dict:
             - endpoint: The ID or the endpoint name of the flow
             - output_type: Type of output (default: "chat")
             - input_type: Type of input (default: "chat")
+        stream: Pass Langflow's streaming output through as it is produced
     
     Returns:
-        dict: The JSON response from the flow
+        dict: The JSON response from the flow, or the raw Langflow stream
+    
+    Raises:
+        HTTPException: 504 if the flow times out, 502 if Langflow fails
     """
-    endpoint = flow_endpoint[request.endpoint] if request.endpoint in flow_endpoint else request.endpoint
-    api_url = f"{settings.LANGFLOW_API_URL}/lf/{settings.LANGFLOW_ID}/api/v1/run/{endpoint}"
-
     payload = {
         "input_value": request.message,
         "output_type": request.output_type,
         "input_type": request.input_type,
     }
-    headers = {"Authorization": f"Bearer {settings.LANGFLOW_API_KEY}", "Content-Type": "application/json"}
-    response = requests.post(api_url, json=payload, headers=headers)
-    return response.json()
\ No newline at end of file
+    try:
+        if stream:
+            media_type, body = await langflow.stream(request.endpoint, payload)
+            return StreamingResponse(
+                body,
+                media_type=media_type,
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+                background=BackgroundTask(body.aclose)
+            )
+        return await langflow.run(request.endpoint, payload)
+    except (asyncio.TimeoutError, httpx.TimeoutException):
+        raise HTTPException(
+            status_code=504,
+            detail=f"Flow {request.endpoint} timed out"
+        )
+    except httpx.HTTPStatusError as e:
+        logging.error(
+            f"Langflow returned {e.response.status_code} for flow {request.endpoint}"
+        )
+        raise HTTPException(
+            status_code=502,
+            detail=f"Langflow error: {e.response.status_code}"
+        )
+    except httpx.HTTPError as e:
+        logging.error(f"Error calling Langflow: {str(e)}")
+        raise HTTPException(
+            status_code=502,
+            detail=f"Error calling Langflow: {str(e)}"
+        )
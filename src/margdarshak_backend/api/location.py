@@ -0,0 +1,26 @@
+from typing import Any, Dict
+
+from fastapi import APIRouter, Query
+
+from src.margdarshak_backend.core.gazetteer import gazetteer
+from src.margdarshak_backend.core.http_caching import cache_control
+
+router = APIRouter()
+
+# The gazetteer only changes with a deploy
+@router.get("/search", dependencies=[cache_control(24 * 3600)])
+async def search_locations(
+    q: str = Query(..., min_length=1, description="Start of a place name"),
+    limit: int = Query(10, ge=1, le=50)
+) -> Dict[str, Any]:
+    """
+    Autocomplete birthplaces from the bundled gazetteer.
+    
+    Args:
+        q: Prefix of a place name or alias (case-insensitive)
+        limit: Maximum number of places to return
+    
+    Returns:
+        dict: Matching places with coordinates and timezone offset
+    """
+    return {"results": [place._asdict() for place in gazetteer.search(q, limit)]}
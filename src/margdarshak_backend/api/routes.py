@@ -1,9 +1,29 @@
 from fastapi import APIRouter, HTTPException
-from typing import Dict
+from fastapi.responses import PlainTextResponse
+from typing import Dict, Any, List
 
 from src.margdarshak_backend.api.langflow import router as langflow_router
 from src.margdarshak_backend.api.user import router as user_router
 from src.margdarshak_backend.api.horoscope import router as horoscope_router
+from src.margdarshak_backend.api.location import router as location_router
+from src.margdarshak_backend.api.jobs import router as jobs_router
+from src.margdarshak_backend.core.cache import cache_stats
+from src.margdarshak_backend.core.singleflight import singleflight_stats
+from src.margdarshak_backend.core.gemini import gemini
+from src.margdarshak_backend.core.langflow import langflow
+from src.margdarshak_backend.core.jobs import job_queue
+from src.margdarshak_backend.core.metrics import (
+    counter_lines,
+    gauge_lines,
+    render_metrics,
+)
+from src.margdarshak_backend.core.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    upstream_health,
+)
+from src.margdarshak_backend.core.users import user_cache
 
 router = APIRouter()
 
@@ -28,10 +48,137 @@ router.include_router(
     tags=["horoscope"]
 )
 
+# Include Location routes
+router.include_router(
+    location_router,
+    prefix="/location",
+    tags=["location"]
+)
+
+# Include background job routes
+router.include_router(
+    jobs_router,
+    prefix="/jobs",
+    tags=["jobs"]
+)
+
 @router.get("/health")
 async def health_check() -> Dict[str, str]:
     return {"status": "healthy"}
 
+@router.get("/health/upstreams")
+async def upstreams_health_check() -> Dict[str, Any]:
+    """
+    Circuit breaker state and retry counters per third-party upstream.
+    
+    Status is "degraded" while any upstream's circuit is not closed.
+    Upstreams appear once they have been called.
+    """
+    upstreams = upstream_health()
+    degraded = any(stats["state"] != CLOSED for stats in upstreams.values())
+    return {"status": "degraded" if degraded else "healthy", "upstreams": upstreams}
+
+@router.get("/cache/stats")
+async def get_cache_stats() -> Dict[str, Any]:
+    return cache_stats()
+
+@router.get("/coalescing/stats")
+async def get_coalescing_stats() -> Dict[str, Any]:
+    return singleflight_stats()
+
+@router.get("/gemini/stats")
+async def get_gemini_stats() -> Dict[str, Any]:
+    return gemini.stats()
+
+def scrape_time_metrics() -> List[str]:
+    """Counters and gauges read from the stats each component already keeps."""
+    caches = {"user": {"memory": user_cache.stats()}}
+    caches.update(cache_stats())
+    hits, misses, ratios = [], [], []
+    for name, stats in caches.items():
+        memory = stats["memory"]
+        hits.append(((name, "memory"), memory["hits"]))
+        misses.append(((name, "memory"), memory["misses"]))
+        found, lookups = memory["hits"], memory["hits"] + memory["misses"]
+        if "db_hits" in stats:
+            hits.append(((name, "db"), stats["db_hits"]))
+            misses.append(((name, "db"), stats["db_misses"]))
+            # Memory misses fall through to the database tier
+            found += stats["db_hits"]
+        ratios.append(((name,), found / lookups if lookups else 0.0))
+
+    coalescing = singleflight_stats()
+    breaker_states = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+    jobs = job_queue.stats()
+    gemini_stats = gemini.stats()
+    return [
+        *counter_lines(
+            "cache_hits_total", "Cache hits by cache and tier", ("cache", "tier"), hits
+        ),
+        *counter_lines(
+            "cache_misses_total",
+            "Cache misses by cache and tier",
+            ("cache", "tier"),
+            misses,
+        ),
+        *gauge_lines(
+            "cache_hit_ratio",
+            "Share of lookups served from any tier",
+            ("cache",),
+            ratios,
+        ),
+        *counter_lines(
+            "singleflight_collapsed_total",
+            "Calls that joined an in-flight call instead of executing",
+            ("group",),
+            [((name,), stats["collapsed"]) for name, stats in coalescing.items()],
+        ),
+        *counter_lines(
+            "gemini_tokens_total",
+            "Gemini tokens used",
+            ("kind",),
+            [
+                (("prompt",), gemini_stats["prompt_tokens"]),
+                (("output",), gemini_stats["output_tokens"]),
+            ],
+        ),
+        *gauge_lines(
+            "upstream_circuit_state",
+            "Circuit breaker state per upstream (0 closed, 1 half-open, 2 open)",
+            ("upstream",),
+            [
+                ((name,), breaker_states[stats["state"]])
+                for name, stats in upstream_health().items()
+            ],
+        ),
+        *gauge_lines(
+            "langflow_in_flight",
+            "Langflow runs in progress",
+            (),
+            [((), langflow.stats()["in_flight"])],
+        ),
+        *gauge_lines(
+            "jobs_pending",
+            "Background jobs of this process by state",
+            ("state",),
+            [(("queued",), jobs["queued"]), (("running",), jobs["running"])],
+        ),
+    ]
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Metrics in the Prometheus text exposition format.
+    
+    Covers route latency, upstream (Astrology API, Vedic Rishi, horoscope
+    app, Gemini, Langflow) latency and errors, MongoDB command timings and
+    cache hit ratios.
+    """
+    return PlainTextResponse(
+        render_metrics(scrape_time_metrics()),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 @router.get("/")
 async def root() -> Dict[str, str]:
     return {"message": "Welcome to MargDarshak Backend"}
\ No newline at end of file
@@ -1,10 +1,20 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from typing import Dict, Any, List
 from datetime import datetime, time
 import logging
 
-from margdarshak_backend.models.user import UserData
-from src.margdarshak_backend.core.database import db
+from pymongo.errors import DuplicateKeyError
+
+from src.margdarshak_backend.models.user import UserData
+from src.margdarshak_backend.core import users
+from src.margdarshak_backend.core.streaming import (
+    LineTooLongError,
+    iter_ndjson,
+    ndjson_response,
+)
+from src.margdarshak_backend.core.http_caching import cache_control
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.jobs import job_queue
 
 router = APIRouter()
 
@@ -17,16 +27,27 @@ async def create_user_data(data: UserData) -> Dict[str, Any]:
         data: User's information including birth details and location
     
     Returns:
-        dict: Confirmation message and user_id
+        dict: Confirmation message and user_id, plus prefetch_job_id when
+            PREFETCH_ON_CREATE queued precomputation of charts and gems
     """
     try:
-        user_data = data.model_dump()
-        result = await db.get_db()["user_data"].insert_one(user_data)
+        user_id = await users.create_user(data)
         
-        return {
+        response = {
             "message": "User data stored successfully",
-            "user_id": str(result.inserted_id)
+            "user_id": user_id
         }
+        if settings.PREFETCH_ON_CREATE:
+            try:
+                response["prefetch_job_id"] = await job_queue.submit(
+                    "user_prefetch", {"user_id": user_id}
+                )
+            except Exception as e:
+                # The user exists; they just pay full latency on first view
+                logging.warning(f"Skipped prefetch for {user_id}: {str(e)}")
+        return response
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="User already exists")
     except Exception as e:
         logging.error(f"Error storing user data: {str(e)}")
         raise HTTPException(
@@ -34,7 +55,51 @@ async def create_user_data(data: UserData) -> Dict[str, Any]:
             detail=f"Error storing user data: {str(e)}"
         )
 
-@router.get("/{user_id}")
+@router.post("/bulk")
+async def import_user_data(request: Request) -> Dict[str, Any]:
+    """
+    Import users from a streamed NDJSON body, one UserData object per line.
+    
+    Invalid or duplicate records are reported by line and skipped; the
+    rest are stored.
+    
+    Returns:
+        dict: Inserted and failed counts and the first errors by line
+    
+    Raises:
+        HTTPException: 413 if a line is longer than USER_IMPORT_MAX_LINE_BYTES;
+            records before it may already be stored
+    """
+    try:
+        lines = iter_ndjson(request.stream(), settings.USER_IMPORT_MAX_LINE_BYTES)
+        return await users.import_users(lines)
+    except LineTooLongError as e:
+        logging.warning(f"Rejected user import: {str(e)}")
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        logging.error(f"Error importing user data: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error importing user data: {str(e)}"
+        )
+
+@router.get("/export")
+async def export_user_data():
+    """
+    Stream every stored user as NDJSON.
+    
+    Returns:
+        StreamingResponse: One JSON object per line
+    
+    Raises:
+        HTTPException: 403 unless USER_EXPORT_ENABLED is set
+    """
+    if not settings.USER_EXPORT_ENABLED:
+        raise HTTPException(status_code=403, detail="User export is disabled")
+    return ndjson_response(users.export_users())
+
+# Personal data: clients revalidate with the ETag, shared caches never store it
+@router.get("/{user_id}", dependencies=[cache_control(0, private=True)])
 async def get_user_data(user_id: str) -> UserData:
     """
     Retrieve user's data.
@@ -46,10 +111,12 @@ async def get_user_data(user_id: str) -> UserData:
         HoroscopeData: User's information
     """
     try:
-        data = await db.get_db()["user_data"].find_one({"user_id": user_id})
-        if not data:
+        user = await users.get_user(user_id)
+        if user is None:
             raise HTTPException(status_code=404, detail="User data not found")
-        return UserData(**data)
+        return user
+    except HTTPException:
+        raise
     except Exception as e:
         logging.error(f"Error retrieving user data: {str(e)}")
         raise HTTPException(
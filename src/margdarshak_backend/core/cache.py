@@ -0,0 +1,229 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.database import db
+
+
+def make_key(*parts: Any) -> str:
+    """Build a stable hash key from JSON-serializable parts."""
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LRUCache:
+    """Size-bounded in-process LRU cache with hit/miss counters."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class SizedLRUCache(LRUCache):
+    """
+    LRU cache bounded by the total size of its values as well as their
+    count. Values larger than the whole budget are not kept at all.
+    """
+
+    def __init__(self, maxsize: int, max_bytes: int, sizeof: Callable[[Any], int]):
+        super().__init__(maxsize)
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self._sizes: Dict[Hashable, int] = {}
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self.pop(key)
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+        self._data[key] = value
+        self._sizes[key] = size
+        self.bytes += size
+        while len(self._data) > self.maxsize or self.bytes > self.max_bytes:
+            oldest, _ = self._data.popitem(last=False)
+            self.bytes -= self._sizes.pop(oldest)
+
+    def pop(self, key: Hashable) -> None:
+        super().pop(key)
+        self.bytes -= self._sizes.pop(key, 0)
+
+    def clear(self) -> None:
+        super().clear()
+        self._sizes.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {**super().stats(), "bytes": self.bytes, "max_bytes": self.max_bytes}
+
+
+class TTLCache(LRUCache):
+    """LRU cache whose entries also expire ``ttl_seconds`` after being set."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        super().__init__(maxsize)
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = super().get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            self.pop(key)
+            self.hits -= 1
+            self.misses += 1
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        super().set(key, (value, time.monotonic() + self.ttl_seconds))
+
+
+class TieredCache:
+    """
+    Two-tier cache: an in-process LRU in front of a MongoDB collection
+    whose documents expire through a TTL index on ``created_at``.
+
+    MongoDB errors are logged and treated as misses so a cache outage
+    never fails the request that uses it; use ``write`` where a lost
+    write matters. Pass ``memory`` to bound the in-process tier some other
+    way than by entry count.
+    """
+
+    registry: Dict[str, "TieredCache"] = {}
+
+    def __init__(
+        self,
+        name: str,
+        collection: str,
+        maxsize: int,
+        ttl_seconds: int,
+        memory: Optional[LRUCache] = None,
+    ):
+        self.name = name
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.memory = memory if memory is not None else LRUCache(maxsize)
+        self.db_hits = 0
+        self.db_misses = 0
+        TieredCache.registry[name] = self
+
+    async def ensure_indexes(self) -> None:
+        """Create the TTL index backing this cache."""
+        try:
+            await db.get_db()[self.collection].create_index(
+                "created_at", expireAfterSeconds=self.ttl_seconds
+            )
+        except Exception as e:
+            logging.error(f"Error creating TTL index for {self.collection}: {str(e)}")
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        try:
+            doc = await db.get_db()[self.collection].find_one({"_id": key})
+        except Exception as e:
+            logging.error(f"Error reading {self.name} cache: {str(e)}")
+            return None
+        if doc is None:
+            self.db_misses += 1
+            return None
+        self.db_hits += 1
+        self.memory.set(key, doc["value"])
+        return doc["value"]
+
+    async def set(self, key: str, value: Any) -> None:
+        self.memory.set(key, value)
+        try:
+            await self._write_db(key, value)
+        except Exception as e:
+            logging.error(f"Error writing {self.name} cache: {str(e)}")
+
+    async def write(self, key: str, value: Any) -> None:
+        """
+        Store an entry in both tiers, MongoDB first.
+
+        Raises:
+            Exception: The MongoDB error, if the write failed; the entry is
+                then not cached in memory either
+        """
+        await self._write_db(key, value)
+        self.memory.set(key, value)
+
+    async def _write_db(self, key: str, value: Any) -> None:
+        await db.get_db()[self.collection].replace_one(
+            {"_id": key},
+            {"_id": key, "value": value, "created_at": datetime.now(timezone.utc)},
+            upsert=True,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory": self.memory.stats(),
+            "db_hits": self.db_hits,
+            "db_misses": self.db_misses,
+        }
+
+
+def cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters for every registered tiered cache."""
+    return {name: cache.stats() for name, cache in TieredCache.registry.items()}
+
+
+async def ensure_cache_indexes() -> None:
+    """Create TTL indexes for every registered tiered cache."""
+    for cache in TieredCache.registry.values():
+        await cache.ensure_indexes()
+
+
+# Chart results can point at stored chart images, so the in-process tier
+# expires too: an entry never outlives the image it references
+chart_cache = TieredCache(
+    "chart",
+    "chart_cache",
+    maxsize=settings.CHART_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CHART_CACHE_TTL_SECONDS,
+    memory=TTLCache(settings.CHART_CACHE_MAX_ENTRIES, settings.CHART_CACHE_TTL_SECONDS),
+)
@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import importlib.util
+import io
+import re
+from typing import Any, Dict, Optional, Tuple
+
+from src.margdarshak_backend.core.cache import SizedLRUCache, TieredCache, make_key
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.http import http
+from src.margdarshak_backend.core.singleflight import SingleFlight
+
+# SVG rasterization needs the optional ``cairosvg`` package; SVGs are stored
+# as-is without it.
+RASTERIZE_AVAILABLE = importlib.util.find_spec("cairosvg") is not None
+
+# Our own chart image URLs, as built by chart_image_path
+LOCAL_IMAGE_PATH = re.compile(r"/horoscope/chart-image/([0-9a-f]{64})$")
+
+# Bump when the analysis prompt changes so cached analyses are regenerated
+ANALYSIS_PROMPT_VERSION = 1
+
+chart_analysis_cache = TieredCache(
+    "chart_analysis",
+    "chart_analyses",
+    maxsize=settings.CHART_ANALYSIS_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CHART_ANALYSIS_CACHE_TTL_SECONDS,
+)
+
+
+# A chart cache entry lives up to CHART_CACHE_TTL_SECONDS in MongoDB, and
+# once read it can live that long again in a process's memory tier. Images
+# are written just before the entry that references them, so they are kept
+# for three chart TTLs to outlast both with room to spare.
+CHART_IMAGE_TTL_SECONDS = 3 * settings.CHART_CACHE_TTL_SECONDS
+
+# Chart images by SHA-256 of their stored bytes. Images are capped at
+# CHART_IMAGE_MAX_BYTES, well under MongoDB's document limit, so they are
+# stored inline rather than in GridFS. The in-process tier is bounded by
+# total bytes, not just entry count.
+chart_image_store = TieredCache(
+    "chart_image",
+    "chart_images",
+    maxsize=settings.CHART_IMAGE_STORE_MAX_ENTRIES,
+    ttl_seconds=CHART_IMAGE_TTL_SECONDS,
+    memory=SizedLRUCache(
+        settings.CHART_IMAGE_STORE_MAX_ENTRIES,
+        settings.CHART_IMAGE_STORE_MAX_BYTES,
+        sizeof=lambda image: len(image["data"]),
+    ),
+)
+
+chart_image_downloads = SingleFlight("chart_image")
+
+
+class ImageTooLargeError(ValueError):
+    """Raised when a chart image exceeds the configured byte or pixel limit."""
+
+
+class UnsupportedImageError(ValueError):
+    """Raised when chart image data is not in a format Pillow can read."""
+
+
+async def download_image(url: str) -> Tuple[bytes, str]:
+    """
+    Stream an image download, stopping as soon as it exceeds the byte limit.
+
+    Returns:
+        tuple: Raw image bytes and their SHA-256 hex digest
+
+    Raises:
+        ImageTooLargeError: If the image is larger than CHART_IMAGE_MAX_BYTES
+        httpx.HTTPError: If the download fails
+    """
+    limit = settings.CHART_IMAGE_MAX_BYTES
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    async with http.get_client().stream("GET", url) as response:
+        response.raise_for_status()
+        declared = response.headers.get("content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            raise ImageTooLargeError(f"Image is larger than {limit} bytes")
+        async for chunk in response.aiter_bytes():
+            buffer.extend(chunk)
+            if len(buffer) > limit:
+                raise ImageTooLargeError(f"Image is larger than {limit} bytes")
+            digest.update(chunk)
+    return bytes(buffer), digest.hexdigest()
+
+
+def normalize_image(data: bytes) -> Dict[str, Any]:
+    """
+    Downsize and re-encode an image for the model.
+
+    CPU-bound; call it through ``asyncio.to_thread``. Only the header is read
+    until the size has been checked, and JPEGs are decoded at reduced scale.
+
+    Returns:
+        dict: Gemini inline image part (``mime_type`` and ``data``)
+
+    Raises:
+        ImageTooLargeError: If the image has more than CHART_IMAGE_MAX_PIXELS
+        UnsupportedImageError: If the data is not a supported image
+    """
+    # Deferred: Pillow is only needed once an image is actually analyzed
+    from PIL import Image, UnidentifiedImageError
+
+    max_side = settings.CHART_IMAGE_MAX_SIDE
+    try:
+        img = Image.open(io.BytesIO(data))
+    except UnidentifiedImageError as e:
+        raise UnsupportedImageError(str(e)) from e
+    with img:
+        if img.width * img.height > settings.CHART_IMAGE_MAX_PIXELS:
+            raise ImageTooLargeError(
+                f"Image has more than {settings.CHART_IMAGE_MAX_PIXELS} pixels"
+            )
+        source_format = img.format
+        img.draft("RGB", (max_side, max_side))
+        img.thumbnail((max_side, max_side))
+        out = io.BytesIO()
+        # Photos stay JPEG; line-art charts keep a lossless encoding
+        if source_format == "JPEG":
+            img.convert("RGB").save(out, format="JPEG", quality=85)
+            mime_type = "image/jpeg"
+        else:
+            img.convert("RGBA").save(out, format="PNG", optimize=True)
+            mime_type = "image/png"
+    return {"mime_type": mime_type, "data": out.getvalue()}
+
+
+def analysis_key(content_hash: str, chart_type: str) -> str:
+    """Cache key for an analysis of one image as one chart type."""
+    return make_key(ANALYSIS_PROMPT_VERSION, content_hash, chart_type)
+
+
+def sniff_image_type(data: bytes) -> str:
+    """
+    Media type of image data, from its leading bytes.
+
+    Raises:
+        UnsupportedImageError: If the data is not a PNG, JPEG, GIF, WebP or SVG
+    """
+    if data.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if data.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if data.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if b"<svg" in data[:1024]:
+        return "image/svg+xml"
+    raise UnsupportedImageError("Not a PNG, JPEG, GIF, WebP or SVG image")
+
+
+def rasterize_svg(data: bytes) -> bytes:
+    """Render an SVG chart to PNG. CPU-bound; call it through ``asyncio.to_thread``."""
+    import cairosvg
+
+    return cairosvg.svg2png(bytestring=data, output_width=settings.CHART_IMAGE_MAX_SIDE)
+
+
+def chart_image_path(content_hash: str) -> str:
+    return f"{settings.API_V1_STR}/horoscope/chart-image/{content_hash}"
+
+
+def local_image_hash(url: str) -> Optional[str]:
+    """The content hash if ``url`` points at our own chart image route."""
+    match = LOCAL_IMAGE_PATH.search(url.split("?", 1)[0])
+    return match.group(1) if match else None
+
+
+async def store_chart_image(url: str) -> str:
+    """
+    Download a chart image once and keep it in the chart image store.
+
+    The image is written to MongoDB before its hash is returned, so a URL
+    pointing at the store is never handed out for an image it lacks.
+
+    SVGs are rendered to PNG when CHART_IMAGE_RASTERIZE is set and
+    ``cairosvg`` is installed. Concurrent calls for one URL share a download.
+
+    Returns:
+        str: SHA-256 hex digest of the stored image
+
+    Raises:
+        ImageTooLargeError: If the image is larger than CHART_IMAGE_MAX_BYTES
+        UnsupportedImageError: If the download is not an image
+        httpx.HTTPError: If the download fails
+        Exception: If the image could not be written to MongoDB
+    """
+    async def fetch() -> str:
+        data, content_hash = await download_image(url)
+        content_type = sniff_image_type(data)
+        if (
+            content_type == "image/svg+xml"
+            and settings.CHART_IMAGE_RASTERIZE
+            and RASTERIZE_AVAILABLE
+        ):
+            data = await asyncio.to_thread(rasterize_svg, data)
+            content_type = "image/png"
+            content_hash = hashlib.sha256(data).hexdigest()
+        image = {"content_type": content_type, "data": data}
+        await chart_image_store.write(content_hash, image)
+        return content_hash
+
+    return await chart_image_downloads.do(url, fetch)
+
+
+async def load_chart_image(content_hash: str) -> Optional[Dict[str, Any]]:
+    """A stored chart image (``content_type`` and ``data``), or None."""
+    return await chart_image_store.get(content_hash)
@@ -1,29 +1,134 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 from urllib.parse import quote_plus
 
 class Settings(BaseSettings):
     APP_NAME: str = "MargDarshak Backend"
-    DEBUG_MODE: bool = True
+    DEBUG_MODE: bool = False
     API_V1_STR: str = "/api"
+
+    # Server settings: "development" runs one auto-reloading worker,
+    # "production" one worker per core (or SERVER_WORKERS) on uvloop/httptools
+    SERVER_ENV: Literal["development", "production"] = "development"
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: Optional[int] = None
     
     # Langflow settings
     LANGFLOW_API_URL: str = "http://localhost:7860"
     LANGFLOW_API_KEY: Optional[str] = None
     LANGFLOW_ID: Optional[str] = None
+    LANGFLOW_FLOW_ENDPOINTS_FILE: str = "flow_endpoint.json"
+    LANGFLOW_TIMEOUT_SECONDS: float = 120.0
+    LANGFLOW_MAX_CONCURRENCY: int = 32
     
     # MongoDB Atlas settings
     MONGODB_URL: str
     MONGODB_DB_NAME: str
     MONGODB_USERNAME: Optional[str] = None
     MONGODB_PASSWORD: Optional[str] = None
+    # Per worker process: the deployment opens SERVER_WORKERS times this many
+    MONGODB_MAX_POOL_SIZE: int = 10
 
     # Astrology API settings
     ASTROLOGY_API_KEY: Optional[str] = None
     
     # Gemini API settings
     GEMINI_API_KEY: Optional[str] = None
+    GEMINI_MODEL: str = "gemini-1.5-flash"
+    GEMINI_MAX_CONCURRENCY: int = 8
+    GEMINI_TIMEOUT_SECONDS: float = 60.0
+    GEMINI_MAX_RETRIES: int = 3
+    GEMINI_RETRY_BASE_DELAY: float = 0.5
+
+    # Upstream HTTP client settings
+    ASTROLOGY_API_URL: str = "https://json.freeastrologyapi.com"
+    VEDICRISHI_API_URL: str = "https://workers.vedicrishi.in"
+    HOROSCOPE_APP_API_URL: str = "https://horoscope-app-api.vercel.app"
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 30.0
+    HTTP_POOL_TIMEOUT: float = 10.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP2_ENABLED: bool = True
+
+    # Response compression
+    GZIP_MINIMUM_SIZE: int = 1024
+    GZIP_COMPRESS_LEVEL: int = 6
+
+    # Upstream circuit breakers and retries
+    UPSTREAM_FAILURE_THRESHOLD: int = 5
+    UPSTREAM_RESET_TIMEOUT_SECONDS: float = 30.0
+    UPSTREAM_MAX_RETRIES: int = 2
+    UPSTREAM_RETRY_BASE_DELAY: float = 0.2
+    UPSTREAM_RETRY_BUDGET_RATIO: float = 0.1
+    UPSTREAM_RETRY_BUDGET_MIN: int = 10
+    # Overall limit for one upstream call, retries and backoff included
+    UPSTREAM_CALL_DEADLINE_SECONDS: float = 45.0
+
+    # Cache settings
+    CHART_CACHE_MAX_ENTRIES: int = 2048
+    CHART_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    GEM_CACHE_MAX_ENTRIES: int = 512
+    GEM_CACHE_TTL_SECONDS: int = 180 * 24 * 3600
+    CHART_ANALYSIS_CACHE_MAX_ENTRIES: int = 1024
+    CHART_ANALYSIS_CACHE_TTL_SECONDS: int = 30 * 24 * 3600
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 60.0
+
+    # Bulk user import/export
+    USER_IMPORT_CHUNK_SIZE: int = 1000
+    USER_EXPORT_BATCH_SIZE: int = 1000
+    USER_IMPORT_MAX_ERRORS: int = 100
+    USER_IMPORT_MAX_LINE_BYTES: int = 64 * 1024
+    # Export streams every profile, so it is off unless explicitly enabled
+    USER_EXPORT_ENABLED: bool = False
+
+    # Chart image ingest limits
+    CHART_IMAGE_MAX_BYTES: int = 10 * 1024 * 1024
+    CHART_IMAGE_MAX_PIXELS: int = 40_000_000
+    CHART_IMAGE_MAX_SIDE: int = 1536
+
+    # Chart images from the Astrology API, stored and served by us
+    CHART_IMAGE_STORE_ENABLED: bool = True
+    CHART_IMAGE_STORE_MAX_ENTRIES: int = 256
+    # Memory held by the in-process tier of the image store
+    CHART_IMAGE_STORE_MAX_BYTES: int = 64 * 1024 * 1024
+    CHART_IMAGE_RASTERIZE: bool = False
+    # Base of chart image URLs handed to clients, e.g. a CDN in front of the API;
+    # when empty, the URL each request came in on
+    CHART_IMAGE_BASE_URL: str = ""
+
+    # Sign horoscope pre-fetch settings
+    HOROSCOPE_PREFETCH_ENABLED: bool = True
+    HOROSCOPE_REFRESH_OFFSET_MINUTES: int = 5
+    HOROSCOPE_MAX_AGE_SECONDS: int = 6 * 3600
+
+    # Background jobs for slow AI endpoints
+    JOB_WORKERS: int = 4
+    JOB_MAX_PENDING: int = 100
+    JOB_TIMEOUT_SECONDS: float = 300.0
+    JOB_TTL_SECONDS: int = 24 * 3600
+    JOB_MAX_WAIT_SECONDS: float = 30.0
+
+    # Precompute D1/D9/D10 charts and gem suggestions for new users
+    PREFETCH_ON_CREATE: bool = False
+    PRECOMPUTE_MAX_AGE_SECONDS: int = 30 * 24 * 3600
+
+    # Batch chart settings
+    CHART_BATCH_CONCURRENCY: int = 5
+
+    # Source of the planet longitudes behind /horoscope/vargas: "api"
+    # (freeastrologyapi) or "local" (in-process ephemeris). Chart image
+    # routes always use the API; /horoscope/placements is always local.
+    CHART_BACKEND: Literal["api", "local"] = "api"
     
+    @property
+    def debug_enabled(self) -> bool:
+        """Debug tracebacks are never served in production, whatever DEBUG_MODE says."""
+        return self.DEBUG_MODE and self.SERVER_ENV != "production"
+
     @property
     def mongodb_connection_string(self) -> str:
         """Generate MongoDB connection string with proper escaping."""
@@ -1,5 +1,6 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.metrics import MongoCommandMetrics
 import logging
 from urllib.parse import quote_plus
 
@@ -15,8 +16,9 @@ class MongoDB:
                 settings.mongodb_connection_string,
                 serverSelectionTimeoutMS=5000,
                 connectTimeoutMS=10000,
-                maxPoolSize=10,
-                retryWrites=True
+                maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+                retryWrites=True,
+                event_listeners=[MongoCommandMetrics()]
             )
             
             # Verify connection
@@ -37,6 +39,22 @@ class MongoDB:
         except Exception as e:
             logging.error(f"Error closing MongoDB connection: {str(e)}")
             
+    @classmethod
+    async def ensure_indexes(cls):
+        """Create the indexes application queries rely on."""
+        try:
+            # Partial so legacy documents without a user_id don't collide
+            await cls.get_db()["user_data"].create_index(
+                "user_id",
+                unique=True,
+                name="user_id_unique",
+                partialFilterExpression={"user_id": {"$type": "string"}}
+            )
+            await cls.get_db()["user_data"].create_index("date_of_birth")
+            logging.info("MongoDB indexes ensured")
+        except Exception as e:
+            logging.error(f"Error creating MongoDB indexes: {str(e)}")
+
     @classmethod
     def get_db(cls):
         """Get database instance."""
@@ -0,0 +1,336 @@
+"""
+In-process sidereal ephemeris used as a local chart backend.
+
+Planet positions come from the JPL approximate Keplerian elements (Standish,
+valid 1800-2050), the Moon from the main terms of Meeus' lunar theory and
+Rahu from the mean lunar node. Every body is computed in one vectorized
+NumPy pass. Accuracy is at the arc-minute level for the Sun, Moon and inner
+planets and a few arc-minutes for Jupiter and Saturn, which is ample for
+sign, house and divisional-chart placement.
+"""
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+
+SIGNS = (
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces",
+)
+
+BODIES = (
+    "Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu",
+)
+
+J2000 = 2451545.0
+DAYS_PER_CENTURY = 36525.0
+LIGHT_TIME_DAYS_PER_AU = 0.0057755183
+
+# Keplerian elements and rates per Julian century (J2000 ecliptic/equinox):
+# a (au), e, I, L, long. perihelion, long. ascending node (degrees)
+_KEPLER_BODIES = ("EMB", "Mercury", "Venus", "Mars", "Jupiter", "Saturn")
+_ELEMENTS = np.array([
+    [1.00000261, 0.01671123, -0.00001531, 100.46457166, 102.93768193, 0.0],
+    [0.38709927, 0.20563593, 7.00497902, 252.25032350, 77.45779628, 48.33076593],
+    [0.72333566, 0.00677672, 3.39467605, 181.97909950, 131.60246718, 76.67984255],
+    [1.52371034, 0.09339410, 1.84969142, -4.55343205, -23.94362959, 49.55953891],
+    [5.20288700, 0.04838624, 1.30439695, 34.39644051, 14.72847983, 100.47390909],
+    [9.53667594, 0.05386179, 2.48599187, 49.95424423, 92.59887831, 113.66242448],
+])
+_RATES = np.array([
+    [0.00000562, -0.00004392, -0.01294668, 35999.37244981, 0.32327364, 0.0],
+    [0.00000037, 0.00001906, -0.00594749, 149472.67411175, 0.16047689, -0.12534081],
+    [0.00000390, -0.00004107, -0.00078890, 58517.81538729, 0.00268329, -0.27769418],
+    [0.00001847, 0.00007882, -0.00813131, 19140.30268499, 0.44441088, -0.29257343],
+    [-0.00011607, -0.00013253, -0.00183714, 3034.74612775, 0.21252668, 0.20469106],
+    [-0.00125060, -0.00050991, 0.00193609, 1222.49362201, -0.41897216, -0.28867794],
+])
+
+# Periodic terms for the Moon's longitude (Meeus, Astronomical Algorithms,
+# table 47.A): multiples of D, M, M', F and the sine coefficient in 1e-6 deg.
+_MOON_TERMS = np.array([
+    [0, 0, 1, 0, 6288774], [2, 0, -1, 0, 1274027], [2, 0, 0, 0, 658314],
+    [0, 0, 2, 0, 213618], [0, 1, 0, 0, -185116], [0, 0, 0, 2, -114332],
+    [2, 0, -2, 0, 58793], [2, -1, -1, 0, 57066], [2, 0, 1, 0, 53322],
+    [2, -1, 0, 0, 45758], [0, 1, -1, 0, -40923], [1, 0, 0, 0, -34720],
+    [0, 1, 1, 0, -30383], [2, 0, 0, -2, 15327], [0, 0, 1, 2, -12528],
+    [0, 0, 1, -2, 10980], [4, 0, -1, 0, 10675], [0, 0, 3, 0, 10034],
+    [4, 0, -2, 0, 8548], [2, 1, -1, 0, -7888], [2, 1, 0, 0, -6766],
+    [1, 0, -1, 0, -5163], [1, 1, 0, 0, 4987], [2, -1, 1, 0, 4036],
+    [2, 0, 2, 0, 3994], [4, 0, 0, 0, 3861], [2, 0, -3, 0, 3665],
+    [0, 1, -2, 0, -2689], [2, 0, -1, 2, -2602], [2, -1, -2, 0, 2390],
+    [1, 0, 1, 0, -2348], [2, -2, 0, 0, 2236], [0, 1, 2, 0, -2120],
+    [0, 2, 0, 0, -2069], [2, -2, -1, 0, 2048], [2, 0, 1, -2, -1773],
+    [2, 0, 0, 2, -1595], [4, -1, -1, 0, 1215], [0, 0, 2, 2, -1110],
+    [3, 0, -1, 0, -892], [2, 1, 1, 0, -810], [4, -1, -2, 0, 759],
+    [0, 2, -1, 0, -713], [2, 2, -1, 0, -700], [2, 1, -2, 0, 691],
+    [2, -1, 0, -2, 596], [4, 0, 1, 0, 549], [0, 0, 4, 0, 537],
+    [4, -1, 0, 0, 520], [1, 0, -2, 0, -487], [2, 1, 0, -2, -399],
+    [0, 0, 2, -2, -381], [1, 1, 1, 0, 351], [3, 0, -2, 0, -340],
+    [4, 0, -3, 0, 330], [2, -1, 2, 0, 327], [0, 2, 1, 0, -323],
+    [1, 1, -1, 0, 299], [2, 0, 3, 0, 294],
+])
+_MOON_MULTIPLES = _MOON_TERMS[:, :4].astype(float)
+_MOON_COEFFS = _MOON_TERMS[:, 4].astype(float)
+_MOON_M_POWER = np.abs(_MOON_TERMS[:, 1])
+
+
+def julian_day(year: int, month: int, day: int, hour: float = 0.0) -> float:
+    """Julian Day for a proleptic Gregorian calendar date and decimal hour."""
+    if month <= 2:
+        year -= 1
+        month += 12
+    a = year // 100
+    b = 2 - a + a // 4
+    return (
+        int(365.25 * (year + 4716)) + int(30.6001 * (month + 1))
+        + day + b - 1524.5 + hour / 24.0
+    )
+
+
+def delta_t_seconds(year: float) -> float:
+    """TT - UT in seconds (Espenak & Meeus polynomial fits)."""
+    if 1900 <= year < 1920:
+        t = year - 1900
+        return (
+            -2.79 + 1.494119 * t - 0.0598939 * t**2 + 0.0061966 * t**3
+            - 0.000197 * t**4
+        )
+    if 1920 <= year < 1941:
+        t = year - 1920
+        return 21.20 + 0.84493 * t - 0.076100 * t**2 + 0.0020936 * t**3
+    if 1941 <= year < 1961:
+        t = year - 1950
+        return 29.07 + 0.407 * t - t**2 / 233 + t**3 / 2547
+    if 1961 <= year < 1986:
+        t = year - 1975
+        return 45.45 + 1.067 * t - t**2 / 260 - t**3 / 718
+    if 1986 <= year < 2005:
+        t = year - 2000
+        return (
+            63.86 + 0.3345 * t - 0.060374 * t**2 + 0.0017275 * t**3
+            + 0.000651814 * t**4 + 0.00002373599 * t**5
+        )
+    if 2005 <= year < 2050:
+        t = year - 2000
+        return 62.92 + 0.32217 * t + 0.005589 * t**2
+    u = (year - 1820) / 100
+    return -20 + 32 * u**2
+
+
+def lahiri_ayanamsa(t: np.ndarray) -> np.ndarray:
+    """Lahiri (Chitrapaksha) ayanamsa in degrees for centuries ``t`` from J2000 TT."""
+    return 23.857092 + (5028.796195 * t + 1.1054348 * t**2) / 3600.0
+
+
+def mean_obliquity(t: np.ndarray) -> np.ndarray:
+    """Mean obliquity of the ecliptic in degrees."""
+    return 23.439291111 - (46.8150 * t + 0.00059 * t**2 - 0.001813 * t**3) / 3600.0
+
+
+def nutation_in_longitude(t: np.ndarray) -> np.ndarray:
+    """Nutation in longitude in degrees (main terms)."""
+    omega = np.radians(125.04452 - 1934.136261 * t)
+    l_sun = np.radians(280.4665 + 36000.7698 * t)
+    l_moon = np.radians(218.3165 + 481267.8813 * t)
+    return (
+        -17.20 * np.sin(omega) - 1.32 * np.sin(2 * l_sun)
+        - 0.23 * np.sin(2 * l_moon) + 0.21 * np.sin(2 * omega)
+    ) / 3600.0
+
+
+def greenwich_sidereal_time(jd_ut: np.ndarray) -> np.ndarray:
+    """Greenwich mean sidereal time in degrees."""
+    t = (jd_ut - J2000) / DAYS_PER_CENTURY
+    return np.mod(
+        280.46061837 + 360.98564736629 * (jd_ut - J2000)
+        + 0.000387933 * t**2 - t**3 / 38710000.0,
+        360.0,
+    )
+
+
+def _heliocentric(t: np.ndarray) -> np.ndarray:
+    """
+    Heliocentric J2000 ecliptic coordinates, shape (3, bodies, times).
+
+    ``t`` is in centuries from J2000 TT, either shape (times,) for a common
+    time axis or (bodies, times) for a per-body time.
+    """
+    t = np.atleast_2d(t)
+    el = _ELEMENTS[:, :, None] + _RATES[:, :, None] * t[:, None, :]
+    a, e = el[:, 0], el[:, 1]
+    inc, mean_long, peri, node = np.radians(el[:, 2:]).transpose(1, 0, 2)
+    omega = peri - node
+    mean_anomaly = np.mod(mean_long - peri + np.pi, 2 * np.pi) - np.pi
+
+    ecc_anomaly = mean_anomaly + e * np.sin(mean_anomaly)
+    for _ in range(6):
+        ecc_anomaly -= (ecc_anomaly - e * np.sin(ecc_anomaly) - mean_anomaly) / (
+            1 - e * np.cos(ecc_anomaly)
+        )
+
+    xp = a * (np.cos(ecc_anomaly) - e)
+    yp = a * np.sqrt(1 - e**2) * np.sin(ecc_anomaly)
+    cw, sw = np.cos(omega), np.sin(omega)
+    cn, sn = np.cos(node), np.sin(node)
+    ci, si = np.cos(inc), np.sin(inc)
+    x = (cw * cn - sw * sn * ci) * xp + (-sw * cn - cw * sn * ci) * yp
+    y = (cw * sn + sw * cn * ci) * xp + (-sw * sn + cw * cn * ci) * yp
+    z = (sw * si) * xp + (cw * si) * yp
+    return np.stack([x, y, z])
+
+
+def _planet_longitudes(t: np.ndarray) -> np.ndarray:
+    """
+    Geocentric J2000 ecliptic longitudes of the Sun and the five planets,
+    corrected for light-time. Shape (6, times) in _KEPLER_BODIES order with
+    the Sun in place of the Earth-Moon barycenter.
+    """
+    helio = _heliocentric(t)
+    earth = helio[:, :1]
+    geo = helio - earth
+    distance = np.sqrt((geo**2).sum(axis=0))
+    # One light-time iteration: planet position when the light left it
+    retarded = _heliocentric(t - distance * LIGHT_TIME_DAYS_PER_AU / DAYS_PER_CENTURY)
+    geo = retarded - earth
+    geo[:, 0] = -earth[:, 0]
+    return np.degrees(np.arctan2(geo[1], geo[0]))
+
+
+def _moon_longitude(t: np.ndarray) -> np.ndarray:
+    """Geometric longitude of the Moon, mean equinox of date, in degrees."""
+    l_prime = 218.3164477 + 481267.88123421 * t - 0.0015786 * t**2 + t**3 / 538841
+    d = 297.8501921 + 445267.1114034 * t - 0.0018819 * t**2 + t**3 / 545868
+    m = 357.5291092 + 35999.0502909 * t - 0.0001536 * t**2 + t**3 / 24490000
+    mp = 134.9633964 + 477198.8675055 * t + 0.0087414 * t**2 + t**3 / 69699
+    f = 93.2720950 + 483202.0175233 * t - 0.0036539 * t**2 - t**3 / 3526000
+    e = 1 - 0.002516 * t - 0.0000074 * t**2
+
+    args = np.radians(_MOON_MULTIPLES @ np.stack([d, m, mp, f]))
+    coeffs = _MOON_COEFFS[:, None] * e[None, :] ** _MOON_M_POWER[:, None]
+    sigma = (coeffs * np.sin(args)).sum(axis=0)
+
+    a1 = np.radians(119.75 + 131.849 * t)
+    a2 = np.radians(53.09 + 479264.290 * t)
+    sigma += (
+        3958 * np.sin(a1) + 1962 * np.sin(np.radians(l_prime - f)) + 318 * np.sin(a2)
+    )
+    return l_prime + sigma / 1e6
+
+
+def mean_lunar_node(t: np.ndarray) -> np.ndarray:
+    """Longitude of the mean ascending lunar node (Rahu), mean equinox of date."""
+    return 125.0445479 - 1934.1362891 * t + 0.0020754 * t**2 + t**3 / 467441
+
+
+def tropical_longitudes(jd_tt: np.ndarray) -> np.ndarray:
+    """
+    Apparent tropical longitudes of BODIES for an array of TT Julian Days.
+
+    Returns:
+        np.ndarray: Shape (len(BODIES), times), degrees in [0, 360)
+    """
+    t = (np.atleast_1d(np.asarray(jd_tt, dtype=float)) - J2000) / DAYS_PER_CENTURY
+    planets = _planet_longitudes(t)
+    precession = (5029.0966 * t + 1.11113 * t**2) / 3600.0
+    nutation = nutation_in_longitude(t)
+    sun, mercury, venus, mars, jupiter, saturn = planets + precession
+    sun = sun - 20.4898 / 3600.0  # annual aberration
+    moon = _moon_longitude(t)
+    rahu = mean_lunar_node(t)
+    longitudes = np.stack([
+        sun, moon, mars, mercury, jupiter, venus, saturn, rahu, rahu + 180.0,
+    ])
+    return np.mod(longitudes + nutation, 360.0)
+
+
+def ascendant(jd_ut: float, t: float, latitude: float, longitude: float) -> float:
+    """Tropical ascendant in degrees for an observer (east longitude positive)."""
+    ramc = np.radians(greenwich_sidereal_time(np.asarray(jd_ut)) + longitude)
+    eps = np.radians(mean_obliquity(np.asarray(t)))
+    phi = np.radians(latitude)
+    asc = np.arctan2(
+        np.cos(ramc), -(np.sin(ramc) * np.cos(eps) + np.tan(phi) * np.sin(eps))
+    )
+    return float(np.mod(np.degrees(asc), 360.0))
+
+
+def sign_placement(longitude: float) -> Dict[str, Any]:
+    """Sign index (0 = Aries), sign name and degree within the sign."""
+    sign = int(longitude // 30) % 12
+    return {
+        "longitude": round(longitude, 6),
+        "sign_num": sign + 1,
+        "sign": SIGNS[sign],
+        "degree": round(longitude - sign * 30, 6),
+    }
+
+
+def sidereal_positions(
+    birth: datetime,
+    tz_hours: float,
+    latitude: float,
+    longitude: float,
+) -> Dict[str, Any]:
+    """
+    Sidereal (Lahiri) longitudes of the ascendant and BODIES.
+
+    Args:
+        birth: Local civil date and time of birth (naive)
+        tz_hours: Offset of the local time from UT in hours (5.5 for IST)
+        latitude: Geographic latitude in degrees, north positive
+        longitude: Geographic longitude in degrees, east positive
+
+    Returns:
+        dict: "ascendant" longitude, per-body "longitudes", per-body
+            "retrograde" flags and the "ayanamsa" used, all in degrees
+    """
+    hour = birth.hour + birth.minute / 60 + birth.second / 3600 - tz_hours
+    jd_ut = julian_day(birth.year, birth.month, birth.day, hour)
+    year = birth.year + (birth.month - 0.5) / 12
+    jd_tt = jd_ut + delta_t_seconds(year) / 86400.0
+    t = (jd_tt - J2000) / DAYS_PER_CENTURY
+
+    # Evaluate a second instant to get daily motion for retrograde flags
+    tropical = tropical_longitudes(np.array([jd_tt, jd_tt + 0.5]))
+    ayanamsa = float(lahiri_ayanamsa(np.asarray(t)))
+    sidereal = np.mod(tropical[:, 0] - ayanamsa, 360.0)
+    motion = np.mod(tropical[:, 1] - tropical[:, 0] + 180.0, 360.0) - 180.0
+
+    return {
+        "ayanamsa": ayanamsa,
+        "ascendant": (ascendant(jd_ut, t, latitude, longitude) - ayanamsa) % 360.0,
+        "longitudes": dict(zip(BODIES, sidereal.tolist())),
+        "retrograde": dict(zip(BODIES, (motion < 0).tolist())),
+    }
+
+
+def compute_chart(
+    birth: datetime,
+    tz_hours: float,
+    latitude: float,
+    longitude: float,
+) -> Dict[str, Any]:
+    """
+    Compute a D1 (Rasi) chart with whole-sign houses.
+
+    Returns:
+        dict: Ascendant placement, per-planet placements with house numbers
+            and retrograde flags, and the ayanamsa used
+    """
+    positions = sidereal_positions(birth, tz_hours, latitude, longitude)
+    asc = sign_placement(positions["ascendant"])
+    planets: List[Dict[str, Any]] = []
+    for name in BODIES:
+        placement = sign_placement(positions["longitudes"][name])
+        placement["house"] = (placement["sign_num"] - asc["sign_num"]) % 12 + 1
+        planets.append({
+            "name": name,
+            **placement,
+            "retrograde": positions["retrograde"][name],
+        })
+    return {
+        "ayanamsa": round(positions["ayanamsa"], 6),
+        "ascendant": asc,
+        "planets": planets,
+    }
@@ -0,0 +1,122 @@
+"""
+Bundled gazetteer of Indian places.
+
+Places live in parallel arrays loaded once from ``data/india_places.tsv``.
+Exact lookups go through a dict keyed by normalized name, and prefix search
+through a sorted array of normalized names and aliases, so an autocomplete
+query is two binary searches and a slice.
+"""
+import bisect
+import csv
+from array import array
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+DATA_PATH = Path(__file__).parent.parent / "data" / "india_places.tsv"
+
+# All of India observes IST
+IST_OFFSET_HOURS = 5.5
+
+
+class Place(NamedTuple):
+    name: str
+    state: str
+    latitude: float
+    longitude: float
+    timezone: float
+
+
+def normalize(name: str) -> str:
+    """Case-, punctuation- and whitespace-insensitive form of a place name."""
+    return " ".join(name.lower().replace("-", " ").replace(".", " ").split())
+
+
+class Gazetteer:
+    """
+    Name, state and coordinate arrays with exact and prefix indexes.
+
+    Rows keep file order, which lists larger places first; ambiguous
+    names resolve to the first row unless a state is given, and search
+    results come back in the same order.
+    """
+
+    def __init__(
+        self,
+        names: List[str],
+        states: List[str],
+        coordinates: array,
+        aliases: List[List[str]],
+    ):
+        self.names = names
+        self.states = states
+        self.coordinates = coordinates
+        self._by_name: Dict[str, List[int]] = {}
+        self._by_name_state: Dict[Tuple[str, str], int] = {}
+        keys: List[Tuple[str, int]] = []
+        for row, (name, state) in enumerate(zip(names, states)):
+            for key in dict.fromkeys(normalize(n) for n in [name, *aliases[row]]):
+                self._by_name.setdefault(key, []).append(row)
+                self._by_name_state.setdefault((key, normalize(state)), row)
+                keys.append((key, row))
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._rows = array("i", (row for _, row in keys))
+        self._places = [
+            Place(
+                name,
+                state,
+                coordinates[2 * row],
+                coordinates[2 * row + 1],
+                IST_OFFSET_HOURS,
+            )
+            for row, (name, state) in enumerate(zip(names, states))
+        ]
+
+    @classmethod
+    def load(cls, path: Path = DATA_PATH) -> "Gazetteer":
+        names, states, aliases = [], [], []
+        coordinates = array("d")  # latitude, longitude pairs
+        with open(path, newline="", encoding="utf-8") as file:
+            for record in csv.DictReader(file, delimiter="\t"):
+                names.append(record["name"])
+                states.append(record["state"])
+                coordinates.append(float(record["latitude"]))
+                coordinates.append(float(record["longitude"]))
+                aliases.append(
+                    record["aliases"].split("|") if record["aliases"] else []
+                )
+        return cls(names, states, coordinates, aliases)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def place(self, row: int) -> Place:
+        return self._places[row]
+
+    def lookup(self, name: str, state: Optional[str] = None) -> Optional[Place]:
+        """
+        Resolve a place by name or alias, preferring a match in ``state``.
+
+        Returns:
+            Place: The matching place, or None if the name is unknown
+        """
+        key = normalize(name)
+        if state is not None:
+            row = self._by_name_state.get((key, normalize(state)))
+            if row is not None:
+                return self.place(row)
+        rows = self._by_name.get(key)
+        return self.place(rows[0]) if rows else None
+
+    def search(self, prefix: str, limit: int = 10) -> List[Place]:
+        """Places whose name or an alias starts with ``prefix``."""
+        key = normalize(prefix)
+        if not key:
+            return []
+        lo = bisect.bisect_left(self._keys, key)
+        hi = bisect.bisect_left(self._keys, key + "\uffff", lo)
+        rows = sorted(set(self._rows[lo:hi]))[:limit]
+        return [self.place(row) for row in rows]
+
+
+gazetteer = Gazetteer.load()
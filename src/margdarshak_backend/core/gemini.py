@@ -1,6 +1,204 @@
-import google.generativeai as genai
+import asyncio
+import functools
+import logging
+import random
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
 from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.metrics import record_upstream
+
+
+# The Gemini SDK takes about half a second to import, so it is not loaded
+# at import time. The app warms it in a worker thread at startup; the first
+# call loads it only if that did not happen.
+
+def create_model(model_name: str) -> Any:
+    """Configure the Gemini SDK and create a model."""
+    import google.generativeai as genai
+
+    genai.configure(api_key=settings.GEMINI_API_KEY)
+    return genai.GenerativeModel(model_name)
+
+
+@functools.cache
+def retryable_errors() -> Tuple[type, ...]:
+    """Errors worth retrying: rate limits, transient server errors and timeouts."""
+    from google.api_core import exceptions as google_exceptions
+
+    return (
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.InternalServerError,
+        google_exceptions.DeadlineExceeded,
+        asyncio.TimeoutError,
+    )
+
+
+class GeminiClient:
+    """
+    Non-blocking Gemini wrapper shared by all routes.
+
+    Calls use the async SDK API, are bounded by a global concurrency
+    semaphore and a per-call timeout, and are retried with jittered
+    exponential backoff on rate limits and transient errors.
+    """
+
+    def __init__(
+        self,
+        model: Optional[Any],
+        max_concurrency: int,
+        timeout: float,
+        max_retries: int,
+        retry_base_delay: float,
+    ):
+        self._model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.output_tokens = 0
+        self.latency_seconds = 0.0
+
+    @property
+    def model(self) -> Any:
+        """The Gemini model, created on first use if none was given."""
+        if self._model is None:
+            self._model = create_model(settings.GEMINI_MODEL)
+        return self._model
+
+    async def warm_up(self) -> None:
+        """
+        Import the SDK and create the model in a worker thread, keeping the
+        slow import off the event loop. Errors are logged; the first call
+        then retries the import.
+        """
+        if self._model is not None:
+            return
+        try:
+            self._model = await asyncio.to_thread(create_model, settings.GEMINI_MODEL)
+            await asyncio.to_thread(retryable_errors)
+        except Exception as e:
+            logging.error(f"Error loading the Gemini SDK: {str(e)}")
+
+    def _record_usage(self, response: Any, elapsed: float) -> None:
+        self.calls += 1
+        self.latency_seconds += elapsed
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            self.prompt_tokens += getattr(usage, "prompt_token_count", 0) or 0
+            self.output_tokens += getattr(usage, "candidates_token_count", 0) or 0
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform in [0, base * 2^attempt]
+        return random.uniform(0, self.retry_base_delay * 2**attempt)
+
+    async def _with_retries(self, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run ``call``, retrying retryable errors with jittered backoff."""
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                result = await call()
+                record_upstream("gemini", time.perf_counter() - start)
+                return result
+            except retryable_errors() as e:
+                record_upstream("gemini", time.perf_counter() - start, e)
+                if attempt == self.max_retries:
+                    self.errors += 1
+                    raise
+                self.retries += 1
+                delay = self._backoff(attempt)
+                logging.warning(
+                    f"Gemini call failed ({type(e).__name__}), retrying in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+            except Exception as e:
+                record_upstream("gemini", time.perf_counter() - start, e)
+                self.errors += 1
+                raise
+
+    async def generate(self, contents: Any) -> str:
+        """
+        Generate content and return the response text.
+
+        Args:
+            contents: Prompt string or list of prompt parts (text, images)
+
+        Raises:
+            Exception: The last error once retries are exhausted
+        """
+        async def call() -> Any:
+            async with self._semaphore:
+                start = time.perf_counter()
+                response = await asyncio.wait_for(
+                    self.model.generate_content_async(contents),
+                    timeout=self.timeout,
+                )
+                self._record_usage(response, time.perf_counter() - start)
+                return response
+
+        response = await self._with_retries(call)
+        return response.text
+
+    async def stream(self, contents: Any) -> AsyncIterator[str]:
+        """
+        Generate content, yielding text chunks as the model produces them.
+
+        A concurrency slot is taken per attempt, so it is free while a
+        failed start backs off, and then held until the stream ends or the
+        consumer stops iterating. Only the initial request is retried. It
+        and each following chunk must arrive within the timeout; once text
+        has been yielded, errors propagate.
+        """
+        async def start_stream() -> Any:
+            await self._semaphore.acquire()
+            try:
+                return await asyncio.wait_for(
+                    self.model.generate_content_async(contents, stream=True),
+                    timeout=self.timeout,
+                )
+            except BaseException:
+                self._semaphore.release()
+                raise
+
+        start = time.perf_counter()
+        response = await self._with_retries(start_stream)
+        try:
+            chunks = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), self.timeout)
+                except StopAsyncIteration:
+                    break
+                yield chunk.text
+            self._record_usage(response, time.perf_counter() - start)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self._semaphore.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "avg_latency_seconds": (
+                self.latency_seconds / self.calls if self.calls else 0.0
+            ),
+        }
+
 
-# Configure Gemini
-genai.configure(api_key=settings.GEMINI_API_KEY)
-model = genai.GenerativeModel('gemini-1.5-flash') 
\ No newline at end of file
+gemini = GeminiClient(
+    None,
+    max_concurrency=settings.GEMINI_MAX_CONCURRENCY,
+    timeout=settings.GEMINI_TIMEOUT_SECONDS,
+    max_retries=settings.GEMINI_MAX_RETRIES,
+    retry_base_delay=settings.GEMINI_RETRY_BASE_DELAY,
+)
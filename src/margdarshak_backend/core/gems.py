@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, Iterable, List, Tuple
+
+from src.margdarshak_backend.core.cache import TieredCache, make_key
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.gemini import gemini
+from src.margdarshak_backend.core.singleflight import SingleFlight
+
+# Bump when the prompt below changes so cached descriptions are regenerated
+GEM_PROMPT_VERSION = 1
+
+# Gem categories returned by the Vedic Rishi gem suggestion API
+GEM_CATEGORIES = ("LIFE", "BENEFIC", "LUCKY")
+
+# Navaratna gems and their usual substitutes (name, semi_gem)
+KNOWN_GEMS: Tuple[Tuple[str, str], ...] = (
+    ("Ruby", "Garnet"),
+    ("Pearl", "Moonstone"),
+    ("Red Coral", "Carnelian"),
+    ("Emerald", "Peridot"),
+    ("Yellow Sapphire", "Citrine"),
+    ("Diamond", "White Sapphire"),
+    ("Blue Sapphire", "Amethyst"),
+    ("Hessonite", "Zircon"),
+    ("Cat's Eye", "Tiger's Eye"),
+)
+
+gem_description_cache = TieredCache(
+    "gem_description",
+    "gem_descriptions",
+    maxsize=settings.GEM_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.GEM_CACHE_TTL_SECONDS,
+)
+
+gem_generations = SingleFlight("gem_description")
+
+
+def gem_description_prompt(key: str, name: str, semi_gem: str) -> str:
+    return (
+        f"""You are an expert gemologist and astrologer.
+            Provide a detailed description of the {key.lower()} gemstone and its """
+        f"""astrological significance: {name} with semi gem {semi_gem}.
+            Include information about:
+            1. Physical properties
+            2. Astrological benefits
+            3. How to wear them
+            4. Best practices for using these gemstones
+            Format the response in clear sections."""
+    )
+
+
+def gem_description_key(key: str, name: str, semi_gem: str) -> str:
+    """Content address of a description: prompt version plus the gem fields."""
+    return make_key(GEM_PROMPT_VERSION, key.lower(), name, semi_gem)
+
+
+async def describe_gem(key: str, name: str, semi_gem: str) -> str:
+    """
+    Get the Gemini description for a gem, generating it only on first use.
+
+    Concurrent requests for the same uncached gem share one generation.
+    """
+    cache_key = gem_description_key(key, name, semi_gem)
+    cached = await gem_description_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    async def generate() -> str:
+        prompt = gem_description_prompt(key, name, semi_gem)
+        description = await gemini.generate(prompt)
+        await gem_description_cache.set(cache_key, description)
+        return description
+
+    return await gem_generations.do(cache_key, generate)
+
+
+async def stream_gem_description(
+    key: str, name: str, semi_gem: str
+) -> AsyncIterator[str]:
+    """
+    Yield a gem description as Gemini produces it, or in one piece if cached.
+
+    The description is cached only once the stream completes.
+    """
+    cache_key = gem_description_key(key, name, semi_gem)
+    cached = await gem_description_cache.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    async for text in gemini.stream(gem_description_prompt(key, name, semi_gem)):
+        parts.append(text)
+        yield text
+    await gem_description_cache.set(cache_key, "".join(parts))
+
+
+def known_gem_set() -> List[Tuple[str, str, str]]:
+    """Every (category, name, semi_gem) combination of the known gems."""
+    return [
+        (category, name, semi_gem)
+        for category in GEM_CATEGORIES
+        for name, semi_gem in KNOWN_GEMS
+    ]
+
+
+async def warm_up(gems: Iterable[Tuple[str, str, str]]) -> Dict[str, int]:
+    """
+    Pre-populate the description cache.
+
+    Args:
+        gems: (category, name, semi_gem) combinations to describe
+
+    Returns:
+        dict: Number of gems described and number of failures
+    """
+    gems = list(gems)
+    results = await asyncio.gather(
+        *(describe_gem(*gem) for gem in gems), return_exceptions=True
+    )
+    failed = 0
+    for gem, result in zip(gems, results):
+        if isinstance(result, Exception):
+            failed += 1
+            logging.error(f"Error describing gem {gem}: {str(result)}")
+    return {"described": len(gems) - failed, "failed": failed}
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Set, Tuple
+
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.http import http
+from src.margdarshak_backend.models.horoscope import Day, ZodiacSign
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+FeedKey = Tuple[str, ZodiacSign, Optional[Day]]
+
+
+def all_feed_keys() -> list[FeedKey]:
+    """Every distinct daily (12 signs x 3 days) and monthly (12 signs) request."""
+    keys: list[FeedKey] = [("daily", sign, day) for sign in ZodiacSign for day in Day]
+    keys.extend(("monthly", sign, None) for sign in ZodiacSign)
+    return keys
+
+
+def ist_boundary(now: datetime) -> datetime:
+    """Most recent IST refresh boundary (midnight plus the configured offset)."""
+    offset = timedelta(minutes=settings.HOROSCOPE_REFRESH_OFFSET_MINUTES)
+    local = now.astimezone(IST) - offset
+    midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    return midnight + offset
+
+
+def seconds_until_refresh(now: Optional[datetime] = None) -> float:
+    """Seconds until the next IST refresh boundary, when cached horoscopes change."""
+    now = now or datetime.now(timezone.utc)
+    return (ist_boundary(now) + timedelta(days=1) - now).total_seconds()
+
+
+class SignHoroscopeFeed:
+    """
+    In-memory, stale-while-revalidate cache of the sign horoscopes served by
+    the horoscope app API.
+
+    A scheduler task pre-fetches all combinations shortly after each IST
+    midnight. Stale entries are returned immediately while a background
+    refresh runs, and a failed refresh keeps the last good copy.
+    """
+
+    def __init__(self):
+        self._entries: Dict[FeedKey, Tuple[Dict[str, Any], datetime]] = {}
+        self._refreshing: Set[FeedKey] = set()
+        self._background: Set[asyncio.Task] = set()
+        self._scheduler: Optional[asyncio.Task] = None
+
+    async def _fetch(self, key: FeedKey) -> Dict[str, Any]:
+        period, sign, day = key
+        params = {"sign": sign.value}
+        if day is not None:
+            params["day"] = day.value
+        return await http.request_json(
+            "horoscope_app", "GET", f"/api/v1/get-horoscope/{period}", params=params
+        )
+
+    def _is_stale(self, fetched_at: datetime) -> bool:
+        now = datetime.now(timezone.utc)
+        if fetched_at < ist_boundary(now):
+            return True
+        return (now - fetched_at).total_seconds() > settings.HOROSCOPE_MAX_AGE_SECONDS
+
+    async def refresh(self, key: FeedKey) -> Optional[Dict[str, Any]]:
+        """Fetch one entry, keeping the previous copy if the upstream fails."""
+        if key in self._refreshing:
+            return None
+        self._refreshing.add(key)
+        try:
+            data = await self._fetch(key)
+            self._entries[key] = (data, datetime.now(timezone.utc))
+            return data
+        except Exception as e:
+            logging.error(
+                f"Error refreshing {key[0]} horoscope for {key[1].value}: {str(e)}"
+            )
+            return None
+        finally:
+            self._refreshing.discard(key)
+
+    async def refresh_all(self) -> None:
+        """Pre-fetch every sign/day combination concurrently."""
+        await asyncio.gather(*(self.refresh(key) for key in all_feed_keys()))
+        logging.info(f"Sign horoscopes refreshed: {len(self._entries)} entries cached")
+
+    def _refresh_in_background(self, key: FeedKey) -> None:
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self.refresh(key))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def get(self, key: FeedKey) -> Dict[str, Any]:
+        """
+        Get a horoscope, serving from memory when possible.
+
+        Raises:
+            httpx.HTTPError: If nothing is cached and the upstream call fails
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            data, fetched_at = entry
+            if self._is_stale(fetched_at):
+                self._refresh_in_background(key)
+            return data
+        data = await self._fetch(key)
+        self._entries[key] = (data, datetime.now(timezone.utc))
+        return data
+
+    async def get_daily(self, sign: ZodiacSign, day: Day) -> Dict[str, Any]:
+        return await self.get(("daily", sign, day))
+
+    async def get_monthly(self, sign: ZodiacSign) -> Dict[str, Any]:
+        return await self.get(("monthly", sign, None))
+
+    async def _run_scheduler(self) -> None:
+        await self.refresh_all()
+        while True:
+            await asyncio.sleep(seconds_until_refresh())
+            await self.refresh_all()
+
+    def start(self) -> None:
+        """Start the pre-fetch scheduler on the running event loop."""
+        if self._scheduler is None:
+            self._scheduler = asyncio.create_task(self._run_scheduler())
+
+    async def stop(self) -> None:
+        """Cancel the scheduler and any in-flight background refreshes."""
+        tasks = list(self._background)
+        if self._scheduler is not None:
+            tasks.append(self._scheduler)
+            self._scheduler = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+sign_horoscopes = SignHoroscopeFeed()
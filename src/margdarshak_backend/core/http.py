@@ -0,0 +1,129 @@
+import importlib.util
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+
+from src.margdarshak_backend.core.cache import make_key
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.metrics import MetricsTransport
+from src.margdarshak_backend.core.resilience import guard_for
+from src.margdarshak_backend.core.singleflight import SingleFlight
+
+# HTTP/2 needs the optional ``h2`` package; fall back to HTTP/1.1 without it.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+upstream_calls = SingleFlight("upstream")
+
+
+def _upstream_config() -> Dict[str, Dict[str, Any]]:
+    """Per-upstream client configuration, keyed by upstream name."""
+    return {
+        "astrology": {
+            "base_url": settings.ASTROLOGY_API_URL,
+            "http2": True,
+        },
+        "vedicrishi": {
+            "base_url": settings.VEDICRISHI_API_URL,
+            "http2": True,
+        },
+        "horoscope_app": {
+            "base_url": settings.HOROSCOPE_APP_API_URL,
+            "http2": True,
+        },
+        "langflow": {
+            "base_url": settings.LANGFLOW_API_URL,
+            "http2": False,
+        },
+        # Arbitrary hosts (e.g. chart images), no base URL
+        "default": {
+            "base_url": "",
+            "http2": True,
+        },
+    }
+
+
+class HTTPClient:
+    clients: Dict[str, httpx.AsyncClient] = {}
+
+    @classmethod
+    async def connect(cls):
+        """Create one pooled, keep-alive async client per upstream."""
+        timeout = httpx.Timeout(
+            settings.HTTP_READ_TIMEOUT,
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            pool=settings.HTTP_POOL_TIMEOUT,
+        )
+        limits = httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        )
+        for name, config in _upstream_config().items():
+            http2 = config["http2"] and settings.HTTP2_ENABLED and HTTP2_AVAILABLE
+            transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits)
+            cls.clients[name] = httpx.AsyncClient(
+                base_url=config["base_url"],
+                timeout=timeout,
+                transport=MetricsTransport(name, transport),
+            )
+        logging.info(f"HTTP clients ready for upstreams: {', '.join(cls.clients)}")
+
+    @classmethod
+    async def close(cls):
+        """Close all upstream clients."""
+        for name, client in list(cls.clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logging.error(f"Error closing HTTP client {name}: {str(e)}")
+        cls.clients.clear()
+
+    @classmethod
+    def get_client(cls, upstream: Optional[str] = None) -> httpx.AsyncClient:
+        """Get the shared client for an upstream."""
+        client = cls.clients.get(upstream or "default")
+        if client is None:
+            raise ConnectionError(
+                f"HTTP client for {upstream or 'default'} not initialized"
+            )
+        return client
+
+    @classmethod
+    async def request_json(
+        cls,
+        upstream: str,
+        method: str,
+        url: str,
+        *,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        """
+        Send a request to an upstream and return the decoded JSON body.
+
+        Identical concurrent requests (same upstream, method, URL, params and
+        body) share one in-flight call, so the returned object may be shared
+        between callers and must not be mutated. Transient failures are
+        retried within the upstream's retry budget.
+
+        Raises:
+            UpstreamUnavailableError: If the upstream's circuit is open
+            httpx.HTTPError: If the request fails or returns an error status
+        """
+        client = cls.get_client(upstream)
+        guard = guard_for(upstream)
+
+        async def send() -> Any:
+            response = await client.request(
+                method, url, params=params, json=json, headers=headers
+            )
+            response.raise_for_status()
+            return response.json()
+
+        key = make_key(upstream, method, url, params, json)
+        return await upstream_calls.do(key, lambda: guard.call(send))
+
+
+http = HTTPClient()
@@ -0,0 +1,185 @@
+"""
+Response compression, ETags and Cache-Control.
+
+``HTTPCachingMiddleware`` only touches responses whose body arrives in a
+single message. Streaming responses (server-sent events, NDJSON, Langflow
+proxying) pass through unchanged so nothing buffers them. Routes choose
+their freshness lifetime with the ``cache_control`` dependency.
+"""
+
+import gzip
+import hashlib
+from typing import Any, Callable, Dict, Optional, Union
+
+from fastapi import Depends, Response
+from starlette.datastructures import Headers, MutableHeaders
+
+# Headers a 304 keeps from the full response (RFC 9110, section 15.4.5)
+NOT_MODIFIED_HEADERS = (
+    "cache-control",
+    "content-location",
+    "date",
+    "etag",
+    "expires",
+    "vary",
+)
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "image/svg+xml",
+)
+STREAMING_TYPES = ("text/event-stream", "application/x-ndjson")
+
+
+def make_etag(body: bytes) -> str:
+    """Strong ETag for a response body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _opaque_tag(tag: str) -> str:
+    # If-None-Match uses weak comparison, and the gzip variant of a body
+    # is the same resource
+    tag = tag.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    return tag.replace('-gzip"', '"')
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches the current ETag."""
+    if if_none_match.strip() == "*":
+        return True
+    current = _opaque_tag(etag)
+    return any(_opaque_tag(tag) == current for tag in if_none_match.split(","))
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    for coding in accept_encoding.lower().split(","):
+        name, _, params = coding.partition(";")
+        if name.strip() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def is_compressible(content_type: str) -> bool:
+    content_type = content_type.lower()
+    if content_type.startswith(STREAMING_TYPES):
+        return False
+    return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type
+
+
+class HTTPCachingMiddleware:
+    """
+    ASGI middleware adding ETags, ``If-None-Match`` handling and gzip.
+
+    Successful GET responses get a strong ETag over the uncompressed body
+    and become an empty 304 when the client already has that version.
+    Compressible bodies of at least ``minimum_size`` bytes are gzipped for
+    clients that accept it.
+    """
+
+    def __init__(self, app: Any, minimum_size: int = 1024, compresslevel: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.compresslevel = compresslevel
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        start: Optional[Dict[str, Any]] = None
+        streaming = False
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal start, streaming
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if start is None or streaming or message["type"] != "http.response.body":
+                if start is not None:
+                    await send(start)
+                    start = None
+                await send(message)
+                return
+            if message.get("more_body", False):
+                streaming = True
+                await send(start)
+                start = None
+                await send(message)
+                return
+            await self._send_complete(
+                scope["method"], request_headers, start, message, send
+            )
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_complete(
+        self,
+        method: str,
+        request_headers: Headers,
+        start: Dict[str, Any],
+        message: Dict[str, Any],
+        send: Any,
+    ) -> None:
+        body = message.get("body", b"")
+        headers = MutableHeaders(raw=list(start["headers"]))
+        status = start["status"]
+        compress = (
+            len(body) >= self.minimum_size
+            and "content-encoding" not in headers
+            and is_compressible(headers.get("content-type", ""))
+        )
+        if compress:
+            headers.add_vary_header("Accept-Encoding")
+
+        if (
+            method in ("GET", "HEAD")
+            and status == 200
+            and "no-store" not in headers.get("cache-control", "")
+        ):
+            etag = headers.setdefault("etag", make_etag(body))
+            if_none_match = request_headers.get("if-none-match")
+            if if_none_match and etag_matches(if_none_match, etag):
+                kept = [
+                    (k, v)
+                    for k, v in headers.raw
+                    if k.decode("latin-1") in NOT_MODIFIED_HEADERS
+                ]
+                await send(
+                    {"type": "http.response.start", "status": 304, "headers": kept}
+                )
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+        if compress and accepts_gzip(request_headers.get("accept-encoding", "")):
+            body = gzip.compress(body, compresslevel=self.compresslevel, mtime=0)
+            headers["content-encoding"] = "gzip"
+            headers["content-length"] = str(len(body))
+            if "etag" in headers:
+                headers["etag"] = headers["etag"][:-1] + '-gzip"'
+
+        await send({**start, "headers": headers.raw})
+        await send({**message, "body": body})
+
+
+def cache_control(
+    max_age: Union[int, Callable[[], float]], private: bool = False
+) -> Any:
+    """
+    Route dependency setting ``Cache-Control`` on successful responses.
+
+    Args:
+        max_age: Freshness lifetime in seconds, or a function computing it
+            per request (e.g. seconds until the next daily refresh)
+        private: Allow only the client, not shared caches or CDNs, to store it
+    """
+
+    def set_cache_control(response: Response) -> None:
+        seconds = max_age() if callable(max_age) else max_age
+        scope = "private" if private else "public"
+        response.headers["Cache-Control"] = f"{scope}, max-age={max(0, int(seconds))}"
+
+    return Depends(set_cache_control)
@@ -0,0 +1,269 @@
+"""
+Background jobs for slow AI endpoints.
+
+A submitted job is recorded in the MongoDB ``jobs`` collection and queued
+for a bounded pool of asyncio workers in the same process. Status and
+results live in MongoDB, expiring through a TTL index on ``created_at``,
+so any worker process can answer a poll. Waiting for a job started by
+this process wakes on completion; jobs from other processes are polled.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.database import db
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+FINISHED = (SUCCEEDED, FAILED)
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class JobQueueFullError(Exception):
+    """Raised when this process already has as many unfinished jobs as allowed."""
+
+
+def job_error(error: BaseException, timeout: float) -> Dict[str, Any]:
+    """The status code and detail a synchronous request would have failed with."""
+    if isinstance(error, HTTPException):
+        return {"status_code": error.status_code, "detail": error.detail}
+    if isinstance(error, asyncio.TimeoutError):
+        return {"status_code": 504, "detail": f"Job timed out after {timeout:g}s"}
+    return {"status_code": 500, "detail": str(error)}
+
+
+def public_job(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """A job document as returned to clients."""
+    return {
+        "job_id": doc["_id"],
+        "kind": doc["kind"],
+        "status": doc["status"],
+        "created_at": doc["created_at"],
+        "started_at": doc.get("started_at"),
+        "finished_at": doc.get("finished_at"),
+        "result": doc.get("result"),
+        "error": doc.get("error"),
+    }
+
+
+class JobQueue:
+    """MongoDB-backed job store with an in-process asyncio worker pool."""
+
+    def __init__(
+        self,
+        collection: str,
+        *,
+        workers: int,
+        max_pending: int,
+        timeout: float,
+        ttl_seconds: int,
+        poll_interval: float = 0.5,
+    ):
+        self.collection = collection
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.ttl_seconds = ttl_seconds
+        self.poll_interval = poll_interval
+        self.handlers: Dict[str, JobHandler] = {}
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # Unfinished jobs of this process, set when each one finishes
+        self._pending: Dict[str, asyncio.Event] = {}
+        self._running = 0
+
+    def jobs_collection(self):
+        return db.get_db()[self.collection]
+
+    async def ensure_indexes(self) -> None:
+        """Create the TTL index that expires finished and abandoned jobs."""
+        try:
+            await self.jobs_collection().create_index(
+                "created_at", expireAfterSeconds=self.ttl_seconds
+            )
+        except Exception as e:
+            logging.error(f"Error creating TTL index for {self.collection}: {str(e)}")
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """Run ``handler(params)`` for jobs of ``kind``; it returns the result."""
+        self.handlers[kind] = handler
+
+    def _ensure_workers(self) -> None:
+        # Workers belong to the loop that submitted the first job
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._pending = {}
+        self._running = 0
+        self._tasks = [loop.create_task(self._work()) for _ in range(self.workers)]
+
+    async def submit(self, kind: str, params: Dict[str, Any]) -> str:
+        """
+        Record a job and queue it for the worker pool.
+
+        Returns:
+            str: The job id
+
+        Raises:
+            JobQueueFullError: If too many jobs are already pending
+        """
+        if kind not in self.handlers:
+            raise KeyError(f"Unknown job kind: {kind}")
+        self._ensure_workers()
+        if len(self._pending) >= self.max_pending:
+            self.rejected += 1
+            raise JobQueueFullError(f"{len(self._pending)} jobs already pending")
+        # Reserve the slot before awaiting, so concurrent submits see it
+        job_id = uuid.uuid4().hex
+        self._pending[job_id] = asyncio.Event()
+        try:
+            await self.jobs_collection().insert_one(
+                {
+                    "_id": job_id,
+                    "kind": kind,
+                    "params": params,
+                    "status": QUEUED,
+                    "created_at": datetime.now(timezone.utc),
+                }
+            )
+        except BaseException:
+            self._pending.pop(job_id, None)
+            raise
+        self.submitted += 1
+        self._queue.put_nowait((job_id, kind, params))
+        return job_id
+
+    async def _update(self, job_id: str, fields: Dict[str, Any]) -> None:
+        try:
+            await self.jobs_collection().update_one({"_id": job_id}, {"$set": fields})
+        except Exception as e:
+            logging.error(f"Error updating job {job_id}: {str(e)}")
+
+    async def _work(self) -> None:
+        while True:
+            job_id, kind, params = await self._queue.get()
+            self._running += 1
+            try:
+                await self._run(job_id, kind, params)
+            finally:
+                self._running -= 1
+                event = self._pending.pop(job_id, None)
+                if event is not None:
+                    event.set()
+
+    async def _run(self, job_id: str, kind: str, params: Dict[str, Any]) -> None:
+        await self._update(
+            job_id, {"status": RUNNING, "started_at": datetime.now(timezone.utc)}
+        )
+        try:
+            result = await asyncio.wait_for(self.handlers[kind](params), self.timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Job {job_id} ({kind}) failed: {str(e)}")
+            self.failed += 1
+            await self._update(
+                job_id,
+                {
+                    "status": FAILED,
+                    "error": job_error(e, self.timeout),
+                    "finished_at": datetime.now(timezone.utc),
+                },
+            )
+            return
+        self.succeeded += 1
+        await self._update(
+            job_id,
+            {
+                "status": SUCCEEDED,
+                "result": result,
+                "finished_at": datetime.now(timezone.utc),
+            },
+        )
+
+    async def get(self, job_id: str, wait: float = 0.0) -> Optional[Dict[str, Any]]:
+        """
+        Look up a job, waiting up to ``wait`` seconds for it to finish.
+
+        Returns:
+            dict: The job's status, plus its result or error once finished,
+                or None if there is no such job (or it has expired)
+        """
+        deadline = time.monotonic() + wait
+        doc = await self.jobs_collection().find_one({"_id": job_id})
+        while doc is not None and doc["status"] not in FINISHED:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            event = (
+                self._pending.get(job_id)
+                if self._loop is asyncio.get_running_loop()
+                else None
+            )
+            if event is not None:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(event.wait(), remaining)
+            else:
+                await asyncio.sleep(min(self.poll_interval, remaining))
+            doc = await self.jobs_collection().find_one({"_id": job_id})
+        return public_job(doc) if doc is not None else None
+
+    async def stop(self) -> None:
+        """Cancel the workers and fail the jobs they will no longer run."""
+        unfinished = list(self._pending)
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for job_id in unfinished:
+            await self._update(
+                job_id,
+                {
+                    "status": FAILED,
+                    "error": {
+                        "status_code": 503,
+                        "detail": "Server shut down before the job finished",
+                    },
+                    "finished_at": datetime.now(timezone.utc),
+                },
+            )
+        self._pending.clear()
+        self._loop = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queued": len(self._pending) - self._running,
+            "running": self._running,
+            "submitted": self.submitted,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+
+job_queue = JobQueue(
+    "jobs",
+    workers=settings.JOB_WORKERS,
+    max_pending=settings.JOB_MAX_PENDING,
+    timeout=settings.JOB_TIMEOUT_SECONDS,
+    ttl_seconds=settings.JOB_TTL_SECONDS,
+)
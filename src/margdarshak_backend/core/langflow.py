@@ -0,0 +1,252 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Callable, Dict, NamedTuple, Optional, Tuple
+
+import httpx
+
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.http import http
+
+
+class Flow(NamedTuple):
+    endpoint: str
+    timeout: float
+    max_concurrency: int
+    # False for names missing from the flow map, used as endpoints directly
+    configured: bool = True
+
+
+class FlowMap:
+    """
+    Flow name to Langflow endpoint mapping, reloaded when its file changes.
+
+    Entries are either an endpoint string or an object with ``endpoint`` and
+    optional ``timeout`` and ``max_concurrency`` overrides. Unknown names are
+    used as endpoints directly, with the default timeout and concurrency.
+    A missing or invalid file keeps the last good mapping.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._mtime: Optional[float] = None
+        self._flows: Dict[str, Flow] = {}
+
+    def _reload_if_changed(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except FileNotFoundError:
+            if self._mtime is None:
+                logging.warning(f"Flow endpoint file {self.path} not found")
+                self._mtime = -1.0
+            return
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        try:
+            with open(self.path, "r") as file:
+                entries = json.load(file)
+            self._flows = {name: self._parse(entry) for name, entry in entries.items()}
+            logging.info(f"Loaded {len(self._flows)} Langflow flows from {self.path}")
+        except Exception as e:
+            logging.error(f"Error loading flow endpoint file {self.path}: {str(e)}")
+
+    @staticmethod
+    def _parse(entry: Any) -> Flow:
+        if isinstance(entry, str):
+            entry = {"endpoint": entry}
+        return Flow(
+            endpoint=entry["endpoint"],
+            timeout=float(entry.get("timeout", settings.LANGFLOW_TIMEOUT_SECONDS)),
+            max_concurrency=int(
+                entry.get("max_concurrency", settings.LANGFLOW_MAX_CONCURRENCY)
+            ),
+        )
+
+    def get(self, name: str) -> Flow:
+        self._reload_if_changed()
+        flow = self._flows.get(name)
+        if flow is None:
+            flow = self._parse(name)._replace(configured=False)
+        return flow
+
+
+class FlowStream:
+    """
+    Decoded body of a streaming flow run.
+
+    ``aclose`` releases the upstream response and the flow's concurrency
+    slot; it runs when iteration ends and is safe to call again, e.g. from
+    a response background task if the client goes away first.
+    """
+
+    def __init__(
+        self,
+        response: httpx.Response,
+        release: Callable[[], None],
+        gateway: "LangflowGateway",
+    ):
+        self.response = response
+        self._release = release
+        self._gateway = gateway
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in self.response.aiter_bytes():
+                yield chunk
+        except Exception:
+            self._gateway.errors += 1
+            raise
+        finally:
+            await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        await self.response.aclose()
+        self._release()
+
+
+class LangflowGateway:
+    """
+    Async proxy for Langflow flow runs over the shared pooled client.
+
+    Each configured flow has its own concurrency limit, so a slow flow
+    cannot take every upstream connection, and its own timeout: one
+    deadline covers both waiting for a slot and the run itself. Names
+    missing from the flow map come from clients, so they all share one
+    ``LANGFLOW_MAX_CONCURRENCY`` limit rather than getting a slot each.
+    """
+
+    def __init__(self, flows: FlowMap):
+        self.flows = flows
+        # Keyed by endpoint; None is the shared slot for unconfigured names
+        self._semaphores: Dict[Optional[str], Tuple[int, asyncio.Semaphore]] = {}
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.in_flight = 0
+
+    def _semaphore(self, flow: Flow) -> asyncio.Semaphore:
+        key = flow.endpoint if flow.configured else None
+        limit, semaphore = self._semaphores.get(key, (None, None))
+        if limit != flow.max_concurrency:
+            # Limit changed on reload: new runs use the new semaphore
+            semaphore = asyncio.Semaphore(flow.max_concurrency)
+            self._semaphores[key] = (flow.max_concurrency, semaphore)
+        return semaphore
+
+    @staticmethod
+    def _request(flow: Flow, payload: Dict[str, Any], stream: bool) -> httpx.Request:
+        return http.get_client("langflow").build_request(
+            "POST",
+            f"/lf/{settings.LANGFLOW_ID}/api/v1/run/{flow.endpoint}",
+            params={"stream": "true"} if stream else None,
+            json=payload,
+            headers={
+                "Authorization": f"Bearer {settings.LANGFLOW_API_KEY}",
+                "Content-Type": "application/json",
+            },
+            timeout=httpx.Timeout(flow.timeout, connect=settings.HTTP_CONNECT_TIMEOUT),
+        )
+
+    @staticmethod
+    def _deadline(flow: Flow) -> float:
+        return asyncio.get_running_loop().time() + flow.timeout
+
+    async def _acquire(self, flow: Flow, deadline: float) -> asyncio.Semaphore:
+        semaphore = self._semaphore(flow)
+        try:
+            async with asyncio.timeout_at(deadline):
+                await semaphore.acquire()
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        self.calls += 1
+        self.in_flight += 1
+        return semaphore
+
+    def _release(self, semaphore: asyncio.Semaphore) -> None:
+        self.in_flight -= 1
+        semaphore.release()
+
+    async def run(self, name: str, payload: Dict[str, Any]) -> Any:
+        """
+        Run a flow and return Langflow's JSON response.
+
+        Raises:
+            asyncio.TimeoutError: If the run exceeds the flow's timeout
+            httpx.HTTPError: If Langflow fails or returns an error status
+        """
+        flow = self.flows.get(name)
+        deadline = self._deadline(flow)
+        semaphore = await self._acquire(flow, deadline)
+        try:
+            async with asyncio.timeout_at(deadline):
+                response = await http.get_client("langflow").send(
+                    self._request(flow, payload, stream=False)
+                )
+            response.raise_for_status()
+            return response.json()
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            self.timeouts += 1
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self._release(semaphore)
+
+    async def stream(
+        self, name: str, payload: Dict[str, Any]
+    ) -> Tuple[str, "FlowStream"]:
+        """
+        Start a streaming flow run.
+
+        The upstream status is checked before returning, so errors can still
+        be reported as HTTP errors; the concurrency slot is held until the
+        returned iterator is exhausted or closed. The flow's timeout bounds
+        the wait for a slot and for the response headers together.
+
+        Returns:
+            tuple: Upstream content type and the body stream
+        """
+        flow = self.flows.get(name)
+        deadline = self._deadline(flow)
+        semaphore = await self._acquire(flow, deadline)
+        try:
+            async with asyncio.timeout_at(deadline):
+                response = await http.get_client("langflow").send(
+                    self._request(flow, payload, stream=True), stream=True
+                )
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            self.timeouts += 1
+            self._release(semaphore)
+            raise
+        except Exception:
+            self.errors += 1
+            self._release(semaphore)
+            raise
+        if response.is_error:
+            await response.aread()
+            await response.aclose()
+            self.errors += 1
+            self._release(semaphore)
+            response.raise_for_status()
+        return response.headers.get("content-type", "text/event-stream"), FlowStream(
+            response, lambda: self._release(semaphore), self
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+        }
+
+
+langflow = LangflowGateway(FlowMap(settings.LANGFLOW_FLOW_ENDPOINTS_FILE))
@@ -0,0 +1,290 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Counters and histograms are plain Python objects updated on the hot path
+with a dict lookup, a bisect and a few additions under a lock (MongoDB
+command events arrive on driver threads). Values that other modules
+already track are added at scrape time: running totals such as cache hits
+with ``counter_lines``, point-in-time values with ``gauge_lines``.
+"""
+
+import bisect
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+from pymongo import monitoring
+
+Labels = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[Any]) -> str:
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Metric:
+    registry: Dict[str, "Metric"] = {}
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        Metric.registry[name] = self
+
+    def header(self) -> List[str]:
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, labels: Labels = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._values.get(labels, 0.0)
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in sorted(self._values.items()):
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}{label_text} {_format_value(value)}")
+        return lines
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+        # Per label set: [count per bucket (last is +Inf)], sum
+        self._series: Dict[Labels, List[Any]] = {}
+
+    def observe(self, labels: Labels, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, labels: Labels) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                bucket_labels = _format_labels(
+                    self.labelnames + ("le",), labels + (bound,)
+                )
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            base = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{base} {_format_value(total)}")
+            lines.append(f"{self.name}_count{base} {cumulative}")
+        return lines
+
+
+def _sample_lines(
+    kind: str,
+    name: str,
+    documentation: str,
+    labelnames: Tuple[str, ...],
+    samples: Iterable[Tuple[Labels, float]],
+) -> List[str]:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(
+            f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}"
+        )
+    return lines
+
+
+def gauge_lines(
+    name: str,
+    documentation: str,
+    labelnames: Tuple[str, ...],
+    samples: Iterable[Tuple[Labels, float]],
+) -> List[str]:
+    """Render a gauge from values computed at scrape time."""
+    return _sample_lines("gauge", name, documentation, labelnames, samples)
+
+
+def counter_lines(
+    name: str,
+    documentation: str,
+    labelnames: Tuple[str, ...],
+    samples: Iterable[Tuple[Labels, float]],
+) -> List[str]:
+    """
+    Render a counter from running totals read at scrape time.
+
+    ``name`` should end in ``_total``; the totals must only ever grow for
+    the life of the process.
+    """
+    return _sample_lines("counter", name, documentation, labelnames, samples)
+
+
+def render_metrics(extra_lines: Iterable[str] = ()) -> str:
+    """All registered metrics plus any scrape-time lines, as exposition text."""
+    lines: List[str] = []
+    for metric in Metric.registry.values():
+        lines.extend(metric.render())
+    lines.extend(extra_lines)
+    return "\n".join(lines) + "\n"
+
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "Time to serve an API request, by route template",
+    ("method", "route", "status"),
+)
+upstream_request_duration = Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to upstream services",
+    ("upstream", "outcome"),
+)
+upstream_errors = Counter(
+    "upstream_errors_total",
+    "Failed calls to upstream services, by error type",
+    ("upstream", "error"),
+)
+mongodb_command_duration = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command round-trip time",
+    ("command", "outcome"),
+)
+
+
+def record_upstream(
+    upstream: str, elapsed: float, error: Optional[BaseException] = None
+) -> None:
+    """Record one upstream call; ``error`` is the exception it failed with, if any."""
+    if error is None:
+        upstream_request_duration.observe((upstream, "ok"), elapsed)
+    else:
+        upstream_request_duration.observe((upstream, "error"), elapsed)
+        upstream_errors.inc((upstream, type(error).__name__))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request.
+
+    Requests are labelled with the matched route template rather than the
+    raw path, so path parameters do not create new series. Streaming
+    responses are timed until the stream ends.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            http_request_duration.observe(
+                (scope["method"], getattr(route, "path", "unmatched"), str(status)),
+                time.perf_counter() - start,
+            )
+
+
+class MetricsTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport wrapper recording latency and errors for one upstream.
+
+    Latency is measured to the response headers; 5xx responses count as
+    errors.
+    """
+
+    def __init__(self, upstream: str, transport: httpx.AsyncBaseTransport):
+        self.upstream = upstream
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        start = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception as e:
+            record_upstream(self.upstream, time.perf_counter() - start, e)
+            raise
+        if response.status_code >= 500:
+            upstream_request_duration.observe(
+                (self.upstream, "error"), time.perf_counter() - start
+            )
+            upstream_errors.inc((self.upstream, f"HTTP {response.status_code}"))
+        else:
+            record_upstream(self.upstream, time.perf_counter() - start)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """PyMongo command listener feeding ``mongodb_command_duration_seconds``."""
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        mongodb_command_duration.observe(
+            (event.command_name, "ok"), event.duration_micros / 1e6
+        )
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        mongodb_command_duration.observe(
+            (event.command_name, "error"), event.duration_micros / 1e6
+        )
@@ -0,0 +1,244 @@
+"""
+Circuit breakers and retry budgets for third-party upstreams.
+
+Each upstream gets an ``UpstreamGuard``: transient failures (connection
+errors, timeouts, 5xx and 429 responses) are retried with jittered backoff
+while the upstream's retry budget allows, and enough consecutive failures
+open its circuit so later calls fail immediately instead of waiting out
+another timeout. After ``reset_timeout`` one trial call is let through;
+its outcome closes the circuit or opens it again.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+from fastapi import HTTPException
+
+from src.margdarshak_backend.core.config import settings
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class UpstreamUnavailableError(HTTPException):
+    """Raised without calling the upstream while its circuit is open."""
+
+    def __init__(self, upstream: str, retry_after: float):
+        super().__init__(
+            status_code=503,
+            detail=f"{upstream} is temporarily unavailable",
+            headers={"Retry-After": str(max(1, round(retry_after)))},
+        )
+        self.upstream = upstream
+
+
+def is_transient(error: BaseException) -> bool:
+    """Whether an error says the upstream is struggling, not that the request is bad."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError))
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker driven by consecutive failures."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_in_flight = False
+
+    def retry_after(self) -> float:
+        return max(0.0, self.opened_at + self.reset_timeout - time.monotonic())
+
+    def allow(self) -> bool:
+        """Whether a call may go to the upstream now."""
+        if self.state == OPEN and self.retry_after() == 0.0:
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state = CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """Give back a half-open trial that ended without a verdict."""
+        self._trial_in_flight = False
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a share of recent calls.
+
+    Every call deposits ``ratio`` tokens and every retry withdraws one, so
+    retries can add at most ``ratio`` extra load on top of ``min_retries``
+    always available to a quiet upstream.
+    """
+
+    def __init__(self, ratio: float, min_retries: int):
+        self.ratio = ratio
+        self.max_tokens = min_retries + ratio * 100
+        self.tokens = float(min_retries)
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+class UpstreamGuard:
+    """Circuit breaker plus bounded, budgeted retries for one upstream."""
+
+    registry: Dict[str, "UpstreamGuard"] = {}
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_threshold: int,
+        reset_timeout: float,
+        max_retries: int,
+        retry_base_delay: float,
+        retry_budget_ratio: float,
+        retry_budget_min: int,
+        deadline: Optional[float] = None,
+    ):
+        self.name = name
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.budget = RetryBudget(retry_budget_ratio, retry_budget_min)
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.deadline = deadline
+        self.calls = 0
+        self.retries = 0
+        self.rejected = 0
+        self.budget_exhausted = 0
+        self.deadline_exceeded = 0
+        UpstreamGuard.registry[name] = self
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: uniform in [0, base * 2^attempt]
+        return random.uniform(0, self.retry_base_delay * 2**attempt)
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``fn`` against the upstream.
+
+        All attempts and the backoff between them share one overall
+        deadline, if the guard has one; a retry that could not start
+        before it is not made.
+
+        Raises:
+            UpstreamUnavailableError: If the circuit is open
+            asyncio.TimeoutError: If the deadline passed during an attempt
+            Exception: Whatever ``fn`` raised on its last attempt
+        """
+        self.calls += 1
+        self.budget.deposit()
+        loop = asyncio.get_running_loop()
+        deadline = None if self.deadline is None else loop.time() + self.deadline
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self.rejected += 1
+                raise UpstreamUnavailableError(self.name, self.breaker.retry_after())
+            try:
+                async with asyncio.timeout_at(deadline):
+                    result = await fn()
+            except Exception as e:
+                if not is_transient(e):
+                    # The upstream answered; the request itself was bad
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt >= self.max_retries or self.breaker.state == OPEN:
+                    raise
+                if not self.budget.withdraw():
+                    self.budget_exhausted += 1
+                    raise
+                delay = self._backoff(attempt)
+                if deadline is not None and loop.time() + delay >= deadline:
+                    self.deadline_exceeded += 1
+                    raise
+                self.retries += 1
+                logging.warning(
+                    f"{self.name} call failed ({type(e).__name__}), "
+                    f"retrying in {delay:.2f}s"
+                )
+                attempt += 1
+                await asyncio.sleep(delay)
+            except BaseException:
+                self.breaker.release()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "times_opened": self.breaker.times_opened,
+            "retry_after_seconds": (
+                round(self.breaker.retry_after(), 1)
+                if self.breaker.state == OPEN
+                else 0.0
+            ),
+            "calls": self.calls,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "budget_exhausted": self.budget_exhausted,
+            "deadline_exceeded": self.deadline_exceeded,
+            "retry_tokens": round(self.budget.tokens, 2),
+        }
+
+
+def guard_for(upstream: str) -> UpstreamGuard:
+    """The guard for an upstream, created with the configured policy on first use."""
+    guard: Optional[UpstreamGuard] = UpstreamGuard.registry.get(upstream)
+    if guard is None:
+        guard = UpstreamGuard(
+            upstream,
+            failure_threshold=settings.UPSTREAM_FAILURE_THRESHOLD,
+            reset_timeout=settings.UPSTREAM_RESET_TIMEOUT_SECONDS,
+            max_retries=settings.UPSTREAM_MAX_RETRIES,
+            retry_base_delay=settings.UPSTREAM_RETRY_BASE_DELAY,
+            retry_budget_ratio=settings.UPSTREAM_RETRY_BUDGET_RATIO,
+            retry_budget_min=settings.UPSTREAM_RETRY_BUDGET_MIN,
+            deadline=settings.UPSTREAM_CALL_DEADLINE_SECONDS,
+        )
+    return guard
+
+
+def upstream_health() -> Dict[str, Any]:
+    """Breaker state and retry counters for every guarded upstream."""
+    return {name: guard.stats() for name, guard in UpstreamGuard.registry.items()}
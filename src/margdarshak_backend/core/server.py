@@ -0,0 +1,43 @@
+import importlib.util
+import os
+from typing import Any, Dict
+
+from src.margdarshak_backend.core.config import settings
+
+APP_IMPORT_STRING = "src.margdarshak_backend.main:app"
+
+# Both ship with uvicorn[standard]; fall back to the pure-Python stack without them.
+UVLOOP_AVAILABLE = importlib.util.find_spec("uvloop") is not None
+HTTPTOOLS_AVAILABLE = importlib.util.find_spec("httptools") is not None
+
+
+def worker_count() -> int:
+    """Configured worker processes, defaulting to one per CPU core."""
+    return settings.SERVER_WORKERS or os.cpu_count() or 1
+
+
+def uvicorn_options() -> Dict[str, Any]:
+    """
+    Keyword arguments for ``uvicorn.run`` in the configured server mode.
+
+    Development runs a single auto-reloading worker. Production runs one
+    worker process per core with uvloop and httptools, no reload and no
+    per-request access log (request timings are in ``/api/metrics``).
+    """
+    options: Dict[str, Any] = {
+        "host": settings.SERVER_HOST,
+        "port": settings.SERVER_PORT,
+        "log_level": "info",
+    }
+    if settings.SERVER_ENV == "production":
+        options.update(
+            workers=worker_count(),
+            reload=False,
+            loop="uvloop" if UVLOOP_AVAILABLE else "asyncio",
+            http="httptools" if HTTPTOOLS_AVAILABLE else "h11",
+            access_log=False,
+            proxy_headers=True,
+        )
+    else:
+        options.update(workers=1, reload=True)
+    return options
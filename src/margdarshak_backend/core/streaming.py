@@ -0,0 +1,76 @@
+import json
+from typing import Any, AsyncIterator, Optional, Tuple
+
+from fastapi.responses import StreamingResponse
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def sse_response(events: AsyncIterator[str]) -> StreamingResponse:
+    """
+    Stream server-sent events to the client.
+
+    Starlette cancels the generator when the client disconnects, so any
+    cleanup belongs in the generator's ``finally`` block.
+    """
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Disable proxy buffering
+        },
+    )
+
+
+class LineTooLongError(ValueError):
+    """Raised when an NDJSON line exceeds the allowed length."""
+
+    def __init__(self, line_number: int, max_line_bytes: int):
+        super().__init__(f"Line {line_number} is longer than {max_line_bytes} bytes")
+        self.line_number = line_number
+
+
+async def iter_ndjson(
+    chunks: AsyncIterator[bytes], max_line_bytes: Optional[int] = None
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Split a streamed NDJSON body into ``(line_number, line)`` pairs.
+
+    Only the current partial line is buffered, and each chunk is scanned
+    for newlines once; blank lines are skipped but still counted so line
+    numbers match the client's file.
+
+    Raises:
+        LineTooLongError: As soon as a line grows past ``max_line_bytes``
+    """
+    buffer = bytearray()
+    line_number = 0
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            buffer += chunk[start:end]
+            start = end + 1
+            line_number += 1
+            if max_line_bytes is not None and len(buffer) > max_line_bytes:
+                raise LineTooLongError(line_number, max_line_bytes)
+            if buffer.strip():
+                yield line_number, bytes(buffer)
+            buffer.clear()
+        buffer += chunk[start:]
+        if max_line_bytes is not None and len(buffer) > max_line_bytes:
+            raise LineTooLongError(line_number + 1, max_line_bytes)
+    if buffer.strip():
+        yield line_number + 1, bytes(buffer)
+
+
+def ndjson_response(lines: AsyncIterator[bytes]) -> StreamingResponse:
+    """Stream newline-delimited JSON records to the client."""
+    return StreamingResponse(
+        lines,
+        media_type="application/x-ndjson",
+        headers={"X-Accel-Buffering": "no"},
+    )
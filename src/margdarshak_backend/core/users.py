@@ -0,0 +1,245 @@
+import json
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.margdarshak_backend.core.cache import TTLCache
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.database import db
+from src.margdarshak_backend.models.user import UserData
+
+# Only the fields UserData needs, never Mongo's _id
+USER_PROJECTION = {
+    "_id": 0,
+    "birth_utc_offsets": 1,
+    **{field: 1 for field in UserData.model_fields},
+}
+
+# A profile as served to routes: UserData plus the results precomputed for it
+PROFILE_PROJECTION = {**USER_PROJECTION, "precomputed": 1}
+
+# Documents written before dates were stored as native BSON datetimes
+LEGACY_DATE_FILTER = {
+    "$or": [
+        {field: {"$type": "string"}}
+        for field in ("date_of_birth", "time_of_birth", "created_at")
+    ]
+}
+
+# Validated profiles of hot users with their precomputed results. Writes
+# through this module invalidate the local entry; other workers see changes
+# within the TTL.
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+def user_collection():
+    return db.get_db()["user_data"]
+
+
+async def load_profile(user_id: str) -> Optional[Tuple[UserData, Dict[str, Any]]]:
+    """
+    Load a user's validated profile and raw precomputed entries in one read,
+    from the cache when possible.
+    """
+    profile = user_cache.get(user_id)
+    if profile is not None:
+        return profile
+    data = await user_collection().find_one({"user_id": user_id}, PROFILE_PROJECTION)
+    if not data:
+        return None
+    precomputed = data.pop("precomputed", None) or {}
+    profile = (UserData.from_document(data), precomputed)
+    user_cache.set(user_id, profile)
+    return profile
+
+
+async def get_user(user_id: str) -> Optional[UserData]:
+    """Load a user's validated profile, from the cache when possible."""
+    profile = await load_profile(user_id)
+    return profile[0] if profile is not None else None
+
+
+async def create_user(data: UserData) -> str:
+    """
+    Store a new user profile, assigning a user_id if none was given.
+
+    Returns:
+        str: The user's user_id
+
+    Raises:
+        pymongo.errors.DuplicateKeyError: If the user_id is already taken
+    """
+    user_id = data.user_id or uuid.uuid4().hex
+    user = data.model_copy(update={"user_id": user_id})
+    await user_collection().insert_one(user.to_document())
+    invalidate_user(user_id)
+    return user_id
+
+
+def as_utc(value: datetime) -> datetime:
+    """An aware UTC datetime; MongoDB hands back stored UTC times naive."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def invalidate_user(user_id: str) -> None:
+    user_cache.pop(user_id)
+
+
+async def save_precomputed(user_id: str, key: str, value: Any) -> None:
+    """Store a result computed ahead of time next to the user's profile."""
+    entry = {"value": value, "computed_at": datetime.now(timezone.utc)}
+    await user_collection().update_one(
+        {"user_id": user_id}, {"$set": {f"precomputed.{key}": entry}}
+    )
+    invalidate_user(user_id)
+
+
+async def get_precomputed(user_id: str) -> Dict[str, Any]:
+    """
+    Results precomputed for a user, by key.
+
+    They come with the cached profile, so this costs no extra query once
+    the user is loaded. Entries older than PRECOMPUTE_MAX_AGE_SECONDS are
+    skipped. A MongoDB error is logged and read as nothing precomputed, so
+    callers fall back to computing the result.
+    """
+    try:
+        profile = await load_profile(user_id)
+    except Exception as e:
+        logging.error(f"Error reading precomputed results for {user_id}: {str(e)}")
+        return {}
+    max_age = timedelta(seconds=settings.PRECOMPUTE_MAX_AGE_SECONDS)
+    cutoff = datetime.now(timezone.utc) - max_age
+    entries = profile[1] if profile is not None else {}
+    return {
+        key: entry["value"]
+        for key, entry in entries.items()
+        if as_utc(entry["computed_at"]) >= cutoff
+    }
+
+
+class ImportReport:
+    """Running totals for a bulk import, with the first few errors by line."""
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.inserted = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def fail(self, line: int, error: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "error": error})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"inserted": self.inserted, "failed": self.failed, "errors": self.errors}
+
+
+async def _insert_chunk(
+    chunk: List[Tuple[int, Dict[str, Any]]], report: ImportReport
+) -> None:
+    try:
+        result = await user_collection().insert_many(
+            [doc for _, doc in chunk], ordered=False
+        )
+        report.inserted += len(result.inserted_ids)
+    except BulkWriteError as e:
+        report.inserted += e.details.get("nInserted", 0)
+        for error in e.details.get("writeErrors", []):
+            report.fail(chunk[error["index"]][0], error.get("errmsg", "write error"))
+
+
+async def import_users(lines: AsyncIterator[Tuple[int, bytes]]) -> Dict[str, Any]:
+    """
+    Validate and insert NDJSON user records in chunks.
+
+    Records are validated as UserData and written with unordered
+    ``insert_many``, so one bad or duplicate record never blocks the rest.
+    At most one chunk is held in memory at a time.
+
+    Args:
+        lines: ``(line_number, raw_json)`` pairs, as from ``iter_ndjson``
+
+    Returns:
+        dict: Inserted and failed counts plus the first errors by line
+    """
+    report = ImportReport(settings.USER_IMPORT_MAX_ERRORS)
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+    async for line_number, line in lines:
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("Record must be a JSON object")
+            user = UserData.model_validate(record)
+        except (ValueError, ValidationError) as e:
+            report.fail(line_number, str(e))
+            continue
+        if not user.user_id:
+            user.user_id = uuid.uuid4().hex
+        chunk.append((line_number, user.to_document()))
+        if len(chunk) >= settings.USER_IMPORT_CHUNK_SIZE:
+            await _insert_chunk(chunk, report)
+            chunk = []
+    if chunk:
+        await _insert_chunk(chunk, report)
+    return report.as_dict()
+
+
+async def export_users() -> AsyncIterator[bytes]:
+    """Yield every stored profile as one NDJSON line, reading in cursor batches."""
+    cursor = user_collection().find(
+        {}, USER_PROJECTION, batch_size=settings.USER_EXPORT_BATCH_SIZE
+    )
+    async for doc in cursor:
+        user = UserData.from_document(doc)
+        yield json.dumps(user.model_dump()).encode("utf-8") + b"\n"
+
+
+async def migrate_legacy_dates(batch_size: int = 1000) -> Dict[str, Any]:
+    """
+    Rewrite string-dated user documents with native BSON datetimes.
+
+    Safe to re-run; only documents still matching LEGACY_DATE_FILTER are
+    touched. Documents that do not decode are left as they are and
+    reported, so one bad record does not stop the migration.
+
+    Returns:
+        dict: Migrated and skipped counts, and the first errors by _id
+    """
+    collection = user_collection()
+    migrated = 0
+    skipped = 0
+    errors: List[Dict[str, Any]] = []
+    batch: List[UpdateOne] = []
+    async for doc in collection.find(LEGACY_DATE_FILTER, batch_size=batch_size):
+        fields = {key: value for key, value in doc.items() if key != "_id"}
+        try:
+            encoded = UserData.from_document(fields).to_document()
+        except (ValueError, ValidationError, KeyError, TypeError) as e:
+            logging.warning(f"Skipped user document {doc['_id']}: {str(e)}")
+            skipped += 1
+            if len(errors) < settings.USER_IMPORT_MAX_ERRORS:
+                errors.append({"_id": str(doc["_id"]), "error": str(e)})
+            continue
+        encoded.pop("user_id")
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": encoded}))
+        if len(batch) >= batch_size:
+            result = await collection.bulk_write(batch, ordered=False)
+            migrated += result.modified_count
+            batch = []
+    if batch:
+        result = await collection.bulk_write(batch, ordered=False)
+        migrated += result.modified_count
+    user_cache.clear()
+    return {"migrated": migrated, "skipped": skipped, "errors": errors}
@@ -0,0 +1,123 @@
+"""
+Divisional charts (vargas) derived from D1 sidereal longitudes.
+
+Each varga is a lookup table indexed by (D1 sign, part of the sign), so every
+body in every chart is placed with a few vectorized NumPy operations.
+Uniform vargas split a sign into N equal parts; the Trimsamsa (D30) uses the
+classical unequal degree ranges.
+"""
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from src.margdarshak_backend.core.ephemeris import SIGNS
+from src.margdarshak_backend.models.horoscope import ChartType
+
+_SIGN = np.arange(12)
+_ODD = _SIGN % 2 == 0  # Aries, Gemini, ... are odd signs
+_MODALITY = _SIGN % 3  # 0 movable, 1 fixed, 2 dual
+
+
+def _by_modality(movable: int, fixed: int, dual: int) -> np.ndarray:
+    return np.choose(_MODALITY, [movable, fixed, dual])
+
+
+def _by_parity(odd: np.ndarray, even: np.ndarray) -> np.ndarray:
+    return np.where(_ODD, odd, even)
+
+
+def _uniform(divisions: int, start: np.ndarray) -> np.ndarray:
+    """Table for vargas counting consecutive signs from a per-sign start."""
+    return (start[:, None] + np.arange(divisions)[None, :]) % 12
+
+
+def _explicit(odd: List[int], even: List[int]) -> np.ndarray:
+    """Table for vargas listing the target signs for odd and even signs."""
+    return np.where(_ODD[:, None], np.array(odd)[None, :], np.array(even)[None, :])
+
+
+# Varga sign for (D1 sign, part index), per Parashara's rules
+VARGA_TABLES: Dict[ChartType, np.ndarray] = {
+    ChartType.D1: _uniform(1, _SIGN),
+    ChartType.D2: _explicit([4, 3], [3, 4]),
+    ChartType.D3: (_SIGN[:, None] + 4 * np.arange(3)[None, :]) % 12,
+    ChartType.D4: (_SIGN[:, None] + 3 * np.arange(4)[None, :]) % 12,
+    ChartType.D5: _explicit([0, 10, 8, 2, 6], [1, 5, 11, 9, 7]),
+    ChartType.D6: _uniform(6, _by_parity(0, 6)),
+    ChartType.D7: _uniform(7, _by_parity(_SIGN, _SIGN + 6)),
+    ChartType.D8: _uniform(8, _by_modality(0, 8, 4)),
+    ChartType.D9: _uniform(9, _SIGN * 9),
+    ChartType.D10: _uniform(10, _by_parity(_SIGN, _SIGN + 8)),
+    ChartType.D11: _uniform(11, _SIGN * 11),
+    ChartType.D12: _uniform(12, _SIGN),
+    ChartType.D16: _uniform(16, _by_modality(0, 4, 8)),
+    ChartType.D20: _uniform(20, _by_modality(0, 8, 4)),
+    ChartType.D24: _uniform(24, _by_parity(4, 3)),
+    ChartType.D27: _uniform(27, _SIGN * 27),
+    ChartType.D30: _explicit([0, 10, 8, 2, 6], [1, 5, 11, 9, 7]),
+    ChartType.D40: _uniform(40, _by_parity(0, 6)),
+    ChartType.D45: _uniform(45, _by_modality(0, 4, 8)),
+    ChartType.D60: _uniform(60, _SIGN),
+}
+
+# Trimsamsa part boundaries (degrees within the sign) for odd and even signs
+_D30_BOUNDS = np.array([
+    [5.0, 10.0, 18.0, 25.0],
+    [5.0, 12.0, 20.0, 25.0],
+])
+
+
+def _parts(chart_type: ChartType, signs: np.ndarray, degrees: np.ndarray) -> np.ndarray:
+    if chart_type == ChartType.D30:
+        bounds = _D30_BOUNDS[(signs % 2)]
+        return (degrees[:, None] >= bounds).sum(axis=1)
+    divisions = VARGA_TABLES[chart_type].shape[1]
+    return np.minimum((degrees * divisions / 30.0).astype(int), divisions - 1)
+
+
+def varga_signs(longitudes: np.ndarray, chart_type: ChartType) -> np.ndarray:
+    """Varga sign indices (0 = Aries) for an array of sidereal longitudes."""
+    longitudes = np.mod(np.asarray(longitudes, dtype=float), 360.0)
+    signs = (longitudes // 30).astype(int) % 12
+    degrees = longitudes - signs * 30.0
+    return VARGA_TABLES[chart_type][signs, _parts(chart_type, signs, degrees)]
+
+
+def derive_vargas(
+    longitudes: Dict[str, float],
+    chart_types: Iterable[ChartType] = tuple(ChartType),
+) -> Dict[str, Any]:
+    """
+    Place the ascendant and bodies in each requested divisional chart.
+
+    Args:
+        longitudes: Sidereal longitudes in degrees, keyed by body name; must
+            include "Ascendant"
+        chart_types: Divisional charts to derive (defaults to all)
+
+    Returns:
+        dict: Per chart type, the ascendant sign and each body's sign and
+            whole-sign house
+    """
+    names: Tuple[str, ...] = ("Ascendant",) + tuple(
+        name for name in longitudes if name != "Ascendant"
+    )
+    values = np.array([longitudes[name] for name in names])
+
+    charts: Dict[str, Any] = {}
+    for chart_type in dict.fromkeys(chart_types):
+        signs = varga_signs(values, chart_type)
+        houses = (signs - signs[0]) % 12 + 1
+        charts[chart_type.value] = {
+            "ascendant": {"sign": SIGNS[signs[0]], "sign_num": int(signs[0]) + 1},
+            "planets": [
+                {
+                    "name": name,
+                    "sign": SIGNS[sign],
+                    "sign_num": int(sign) + 1,
+                    "house": int(house),
+                }
+                for name, sign, house in zip(names[1:], signs[1:], houses[1:])
+            ],
+        }
+    return charts
@@ -1,10 +1,18 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
 from src.margdarshak_backend.core.config import settings
 from src.margdarshak_backend.api.routes import router as api_router
 from src.margdarshak_backend.core.database import db
+from src.margdarshak_backend.core.http import http
+from src.margdarshak_backend.core.gemini import gemini
+from src.margdarshak_backend.core.cache import ensure_cache_indexes
+from src.margdarshak_backend.core.horoscope_feed import sign_horoscopes
+from src.margdarshak_backend.core.jobs import job_queue
+from src.margdarshak_backend.core.metrics import MetricsMiddleware
+from src.margdarshak_backend.core.http_caching import HTTPCachingMiddleware
 
 # Configure logging
 logging.basicConfig(
@@ -22,8 +30,18 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logging.error(f"Failed to connect to MongoDB: {str(e)}")
         raise
+    await db.ensure_indexes()
+    await ensure_cache_indexes()
+    await job_queue.ensure_indexes()
+    await http.connect()
+    await gemini.warm_up()
+    if settings.HOROSCOPE_PREFETCH_ENABLED:
+        sign_horoscopes.start()
     yield
     # Shutdown logic
+    await sign_horoscopes.stop()
+    await job_queue.stop()
+    await http.close()
     try:
         logging.info("Closing MongoDB connection...")
         await db.close_db()
@@ -36,7 +54,8 @@ app = FastAPI(
     description="Backend API",
     version="1.0.0",
     lifespan=lifespan,
-    debug=settings.DEBUG_MODE,
+    debug=settings.debug_enabled,
+    default_response_class=ORJSONResponse,
     openapi_tags=[
         {
             "name": "langflow",
@@ -71,5 +90,15 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# ETags, 304s and gzip for complete (non-streaming) responses
+app.add_middleware(
+    HTTPCachingMiddleware,
+    minimum_size=settings.GZIP_MINIMUM_SIZE,
+    compresslevel=settings.GZIP_COMPRESS_LEVEL,
+)
+
+# Time every request, outermost so middleware time is included
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(api_router, prefix=settings.API_V1_STR) 
\ No newline at end of file
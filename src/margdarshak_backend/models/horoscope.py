@@ -0,0 +1,45 @@
+from enum import Enum
+
+
+class ZodiacSign(str, Enum):
+    ARIES = "Aries"
+    TAURUS = "Taurus"
+    GEMINI = "Gemini"
+    CANCER = "Cancer"
+    LEO = "Leo"
+    VIRGO = "Virgo"
+    LIBRA = "Libra"
+    SCORPIO = "Scorpio"
+    SAGITTARIUS = "Sagittarius"
+    CAPRICORN = "Capricorn"
+    AQUARIUS = "Aquarius"
+    PISCES = "Pisces"
+
+
+class Day(str, Enum):
+    TODAY = "TODAY"
+    TOMORROW = "TOMORROW"
+    YESTERDAY = "YESTERDAY"
+
+
+class ChartType(str, Enum):
+    D1 = "d1"
+    D2 = "d2"
+    D3 = "d3"
+    D4 = "d4"
+    D5 = "d5"
+    D6 = "d6"
+    D7 = "d7"
+    D8 = "d8"
+    D9 = "d9"
+    D10 = "d10"
+    D11 = "d11"
+    D12 = "d12"
+    D16 = "d16"
+    D20 = "d20"
+    D24 = "d24"
+    D27 = "d27"
+    D30 = "d30"
+    D40 = "d40"
+    D45 = "d45"
+    D60 = "d60"
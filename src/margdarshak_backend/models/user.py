@@ -1,8 +1,25 @@
-from datetime import datetime, time
-from typing import Optional
+from datetime import datetime, time, timedelta, timezone
+from typing import Any, Dict, Optional, TypeVar
 from pydantic import BaseModel, Field
 from enum import Enum
 
+WallClock = TypeVar("WallClock", datetime, time)
+
+# Birth fields are local wall-clock values; BSON would shift aware ones to UTC
+BIRTH_FIELDS = ("date_of_birth", "time_of_birth")
+
+
+def utc_offset_minutes(value: WallClock) -> Optional[int]:
+    offset = value.utcoffset()
+    return None if offset is None else int(offset.total_seconds() // 60)
+
+
+def with_utc_offset(value: WallClock, minutes: Optional[int]) -> WallClock:
+    if minutes is None:
+        return value
+    return value.replace(tzinfo=timezone(timedelta(minutes=minutes)))
+
+
 class Gender(str, Enum):
     MALE = "male"
     FEMALE = "female"
@@ -50,4 +67,68 @@ class UserData(BaseModel):
                 obj["created_at"] = datetime.fromisoformat(obj["created_at"])
             except (ValueError, TypeError):
                 pass
-        return super().model_validate(obj, *args, **kwargs) 
\ No newline at end of file
+        return super().model_validate(obj, *args, **kwargs)
+
+    def to_document(self) -> Dict[str, Any]:
+        """
+        Encode for MongoDB with native BSON datetimes.
+
+        BSON has no time-of-day type, so ``time_of_birth`` is stored as the
+        full birth moment (date of birth plus time), which is also the value
+        to range-query when birth times matter.
+
+        Birth dates and times are stored as naive local wall-clock values,
+        since BSON would convert aware ones to UTC and shift the birth time.
+        Any UTC offsets they carried are kept in ``birth_utc_offsets``.
+        """
+        doc = {
+            "user_id": self.user_id,
+            "name": self.name,
+            "date_of_birth": self.date_of_birth.replace(tzinfo=None),
+            "time_of_birth": datetime.combine(
+                self.date_of_birth.date(), self.time_of_birth.replace(tzinfo=None)
+            ),
+            "gender": self.gender.value,
+            "state": self.state,
+            "city": self.city,
+            "created_at": self.created_at,
+        }
+        offsets = {
+            field: minutes
+            for field in BIRTH_FIELDS
+            if (minutes := utc_offset_minutes(getattr(self, field))) is not None
+        }
+        if offsets:
+            doc["birth_utc_offsets"] = offsets
+        return doc
+
+    @classmethod
+    def from_document(cls, doc: Dict[str, Any]) -> "UserData":
+        """
+        Decode a MongoDB document written by ``to_document``.
+
+        Native documents skip validation entirely; legacy documents with
+        string dates fall back to ``model_validate``.
+        """
+        date_of_birth = doc.get("date_of_birth")
+        time_of_birth = doc.get("time_of_birth")
+        created_at = doc.get("created_at")
+        if not (
+            isinstance(date_of_birth, datetime)
+            and isinstance(time_of_birth, datetime)
+            and isinstance(created_at, datetime)
+        ):
+            return cls.model_validate(dict(doc))
+        offsets = doc.get("birth_utc_offsets") or {}
+        date_of_birth = with_utc_offset(date_of_birth, offsets.get("date_of_birth"))
+        birth_time = with_utc_offset(time_of_birth.time(), offsets.get("time_of_birth"))
+        return cls.model_construct(
+            user_id=doc.get("user_id"),
+            name=doc["name"],
+            date_of_birth=date_of_birth,
+            time_of_birth=birth_time,
+            gender=Gender(doc["gender"]),
+            state=doc["state"],
+            city=doc["city"],
+            created_at=created_at,
+        ) 
\ No newline at end of file
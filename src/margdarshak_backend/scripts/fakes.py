@@ -0,0 +1,494 @@
+"""
+Offline stand-ins for every external dependency, used by the load test
+and the tests.
+
+Each upstream HTTP service is a small Starlette app served in-process
+through ``httpx.ASGITransport``, with configurable latency and error
+injection. Gemini is replaced by a fake model object and MongoDB by an
+in-memory client covering the Motor calls the app makes.
+``fake_environment`` installs all of them at once.
+"""
+import asyncio
+import contextlib
+import copy
+import io
+import random
+from datetime import datetime
+from datetime import time as dt_time
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+from bson import ObjectId
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from src.margdarshak_backend.core import users
+from src.margdarshak_backend.core.cache import TieredCache
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.database import MongoDB
+from src.margdarshak_backend.core.gemini import gemini
+from src.margdarshak_backend.core.http import HTTPClient
+from src.margdarshak_backend.core.metrics import MetricsTransport
+from src.margdarshak_backend.models.user import UserData
+
+
+class Faults:
+    """Latency and error injection shared by the fakes of one upstream."""
+
+    def __init__(
+        self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+    async def delay(self) -> None:
+        seconds = self.latency + random.uniform(0, self.jitter)
+        if seconds > 0:
+            await asyncio.sleep(seconds)
+
+    def should_fail(self) -> bool:
+        return self.error_rate > 0 and random.random() < self.error_rate
+
+
+def _with_faults(faults: Faults, handler):
+    async def endpoint(request: Request) -> Response:
+        await faults.delay()
+        if faults.should_fail():
+            return JSONResponse({"error": "injected failure"}, status_code=503)
+        return await handler(request)
+    return endpoint
+
+
+# Sidereal longitudes returned by the fake Astrology API planets endpoint
+FAKE_LONGITUDES = {
+    "Ascendant": 33.2, "Sun": 32.6, "Moon": 115.9, "Mars": 304.1, "Mercury": 17.4,
+    "Jupiter": 75.8, "Venus": 8.3, "Saturn": 268.7, "Rahu": 294.5, "Ketu": 114.5,
+}
+
+
+def astrology_app(faults: Faults) -> Starlette:
+    async def planets(request: Request) -> Response:
+        return JSONResponse({
+            "statusCode": 200,
+            "output": [{
+                str(i): {"name": name, "fullDegree": degree}
+                for i, (name, degree) in enumerate(FAKE_LONGITUDES.items())
+            }],
+        })
+
+    async def chart_url(request: Request) -> Response:
+        chart = request.path_params["chart"]
+        return JSONResponse({"statusCode": 200, "output": f"https://charts.bench/{chart}.svg"})
+
+    return Starlette(routes=[
+        Route("/planets", _with_faults(faults, planets), methods=["POST"]),
+        Route("/{chart}-chart-url", _with_faults(faults, chart_url), methods=["POST"]),
+    ])
+
+
+FAKE_GEMS = {
+    "LIFE": {"name": "Ruby", "semi_gem": "Garnet", "wear_finger": "Ring"},
+    "BENEFIC": {"name": "Pearl", "semi_gem": "Moonstone", "wear_finger": "Little"},
+    "LUCKY": {
+        "name": "Yellow Sapphire", "semi_gem": "Citrine", "wear_finger": "Index"
+    },
+}
+
+
+def vedicrishi_app(faults: Faults) -> Starlette:
+    async def gem_suggestion(request: Request) -> Response:
+        return JSONResponse({"response": FAKE_GEMS})
+
+    return Starlette(routes=[
+        Route("/vedicrishi", _with_faults(faults, gem_suggestion), methods=["POST"]),
+    ])
+
+
+def horoscope_app(faults: Faults) -> Starlette:
+    async def get_horoscope(request: Request) -> Response:
+        return JSONResponse({
+            "status": 200,
+            "success": True,
+            "data": {
+                "period": request.path_params["period"],
+                "sign": request.query_params.get("sign"),
+                "horoscope_data": "A calm day for steady progress.",
+            },
+        })
+
+    return Starlette(routes=[
+        Route("/api/v1/get-horoscope/{period}", _with_faults(faults, get_horoscope)),
+    ])
+
+
+def langflow_app(faults: Faults) -> Starlette:
+    async def run(request: Request) -> Response:
+        body = await request.json()
+        if request.query_params.get("stream") == "true":
+            async def events() -> AsyncIterator[bytes]:
+                for word in ("Namaste", " from", " Langflow"):
+                    yield f'data: {{"chunk": "{word}"}}\n\n'.encode()
+            return StreamingResponse(events(), media_type="text/event-stream")
+        message = {"text": body["input_value"]}
+        return JSONResponse({"outputs": [{"results": {"message": message}}]})
+
+    path = "/lf/{flow_id}/api/v1/run/{endpoint}"
+    return Starlette(routes=[
+        Route(path, _with_faults(faults, run), methods=["POST"]),
+    ])
+
+
+def chart_image_bytes() -> bytes:
+    """A small PNG standing in for a rendered chart."""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (600, 600), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((20, 20, 580, 580), outline="black", width=4)
+    draw.line((20, 20, 580, 580), fill="black", width=3)
+    draw.line((580, 20, 20, 580), fill="black", width=3)
+    out = io.BytesIO()
+    image.save(out, format="PNG")
+    return out.getvalue()
+
+
+CHART_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="600" height="600">'
+    '<rect x="20" y="20" width="560" height="560" fill="white" stroke="black"/>'
+    '<path d="M20 20L580 580M580 20L20 580" stroke="black"/></svg>'
+)
+
+
+def image_host_app(faults: Faults) -> Starlette:
+    """PNGs for chart analysis and per-chart SVGs like the Astrology API serves."""
+    image = chart_image_bytes()
+
+    async def chart(request: Request) -> Response:
+        return Response(image, media_type="image/png")
+
+    async def chart_svg(request: Request) -> Response:
+        name = request.path_params["name"]
+        svg = CHART_SVG.replace("</svg>", f"<!-- {name} --></svg>")
+        return Response(svg, media_type="image/svg+xml")
+
+    return Starlette(routes=[
+        Route("/{name}.png", _with_faults(faults, chart)),
+        Route("/{name}.svg", _with_faults(faults, chart_svg)),
+    ])
+
+
+class FakeGeminiModel:
+    """Replaces ``genai.GenerativeModel`` with canned, delayed responses."""
+
+    def __init__(self, faults: Faults, words: int = 60):
+        self.faults = faults
+        self.text = " ".join(["Gemstones focus planetary energy."] * (words // 4))
+
+    def _usage(self) -> SimpleNamespace:
+        return SimpleNamespace(
+            prompt_token_count=120, candidates_token_count=len(self.text) // 4
+        )
+
+    async def generate_content_async(self, contents: Any, stream: bool = False) -> Any:
+        from google.api_core import exceptions as google_exceptions
+
+        await self.faults.delay()
+        if self.faults.should_fail():
+            raise google_exceptions.ServiceUnavailable("injected failure")
+        if stream:
+            return FakeGeminiStream(self.text.split(". "), self._usage())
+        return SimpleNamespace(text=self.text, usage_metadata=self._usage())
+
+
+class FakeGeminiStream:
+    def __init__(self, parts: List[str], usage: SimpleNamespace):
+        self.parts = parts
+        self.usage_metadata = usage
+
+    async def __aiter__(self) -> AsyncIterator[SimpleNamespace]:
+        for part in self.parts:
+            await asyncio.sleep(0)
+            yield SimpleNamespace(text=part)
+
+
+def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for field, expected in query.items():
+        if field == "$or":
+            if not any(_matches(doc, clause) for clause in expected):
+                return False
+        elif isinstance(expected, dict) and any(k.startswith("$") for k in expected):
+            value = doc.get(field)
+            for op, operand in expected.items():
+                if op == "$type" and operand == "string" and not isinstance(value, str):
+                    return False
+                if op == "$in" and value not in operand:
+                    return False
+                if op == "$lte" and not (value is not None and value <= operand):
+                    return False
+                if op == "$lt" and not (value is not None and value < operand):
+                    return False
+                if op == "$exists" and (field in doc) != operand:
+                    return False
+        elif doc.get(field) != expected:
+            return False
+    return True
+
+
+# A Motor projection: field name to 1 (include) or 0 (exclude)
+Projection = Optional[Dict[str, Any]]
+
+def _set_path(doc: Dict[str, Any], path: str, value: Any) -> None:
+    *parents, leaf = path.split(".")
+    for part in parents:
+        doc = doc.setdefault(part, {})
+    doc[leaf] = value
+
+
+def _project(doc: Dict[str, Any], projection: Projection) -> Dict[str, Any]:
+    doc = copy.deepcopy(doc)
+    if not projection:
+        return doc
+    included = [field for field, flag in projection.items() if flag and field != "_id"]
+    if included:
+        doc = {field: doc[field] for field in ["_id", *included] if field in doc}
+    if not projection.get("_id", 1):
+        doc.pop("_id", None)
+    return doc
+
+
+class InMemoryCursor:
+    def __init__(self, docs: Iterable[Dict[str, Any]]):
+        self._docs = list(docs)
+
+    def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Dict[str, Any]]:
+        for doc in self._docs:
+            yield doc
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self._docs[:length] if length else list(self._docs)
+
+
+class InMemoryCollection:
+    """
+    The subset of Motor's collection API used by the app.
+
+    Queries support equality and a few operators; unique indexes are
+    enforced, other indexes are accepted and ignored.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.docs: Dict[Any, Dict[str, Any]] = {}
+        self._unique: Dict[str, Dict[Any, Any]] = {}
+
+    async def create_index(self, keys: Any, unique: bool = False, **kwargs: Any) -> str:
+        field = keys if isinstance(keys, str) else keys[0][0]
+        if unique:
+            self._unique.setdefault(field, {})
+        return kwargs.get("name", f"{field}_1")
+
+    def _check_unique(self, doc: Dict[str, Any]) -> None:
+        for field, index in self._unique.items():
+            value = doc.get(field)
+            if value is not None and index.get(value, doc["_id"]) != doc["_id"]:
+                raise DuplicateKeyError(
+                    f"E11000 duplicate key error {self.name}.{field}: {value}"
+                )
+
+    def _store(self, doc: Dict[str, Any]) -> None:
+        self._check_unique(doc)
+        old = self.docs.get(doc["_id"])
+        for field, index in self._unique.items():
+            if old is not None and old.get(field) is not None:
+                index.pop(old[field], None)
+            if doc.get(field) is not None:
+                index[doc[field]] = doc["_id"]
+        self.docs[doc["_id"]] = doc
+
+    def _find_ids(self, query: Dict[str, Any]) -> List[Any]:
+        if "_id" in query and not isinstance(query["_id"], dict):
+            doc = self.docs.get(query["_id"])
+            return [doc["_id"]] if doc is not None and _matches(doc, query) else []
+        for field, index in self._unique.items():
+            value = query.get(field)
+            if value is not None and not isinstance(value, dict):
+                _id = index.get(value)
+                if _id is None or not _matches(self.docs[_id], query):
+                    return []
+                return [_id]
+        return [_id for _id, doc in self.docs.items() if _matches(doc, query)]
+
+    async def find_one(
+        self, query: Dict[str, Any], projection: Projection = None
+    ) -> Optional[Dict[str, Any]]:
+        ids = self._find_ids(query)
+        return _project(self.docs[ids[0]], projection) if ids else None
+
+    def find(
+        self,
+        query: Optional[Dict[str, Any]] = None,
+        projection: Projection = None,
+        **kwargs: Any,
+    ) -> InMemoryCursor:
+        ids = self._find_ids(query or {})
+        return InMemoryCursor(_project(self.docs[_id], projection) for _id in ids)
+
+    async def count_documents(self, query: Dict[str, Any]) -> int:
+        return len(self._find_ids(query))
+
+    async def insert_one(self, doc: Dict[str, Any]) -> SimpleNamespace:
+        doc.setdefault("_id", ObjectId())
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError(f"E11000 duplicate key error {self.name}._id")
+        self._store(copy.deepcopy(doc))
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    async def insert_many(
+        self, docs: List[Dict[str, Any]], ordered: bool = True
+    ) -> SimpleNamespace:
+        inserted, errors = [], []
+        for index, doc in enumerate(docs):
+            try:
+                inserted.append((await self.insert_one(doc)).inserted_id)
+            except DuplicateKeyError as e:
+                errors.append({"index": index, "code": 11000, "errmsg": str(e)})
+                if ordered:
+                    break
+        if errors:
+            raise BulkWriteError({"nInserted": len(inserted), "writeErrors": errors})
+        return SimpleNamespace(inserted_ids=inserted)
+
+    async def replace_one(
+        self, query: Dict[str, Any], doc: Dict[str, Any], upsert: bool = False
+    ) -> SimpleNamespace:
+        ids = self._find_ids(query)
+        if not ids and not upsert:
+            return SimpleNamespace(matched_count=0, modified_count=0)
+        doc = copy.deepcopy(doc)
+        doc["_id"] = ids[0] if ids else query.get("_id", ObjectId())
+        self._store(doc)
+        return SimpleNamespace(matched_count=len(ids[:1]), modified_count=len(ids[:1]))
+
+    async def update_one(
+        self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False
+    ) -> SimpleNamespace:
+        ids = self._find_ids(query)
+        if ids:
+            doc = copy.deepcopy(self.docs[ids[0]])
+        elif upsert:
+            doc = {k: v for k, v in query.items() if not isinstance(v, dict)}
+            doc.setdefault("_id", ObjectId())
+        else:
+            return SimpleNamespace(matched_count=0, modified_count=0, upserted_id=None)
+        for field, value in update.get("$set", {}).items():
+            _set_path(doc, field, copy.deepcopy(value))
+        if not ids:
+            doc.update(copy.deepcopy(update.get("$setOnInsert", {})))
+        for field, amount in update.get("$inc", {}).items():
+            doc[field] = doc.get(field, 0) + amount
+        self._store(doc)
+        return SimpleNamespace(
+            matched_count=len(ids[:1]),
+            modified_count=len(ids[:1]),
+            upserted_id=None if ids else doc["_id"],
+        )
+
+    async def delete_one(self, query: Dict[str, Any]) -> SimpleNamespace:
+        ids = self._find_ids(query)
+        for _id in ids[:1]:
+            doc = self.docs.pop(_id)
+            for field, index in self._unique.items():
+                index.pop(doc.get(field), None)
+        return SimpleNamespace(deleted_count=len(ids[:1]))
+
+
+class InMemoryDatabase:
+    def __init__(self):
+        self.collections: Dict[str, InMemoryCollection] = {}
+
+    def __getitem__(self, name: str) -> InMemoryCollection:
+        if name not in self.collections:
+            self.collections[name] = InMemoryCollection(name)
+        return self.collections[name]
+
+
+class InMemoryMongoClient:
+    """Drop-in for ``AsyncIOMotorClient`` as far as ``MongoDB`` uses it."""
+
+    def __init__(self):
+        self.databases: Dict[str, InMemoryDatabase] = {}
+        self.admin = SimpleNamespace(command=self._command)
+
+    async def _command(self, name: str, *args: Any, **kwargs: Any) -> Dict[str, Any]:
+        return {"ok": 1.0}
+
+    def __getitem__(self, name: str) -> InMemoryDatabase:
+        if name not in self.databases:
+            self.databases[name] = InMemoryDatabase()
+        return self.databases[name]
+
+    def close(self) -> None:
+        pass
+
+
+CITIES = [("Delhi", "Delhi"), ("Mumbai", "Maharashtra"), ("Pune", "Maharashtra"),
+          ("Jaipur", "Rajasthan"), ("Kochi", "Kerala"), ("Patna", "Bihar")]
+
+
+def make_users(count: int) -> List[UserData]:
+    """Users with distinct birth data, so chart caches see real misses."""
+    return [
+        UserData(
+            user_id=f"bench-{i}",
+            name=f"Bench User {i}",
+            date_of_birth=datetime(1960 + i % 50, 1 + i % 12, 1 + i % 28),
+            time_of_birth=dt_time(i % 24, (7 * i) % 60, 0),
+            gender=("male", "female", "other")[i % 3],
+            city=CITIES[i % len(CITIES)][0],
+            state=CITIES[i % len(CITIES)][1],
+        )
+        for i in range(count)
+    ]
+
+
+@contextlib.contextmanager
+def fake_environment(upstream: Faults, gemini_faults: Faults) -> Iterator[None]:
+    """Point the app's MongoDB, HTTP clients and Gemini model at the fakes."""
+    saved_client = MongoDB.client
+    saved_clients = dict(HTTPClient.clients)
+    saved_model = gemini._model
+    saved_api_key = settings.ASTROLOGY_API_KEY
+    apps = {
+        "astrology": astrology_app(upstream),
+        "vedicrishi": vedicrishi_app(upstream),
+        "horoscope_app": horoscope_app(upstream),
+        "langflow": langflow_app(upstream),
+        "default": image_host_app(upstream),
+    }
+    MongoDB.client = InMemoryMongoClient()
+    for name, fake in apps.items():
+        HTTPClient.clients[name] = httpx.AsyncClient(
+            base_url=f"http://{name}.bench",
+            transport=MetricsTransport(name, httpx.ASGITransport(app=fake)),
+        )
+    gemini._model = FakeGeminiModel(gemini_faults)
+    settings.ASTROLOGY_API_KEY = saved_api_key or "bench-key"
+    try:
+        yield
+    finally:
+        MongoDB.client = saved_client
+        HTTPClient.clients.clear()
+        HTTPClient.clients.update(saved_clients)
+        gemini._model = saved_model
+        settings.ASTROLOGY_API_KEY = saved_api_key
+        users.user_cache.clear()
+        for cache in TieredCache.registry.values():
+            cache.memory.clear()
@@ -0,0 +1,79 @@
+"""
+Measure cold-start import time of the app.
+
+Usage:
+    python -m src.margdarshak_backend.scripts.import_benchmark [--runs 5] [--top 25]
+
+Each run imports the app in a fresh interpreter with ``-X importtime``.
+Reports the median total import time, the slowest modules by cumulative
+time, and self time grouped by top-level package.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+APP_MODULE = "src.margdarshak_backend.main"
+
+
+def import_times(module: str) -> List[Tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for every module a fresh import loads."""
+    env = {
+        "MONGODB_URL": "mongodb://localhost:27017",
+        "MONGODB_DB_NAME": "benchmark",
+        **os.environ,
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    times = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times.append((name.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def main(module: str, runs: int, top: int) -> None:
+    totals = []
+    cumulative: Dict[str, List[int]] = defaultdict(list)
+    by_package: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(runs):
+        times = import_times(module)
+        totals.append(next(cum for name, _, cum in times if name == module))
+        packages: Dict[str, int] = defaultdict(int)
+        for name, self_us, cumulative_us in times:
+            cumulative[name].append(cumulative_us)
+            packages[name.split(".")[0]] += self_us
+        for package, self_us in packages.items():
+            by_package[package].append(self_us)
+
+    median_ms = statistics.median(totals) / 1000
+    print(f"{module}: median {median_ms:.1f} ms over {runs} runs")
+    print("\nSlowest modules (median cumulative ms):")
+    slowest = sorted(cumulative.items(), key=lambda item: -statistics.median(item[1]))
+    for name, values in slowest[:top]:
+        print(f"  {statistics.median(values) / 1000:8.1f}  {name}")
+    print("\nSelf time by top-level package (median ms):")
+    packages = sorted(by_package.items(), key=lambda item: -statistics.median(item[1]))
+    for package, values in packages[:top]:
+        print(f"  {statistics.median(values) / 1000:8.1f}  {package}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure cold-start import time")
+    parser.add_argument("--module", default=APP_MODULE, help="Module to import")
+    parser.add_argument(
+        "--runs", type=int, default=5, help="Fresh interpreters to average over"
+    )
+    parser.add_argument("--top", type=int, default=25, help="Rows to show per table")
+    args = parser.parse_args()
+    main(args.module, args.runs, args.top)
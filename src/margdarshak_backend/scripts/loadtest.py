@@ -0,0 +1,286 @@
+"""
+Offline load test of every API route.
+
+Usage:
+    python -m src.margdarshak_backend.scripts.loadtest
+        [--requests 200] [--concurrency 20]
+        [--upstream-latency 0.02] [--gemini-latency 0.2] [--error-rate 0.0]
+        [--only horoscope] [--max-loop-lag-ms 100]
+
+The app runs in-process against the stand-ins in ``fakes``: fake upstream
+HTTP services, a fake Gemini model and an in-memory MongoDB. Each route is
+driven with the given concurrency and reported with requests per second,
+p50/p95/p99 latency and the worst event-loop lag seen while it ran. A lag
+far above the injected latencies means something blocked the event loop;
+with --max-loop-lag-ms the script exits non-zero when that happens.
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import logging
+import math
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import httpx
+
+from src.margdarshak_backend.core import users
+from src.margdarshak_backend.core.database import MongoDB
+from src.margdarshak_backend.models.horoscope import ZodiacSign
+from src.margdarshak_backend.scripts import fakes
+
+
+class Endpoint(NamedTuple):
+    name: str
+    method: str
+    # Builds (url, request kwargs) for the n-th request
+    build: Callable[[int], Any]
+
+
+class EndpointResult(NamedTuple):
+    name: str
+    requests: int
+    errors: int
+    requests_per_second: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_loop_lag_ms: float
+
+
+def endpoints(user_ids: List[str]) -> List[Endpoint]:
+    def user(n: int) -> str:
+        return user_ids[n % len(user_ids)]
+
+    signs = [sign.value for sign in ZodiacSign]
+    template = fakes.make_users(1)[0].model_dump()
+
+    def create_body(n: int) -> Dict[str, Any]:
+        return {**template, "user_id": f"bench-new-{n}-{time.monotonic_ns()}"}
+
+    def for_user(path: str, **params: str) -> Callable[[int], Any]:
+        return lambda n: (path, {"params": {"user_id": user(n), **params}})
+
+    def for_sign(path: str) -> Callable[[int], Any]:
+        return lambda n: (path, {"params": {"sign": signs[n % len(signs)]}})
+
+    def prefix(n: int) -> str:
+        return "ba"[: 1 + n % 2]
+
+    def chat(n: int) -> Dict[str, Any]:
+        return {"message": f"hello {n}", "endpoint": "chat"}
+
+    def analysis(n: int) -> Dict[str, Any]:
+        image_url = f"http://images.bench/chart-{n % 20}.png"
+        return {"image_url": image_url, "chart_type": "d1"}
+
+    return [
+        Endpoint("GET /health", "GET", lambda n: ("/api/health", {})),
+        Endpoint("POST /user", "POST",
+                 lambda n: ("/api/user/", {"json": create_body(n)})),
+        Endpoint("GET /user/{id}", "GET", lambda n: (f"/api/user/{user(n)}", {})),
+        Endpoint("GET /location/search", "GET",
+                 lambda n: ("/api/location/search", {"params": {"q": prefix(n)}})),
+        Endpoint("POST /horoscope/rasi-chart", "POST",
+                 for_user("/api/horoscope/rasi-chart")),
+        Endpoint("POST /horoscope/navamsa-chart", "POST",
+                 for_user("/api/horoscope/navamsa-chart")),
+        Endpoint("POST /horoscope/d10-chart", "POST",
+                 for_user("/api/horoscope/d10-chart")),
+        Endpoint("POST /horoscope/charts", "POST",
+                 lambda n: ("/api/horoscope/charts", {"json": {
+                     "user_id": user(n), "chart_types": ["d1", "d9", "d10"]
+                 }})),
+        Endpoint("POST /horoscope/vargas", "POST",
+                 lambda n: ("/api/horoscope/vargas", {"json": {"user_id": user(n)}})),
+        Endpoint("GET /horoscope/daily", "GET",
+                 for_sign("/api/horoscope/daily")),
+        Endpoint("GET /horoscope/monthly", "GET",
+                 for_sign("/api/horoscope/monthly")),
+        Endpoint("POST /horoscope/gem-suggestion", "POST",
+                 for_user("/api/horoscope/gem-suggestion")),
+        Endpoint("POST /horoscope/gem-suggestion?stream", "POST",
+                 for_user("/api/horoscope/gem-suggestion", stream="true")),
+        Endpoint("POST /horoscope/analyze-chart", "POST",
+                 lambda n: ("/api/horoscope/analyze-chart", {"json": analysis(n)})),
+        Endpoint("POST /langflow/execute_ai", "POST",
+                 lambda n: ("/api/langflow/execute_ai", {"json": chat(n)})),
+        Endpoint("POST /langflow/execute_ai?stream", "POST",
+                 lambda n: ("/api/langflow/execute_ai",
+                            {"params": {"stream": "true"}, "json": chat(n)})),
+        Endpoint("GET /metrics", "GET", lambda n: ("/api/metrics", {})),
+    ]
+
+
+class LoopLagMonitor:
+    """Measures how late a periodic timer fires; large lag means a blocked loop."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - start - self.interval
+            self.max_lag = max(self.max_lag, lag)
+
+    def start(self) -> None:
+        self.max_lag = 0.0
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> float:
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        return self.max_lag
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile: the smallest value with ``fraction`` at or below it."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[min(max(rank, 1), len(sorted_values)) - 1]
+
+
+async def drive(
+    client: httpx.AsyncClient, endpoint: Endpoint, requests: int, concurrency: int
+) -> EndpointResult:
+    counter = itertools.count()
+    latencies: List[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        while (n := next(counter)) < requests:
+            url, kwargs = endpoint.build(n)
+            start = time.perf_counter()
+            try:
+                response = await client.request(endpoint.method, url, **kwargs)
+                if response.status_code >= 400:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    max_lag = await monitor.stop()
+
+    latencies.sort()
+    return EndpointResult(
+        name=endpoint.name,
+        requests=requests,
+        errors=errors,
+        requests_per_second=requests / elapsed if elapsed else 0.0,
+        p50_ms=percentile(latencies, 0.50) * 1000,
+        p95_ms=percentile(latencies, 0.95) * 1000,
+        p99_ms=percentile(latencies, 0.99) * 1000,
+        max_loop_lag_ms=max_lag * 1000,
+    )
+
+
+async def run_load_test(
+    requests: int = 200,
+    concurrency: int = 20,
+    upstream: Optional[fakes.Faults] = None,
+    gemini_faults: Optional[fakes.Faults] = None,
+    only: Optional[str] = None,
+    user_count: int = 50,
+) -> List[EndpointResult]:
+    """
+    Drive every route (or those whose name contains ``only``) against the fakes.
+
+    Returns:
+        list: One result per endpoint, in route order
+    """
+    from src.margdarshak_backend.main import app
+
+    results = []
+    upstream = upstream or fakes.Faults()
+    gemini_faults = gemini_faults or fakes.Faults()
+    with fakes.fake_environment(upstream, gemini_faults):
+        await MongoDB.ensure_indexes()
+        seeded = fakes.make_users(user_count)
+        for user in seeded:
+            await users.create_user(user)
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://app.bench"
+        async with httpx.AsyncClient(transport=transport, base_url=base_url) as client:
+            for endpoint in endpoints([user.user_id for user in seeded]):
+                if only and only not in endpoint.name:
+                    continue
+                results.append(await drive(client, endpoint, requests, concurrency))
+    return results
+
+
+def print_report(results: List[EndpointResult]) -> None:
+    header = (
+        f"{'endpoint':42} {'reqs':>6} {'errors':>6} {'req/s':>9} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'lag ms':>8}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r.name:42} {r.requests:6d} {r.errors:6d} {r.requests_per_second:9.1f} "
+            f"{r.p50_ms:8.1f} {r.p95_ms:8.1f} {r.p99_ms:8.1f} {r.max_loop_lag_ms:8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Offline load test of every API route"
+    )
+    parser.add_argument(
+        "--requests", type=int, default=200, help="Requests per endpoint"
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=20, help="Concurrent clients per endpoint"
+    )
+    parser.add_argument(
+        "--upstream-latency", type=float, default=0.02,
+        help="Seconds added by fake HTTP upstreams",
+    )
+    parser.add_argument(
+        "--gemini-latency", type=float, default=0.2,
+        help="Seconds added by the fake Gemini model",
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0,
+        help="Extra random latency, up to this many seconds",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0,
+        help="Share of upstream calls that fail",
+    )
+    parser.add_argument("--only", help="Only run endpoints whose name contains this")
+    parser.add_argument(
+        "--max-loop-lag-ms", type=float,
+        help="Fail if any endpoint lags the event loop more",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    results = asyncio.run(run_load_test(
+        requests=args.requests,
+        concurrency=args.concurrency,
+        upstream=fakes.Faults(args.upstream_latency, args.jitter, args.error_rate),
+        gemini_faults=fakes.Faults(args.gemini_latency, args.jitter, args.error_rate),
+        only=args.only,
+    ))
+    print_report(results)
+    if args.max_loop_lag_ms is not None:
+        blocked = [r.name for r in results if r.max_loop_lag_ms > args.max_loop_lag_ms]
+        if blocked:
+            limit = args.max_loop_lag_ms
+            print(f"\nEvent loop lag above {limit} ms: {', '.join(blocked)}")
+            sys.exit(1)
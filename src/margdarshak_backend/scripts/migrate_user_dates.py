@@ -0,0 +1,45 @@
+"""
+Convert string-dated user documents to native BSON datetimes.
+
+Usage:
+    python -m src.margdarshak_backend.scripts.migrate_user_dates [--batch-size 1000]
+
+Safe to re-run: documents that are already migrated are skipped.
+Documents that cannot be decoded are left unchanged and listed.
+"""
+import argparse
+import asyncio
+import logging
+
+from src.margdarshak_backend.core.database import db
+from src.margdarshak_backend.core.users import migrate_legacy_dates
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+
+async def main(batch_size: int) -> None:
+    await db.connect_db()
+    try:
+        await db.ensure_indexes()
+        report = await migrate_legacy_dates(batch_size)
+        logging.info(
+            f"User date migration done: {report['migrated']} documents migrated, "
+            f"{report['skipped']} skipped"
+        )
+        for error in report["errors"]:
+            logging.warning(f"Not migrated: {error['_id']}: {error['error']}")
+    finally:
+        await db.close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Store user dates as native BSON datetimes"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=1000, help="Documents per bulk write"
+    )
+    asyncio.run(main(parser.parse_args().batch_size))
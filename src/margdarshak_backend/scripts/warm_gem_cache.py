@@ -0,0 +1,52 @@
+"""
+Pre-populate the gem description cache.
+
+Usage:
+    python -m src.margdarshak_backend.scripts.warm_gem_cache [--file gems.json]
+
+Without --file every category/gem combination in KNOWN_GEMS is described.
+The file is a JSON list of {"category", "name", "semi_gem"} objects.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+
+from src.margdarshak_backend.core.database import db
+from src.margdarshak_backend.core.gems import (
+    gem_description_cache,
+    known_gem_set,
+    warm_up,
+)
+
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+
+async def main(gems_file: str = None) -> None:
+    if gems_file:
+        with open(gems_file, "r") as file:
+            gems = [(g["category"], g["name"], g["semi_gem"]) for g in json.load(file)]
+    else:
+        gems = known_gem_set()
+
+    await db.connect_db()
+    try:
+        await gem_description_cache.ensure_indexes()
+        result = await warm_up(gems)
+        logging.info(
+            f"Gem cache warm-up done: {result['described']} described, "
+            f"{result['failed']} failed"
+        )
+    finally:
+        await db.close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Pre-populate the gem description cache"
+    )
+    parser.add_argument("--file", help="JSON list of gems to describe")
+    asyncio.run(main(parser.parse_args().file))
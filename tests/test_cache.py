@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from src.margdarshak_backend.core.cache import (
+    LRUCache,
+    SizedLRUCache,
+    TieredCache,
+    make_key,
+)
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 3, "misses": 1}
+
+
+def test_sized_lru_evicts_by_total_bytes():
+    cache = SizedLRUCache(maxsize=10, max_bytes=10, sizeof=len)
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    cache.set("c", b"1234")
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 8
+    cache.set("huge", b"x" * 11)
+    assert cache.get("huge") is None
+    cache.set("b", b"12")
+    assert cache.stats()["bytes"] == 6
+
+
+def test_make_key_is_order_independent():
+    assert make_key("d9", {"year": 1990, "month": 1}) == make_key(
+        "d9", {"month": 1, "year": 1990}
+    )
+    assert make_key("d9", {"year": 1990}) != make_key("d10", {"year": 1990})
+
+
+def test_tiered_cache_serves_memory_without_database():
+    cache = TieredCache("test", "test_cache", maxsize=4, ttl_seconds=60)
+    try:
+
+        async def run():
+            assert await cache.get("k") is None
+            await cache.set("k", {"output": "url"})
+            assert await cache.get("k") == {"output": "url"}
+
+        asyncio.run(run())
+        assert cache.stats()["memory"]["hits"] == 1
+    finally:
+        TieredCache.registry.pop("test")
+
+
+def test_tiered_cache_write_raises_and_skips_memory():
+    cache = TieredCache("test", "test_cache", maxsize=4, ttl_seconds=60)
+    try:
+        with pytest.raises(Exception):
+            asyncio.run(cache.write("k", {"output": "url"}))
+        assert len(cache.memory) == 0
+    finally:
+        TieredCache.registry.pop("test")
@@ -0,0 +1,93 @@
+import asyncio
+import io
+
+import httpx
+import pytest
+from PIL import Image
+
+from src.margdarshak_backend.core import chart_image
+from src.margdarshak_backend.core.cache import TTLCache, chart_cache
+from src.margdarshak_backend.core.http import HTTPClient
+
+
+def encode(img, fmt):
+    out = io.BytesIO()
+    img.save(out, format=fmt)
+    return out.getvalue()
+
+
+def test_normalize_downsizes_and_keeps_line_art_lossless(monkeypatch):
+    monkeypatch.setattr(chart_image.settings, "CHART_IMAGE_MAX_SIDE", 256)
+    part = chart_image.normalize_image(
+        encode(Image.new("RGB", (1024, 512), "white"), "PNG")
+    )
+    assert part["mime_type"] == "image/png"
+    assert Image.open(io.BytesIO(part["data"])).size == (256, 128)
+
+
+def test_normalize_keeps_photos_as_jpeg(monkeypatch):
+    monkeypatch.setattr(chart_image.settings, "CHART_IMAGE_MAX_SIDE", 256)
+    part = chart_image.normalize_image(
+        encode(Image.new("RGB", (800, 800), "red"), "JPEG")
+    )
+    assert part["mime_type"] == "image/jpeg"
+    assert max(Image.open(io.BytesIO(part["data"])).size) <= 256
+
+
+def test_normalize_rejects_oversized_images(monkeypatch):
+    monkeypatch.setattr(chart_image.settings, "CHART_IMAGE_MAX_PIXELS", 100)
+    with pytest.raises(chart_image.ImageTooLargeError):
+        chart_image.normalize_image(encode(Image.new("RGB", (20, 20)), "PNG"))
+
+
+def test_download_stops_at_byte_limit(monkeypatch):
+    def handler(request):
+        return httpx.Response(200, content=b"x" * 2048)
+
+    monkeypatch.setattr(chart_image.settings, "CHART_IMAGE_MAX_BYTES", 1024)
+
+    async def run():
+        # Closed on the loop that used it once the download is done
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        ) as upstream:
+            monkeypatch.setitem(HTTPClient.clients, "default", upstream)
+            await chart_image.download_image("https://charts.example/big.png")
+
+    with pytest.raises(chart_image.ImageTooLargeError):
+        asyncio.run(run())
+
+
+def test_sniff_image_type():
+    assert (
+        chart_image.sniff_image_type(encode(Image.new("RGB", (4, 4)), "PNG"))
+        == "image/png"
+    )
+    assert (
+        chart_image.sniff_image_type(b'<?xml version="1.0"?><svg></svg>')
+        == "image/svg+xml"
+    )
+    with pytest.raises(chart_image.UnsupportedImageError):
+        chart_image.sniff_image_type(b"<html><script></script></html>")
+
+
+def test_local_image_hash_only_matches_our_route():
+    content_hash = "a" * 64
+    assert (
+        chart_image.local_image_hash(
+            f"https://api.example/api/horoscope/chart-image/{content_hash}"
+        )
+        == content_hash
+    )
+    assert (
+        chart_image.local_image_hash(f"https://charts.example/{content_hash}.svg")
+        is None
+    )
+
+
+def test_images_outlive_the_chart_entries_that_reference_them():
+    chart_ttl = chart_cache.ttl_seconds
+    # An entry can live its TTL in MongoDB, then again in a memory tier
+    assert isinstance(chart_cache.memory, TTLCache)
+    assert chart_cache.memory.ttl_seconds <= chart_ttl
+    assert chart_image.chart_image_store.ttl_seconds > 2 * chart_ttl
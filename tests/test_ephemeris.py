@@ -0,0 +1,47 @@
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from src.margdarshak_backend.core import ephemeris
+
+REFERENCE = json.loads(
+    (
+        Path(ephemeris.__file__).parent.parent / "data" / "reference_charts.json"
+    ).read_text()
+)
+
+
+@pytest.mark.parametrize("case", REFERENCE["longitudes"], ids=lambda c: c["source"])
+def test_tropical_longitudes_match_reference(case):
+    longitudes = ephemeris.tropical_longitudes(np.array([case["jd_tt"]]))
+    computed = longitudes[ephemeris.BODIES.index(case["body"]), 0]
+    assert abs(computed - case["longitude"]) < case["tolerance"]
+
+
+@pytest.mark.parametrize("case", REFERENCE["charts"], ids=lambda c: c["name"])
+def test_sidereal_chart_matches_reference(case):
+    chart = ephemeris.compute_chart(
+        datetime.fromisoformat(case["birth"]),
+        case["tz_hours"],
+        case["latitude"],
+        case["longitude"],
+    )
+    assert chart["ascendant"]["sign"] == case["ascendant"]
+    planets = {p["name"]: p for p in chart["planets"]}
+    assert {name: p["sign"] for name, p in planets.items()} == case["signs"]
+    for name in case["retrograde"]:
+        assert planets[name]["retrograde"]
+
+
+def test_chart_is_computed_in_milliseconds():
+    birth = datetime(1990, 5, 17, 6, 30)
+    ephemeris.compute_chart(birth, 5.5, 28.6139, 77.2090)
+    start = time.perf_counter()
+    for _ in range(100):
+        ephemeris.compute_chart(birth, 5.5, 28.6139, 77.2090)
+    # Generous bound: this guards against accidental slow paths, not timing
+    assert (time.perf_counter() - start) / 100 < 0.1
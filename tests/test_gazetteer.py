@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+from src.margdarshak_backend.core.gazetteer import gazetteer
+from src.margdarshak_backend.main import app
+
+client = TestClient(app)
+
+
+def test_lookup_resolves_aliases_and_prefers_state():
+    assert gazetteer.lookup("bangalore").name == "Bengaluru"
+    assert gazetteer.lookup("Vasai Virar").name == "Vasai-Virar"
+    assert gazetteer.lookup("Aurangabad").state == "Maharashtra"
+    assert gazetteer.lookup("Aurangabad", "Bihar").state == "Bihar"
+    assert gazetteer.lookup("Atlantis") is None
+
+
+def test_search_returns_each_place_once_in_file_order():
+    names = [place.name for place in gazetteer.search("ba", limit=50)]
+    assert names[:2] == ["Bengaluru", "Vadodara"]  # via Bangalore and Baroda
+    assert len(names) == len(set(names))
+    assert all(place.timezone == 5.5 for place in gazetteer.search("b"))
+
+
+def test_location_search_route():
+    response = client.get("/api/location/search", params={"q": "Mum", "limit": 3})
+    assert response.status_code == 200
+    assert response.json()["results"][0] == {
+        "name": "Mumbai",
+        "state": "Maharashtra",
+        "latitude": 19.076,
+        "longitude": 72.8777,
+        "timezone": 5.5,
+    }
+    assert client.get("/api/location/search", params={"q": ""}).status_code == 422
@@ -0,0 +1,141 @@
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from google.api_core import exceptions as google_exceptions
+
+from src.margdarshak_backend.core import gemini as gemini_module
+from src.margdarshak_backend.core.gemini import GeminiClient
+
+
+class FakeModel:
+    def __init__(self, latency=0.0, failures=0, stall=0.0):
+        self.latency = latency
+        self.failures = failures
+        self.stall = stall
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate_content_async(self, contents, stream=False):
+        if stream:
+            return FakeStream(["about ", str(contents)], self.stall)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if self.failures:
+                self.failures -= 1
+                raise google_exceptions.ResourceExhausted("quota")
+            return SimpleNamespace(
+                text=f"about {contents}",
+                usage_metadata=SimpleNamespace(
+                    prompt_token_count=3, candidates_token_count=7
+                ),
+            )
+        finally:
+            self.in_flight -= 1
+
+
+class FakeStream:
+    def __init__(self, texts, stall=0.0):
+        self.texts = texts
+        self.stall = stall
+        self.usage_metadata = SimpleNamespace(
+            prompt_token_count=3, candidates_token_count=2
+        )
+
+    async def __aiter__(self):
+        for i, text in enumerate(self.texts):
+            await asyncio.sleep(self.stall if i else 0)
+            yield SimpleNamespace(text=text)
+
+
+def make_client(model, **overrides):
+    options = dict(
+        max_concurrency=8, timeout=1.0, max_retries=2, retry_base_delay=0.001
+    )
+    options.update(overrides)
+    return GeminiClient(model, **options)
+
+
+def test_concurrent_calls_overlap():
+    model = FakeModel(latency=0.05)
+    client = make_client(model)
+
+    async def run():
+        return await asyncio.gather(
+            *(client.generate(g) for g in ("ruby", "pearl", "coral"))
+        )
+
+    texts = asyncio.run(run())
+    assert texts == ["about ruby", "about pearl", "about coral"]
+    # All three were in flight at once, rather than one after another
+    assert model.peak == 3
+    assert client.stats()["output_tokens"] == 21
+
+
+def test_concurrency_is_bounded():
+    model = FakeModel(latency=0.01)
+    client = make_client(model, max_concurrency=2)
+
+    async def run():
+        await asyncio.gather(*(client.generate(i) for i in range(6)))
+
+    asyncio.run(run())
+    assert model.peak == 2
+
+
+def test_retries_rate_limits_then_gives_up():
+    model = FakeModel(failures=1)
+    client = make_client(model)
+    assert asyncio.run(client.generate("ruby")) == "about ruby"
+    assert client.retries == 1
+
+    model.failures = 5
+    with pytest.raises(google_exceptions.ResourceExhausted):
+        asyncio.run(client.generate("ruby"))
+    assert client.errors == 1
+
+
+def test_stream_yields_chunks_and_records_usage():
+    client = make_client(FakeModel())
+
+    async def run():
+        return [text async for text in client.stream("ruby")]
+
+    assert asyncio.run(run()) == ["about ", "ruby"]
+    assert client.stats()["calls"] == 1
+    assert client.stats()["output_tokens"] == 2
+
+
+def test_stalled_stream_times_out_and_frees_its_slot():
+    client = make_client(FakeModel(stall=1.0), max_concurrency=1, timeout=0.05)
+
+    async def run():
+        texts = []
+        with pytest.raises(asyncio.TimeoutError):
+            async for text in client.stream("ruby"):
+                texts.append(text)
+        # The slot is free again for the next call
+        return texts, await client.generate("pearl")
+
+    texts, text = asyncio.run(run())
+    assert texts == ["about "]
+    assert text == "about pearl"
+    assert client.stats()["errors"] == 1
+
+
+def test_warm_up_loads_the_model_off_the_event_loop(monkeypatch):
+    threads = []
+
+    def create_model(model_name):
+        threads.append(threading.current_thread())
+        return FakeModel()
+
+    monkeypatch.setattr(gemini_module, "create_model", create_model)
+    client = make_client(None)
+
+    asyncio.run(client.warm_up())
+    assert isinstance(client.model, FakeModel)
+    assert threads and threads[0] is not threading.main_thread()
@@ -0,0 +1,33 @@
+import asyncio
+
+from src.margdarshak_backend.core import gems
+
+
+def test_descriptions_are_generated_once_per_gem(monkeypatch):
+    prompts = []
+
+    async def generate(prompt):
+        prompts.append(prompt)
+        await asyncio.sleep(0.01)
+        return f"description {len(prompts)}"
+
+    monkeypatch.setattr(gems.gemini, "generate", generate)
+    gems.gem_description_cache.memory.clear()
+
+    async def run():
+        first = await asyncio.gather(
+            *(gems.describe_gem("LIFE", "Ruby", "Garnet") for _ in range(5))
+        )
+        again = await gems.describe_gem("life", "Ruby", "Garnet")
+        other = await gems.describe_gem("LUCKY", "Ruby", "Garnet")
+        return first, again, other
+
+    first, again, other = asyncio.run(run())
+    assert set(first) == {"description 1"}
+    assert again == "description 1"
+    assert other == "description 2"
+    assert "life gemstone" in prompts[0] and "Ruby with semi gem Garnet" in prompts[0]
+
+
+def test_known_gem_set_covers_every_category():
+    assert len(gems.known_gem_set()) == len(gems.GEM_CATEGORIES) * len(gems.KNOWN_GEMS)
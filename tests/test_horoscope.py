@@ -0,0 +1,201 @@
+import asyncio
+import json
+from datetime import datetime, time
+
+from fastapi.testclient import TestClient
+
+from src.margdarshak_backend.api import horoscope
+from src.margdarshak_backend.main import app
+from src.margdarshak_backend.models.horoscope import ChartType
+from src.margdarshak_backend.models.user import UserData
+
+client = TestClient(app)
+
+USER = UserData(
+    user_id="u1",
+    name="Test",
+    date_of_birth=datetime(1990, 5, 17),
+    time_of_birth=time(6, 30, 0),
+    gender="female",
+    state="Delhi",
+    city="Delhi",
+)
+
+
+def test_batch_charts_returns_partial_results(monkeypatch):
+    loads = []
+
+    async def load_user(user_id):
+        loads.append(user_id)
+        return USER
+
+    async def fetch_chart(chart_data, chart_type):
+        if chart_type == ChartType.D60:
+            raise RuntimeError("upstream error")
+        return {"output": f"https://charts.example/{chart_type.value}.svg"}
+
+    monkeypatch.setattr(horoscope, "load_user", load_user)
+    monkeypatch.setattr(horoscope, "fetch_chart", fetch_chart)
+
+    response = client.post(
+        "/api/horoscope/charts",
+        json={"user_id": "u1", "chart_types": ["d1", "d9", "d60", "d9"]},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body["charts"]) == ["d1", "d9"]
+    assert body["errors"] == {"d60": "upstream error"}
+    assert loads == ["u1"]
+
+
+def test_placements_are_computed_in_process(monkeypatch):
+    async def load_user(user_id):
+        return USER
+
+    monkeypatch.setattr(horoscope, "load_user", load_user)
+
+    response = client.post("/api/horoscope/placements", json={"user_id": "u1"})
+
+    assert response.status_code == 200
+    result = response.json()
+    assert result["backend"] == "local"
+    assert "output" not in result
+    assert result["placements"]["ascendant"]["sign"] == "Taurus"
+    assert [p["name"] for p in result["placements"]["planets"]][:2] == ["Sun", "Moon"]
+
+
+def test_parse_planet_longitudes_reads_full_degrees():
+    result = {
+        "statusCode": 200,
+        "output": [
+            {
+                "0": {"name": "Ascendant", "fullDegree": 47.3},
+                "1": {"name": "Sun", "fullDegree": 32.1, "isRetro": "false"},
+            },
+            {"debug": {}},
+        ],
+    }
+    assert horoscope.parse_planet_longitudes(result) == {"Ascendant": 47.3, "Sun": 32.1}
+
+
+def test_gem_suggestion_streams_server_sent_events(monkeypatch):
+    async def load_user(user_id):
+        return USER
+
+    async def fetch_gem_suggestion(user):
+        return {"response": {"LIFE": {"name": "Ruby", "semi_gem": "Garnet"}}}
+
+    async def stream_gem_description(key, name, semi_gem):
+        yield f"{name} "
+        yield "details"
+
+    monkeypatch.setattr(horoscope, "load_user", load_user)
+    monkeypatch.setattr(horoscope, "fetch_gem_suggestion", fetch_gem_suggestion)
+    monkeypatch.setattr(horoscope, "stream_gem_description", stream_gem_description)
+
+    response = client.post("/api/horoscope/gem-suggestion?user_id=u1&stream=true")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [
+        (
+            block.split("\n")[0][len("event: ") :],
+            json.loads(block.split("\n")[1][len("data: ") :]),
+        )
+        for block in response.text.strip().split("\n\n")
+    ]
+    assert events == [
+        ("suggestion", {"response": {"LIFE": {"name": "Ruby", "semi_gem": "Garnet"}}}),
+        ("gem_description", {"gem": "LIFE", "text": "Ruby "}),
+        ("gem_description", {"gem": "LIFE", "text": "details"}),
+        ("done", {}),
+    ]
+
+
+def test_chart_urls_are_served_from_the_image_store(monkeypatch):
+    from src.margdarshak_backend.core import chart_image
+    from src.margdarshak_backend.scripts import fakes
+
+    chart_data = horoscope.build_chart_payload(USER)
+
+    async def run():
+        first = await horoscope.fetch_chart(chart_data, ChartType.D9)
+        horoscope.chart_cache.memory.clear()
+        chart_image.chart_image_store.memory.clear()
+        return first
+
+    with fakes.fake_environment(fakes.Faults(), fakes.Faults()):
+        result = asyncio.run(run())
+        assert result["source_url"] == "https://charts.bench/navamsa.svg"
+        image = client.get(result["output"])
+        assert image.status_code == 200
+        assert image.headers["content-type"] == "image/svg+xml"
+        assert "immutable" in image.headers["cache-control"]
+        assert "<svg" in image.text
+        again = client.get(
+            result["output"], headers={"If-None-Match": image.headers["etag"]}
+        )
+        assert again.status_code == 304
+
+    assert client.get("/api/horoscope/chart-image/" + "0" * 64).status_code == 404
+    assert client.get("/api/horoscope/chart-image/not-a-hash").status_code == 422
+
+
+def test_chart_route_urls_can_be_analyzed(monkeypatch):
+    import hashlib
+
+    from src.margdarshak_backend.core import chart_image
+    from src.margdarshak_backend.scripts import fakes
+
+    png = fakes.chart_image_bytes()
+    downloads = []
+
+    async def load_user(user_id):
+        return USER
+
+    async def download_image(url):
+        downloads.append(url)
+        return png, hashlib.sha256(png).hexdigest()
+
+    monkeypatch.setattr(horoscope, "load_user", load_user)
+    monkeypatch.setattr(chart_image, "download_image", download_image)
+    horoscope.chart_cache.memory.clear()
+
+    with fakes.fake_environment(fakes.Faults(), fakes.Faults()):
+        chart = client.post("/api/horoscope/d10-chart", params={"user_id": "u1"})
+        url = chart.json()["output"]
+        assert url.startswith("http://testserver/api/horoscope/chart-image/")
+        analysis = client.post(
+            "/api/horoscope/analyze-chart",
+            json={"image_url": url, "chart_type": "d10"},
+        )
+        monkeypatch.setattr(
+            horoscope.settings, "CHART_IMAGE_BASE_URL", "https://cdn.example/"
+        )
+        charts = client.post(
+            "/api/horoscope/charts", json={"user_id": "u1", "chart_types": ["d10"]}
+        )
+
+    assert analysis.status_code == 200
+    assert analysis.json()["text"]
+    # The image was read from the store, not downloaded again
+    assert downloads == ["https://charts.bench/d10.svg"]
+    cdn_url = charts.json()["charts"]["d10"]["output"]
+    assert cdn_url == "https://cdn.example" + url[len("http://testserver") :]
+
+
+def test_chart_url_is_kept_when_the_image_cannot_be_stored(monkeypatch):
+    from src.margdarshak_backend.core import chart_image
+
+    async def download_image(url):
+        return b"<svg/>", "a" * 64
+
+    async def write_db(key, value):
+        raise RuntimeError("mongo down")
+
+    monkeypatch.setattr(chart_image, "download_image", download_image)
+    monkeypatch.setattr(chart_image.chart_image_store, "_write_db", write_db)
+    chart_image.chart_image_store.memory.clear()
+
+    result = {"status": 200, "output": "https://charts.example/d1.svg"}
+    assert asyncio.run(horoscope.localize_chart_image(result)) == result
+    assert chart_image.chart_image_store.memory.get("a" * 64) is None
@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from src.margdarshak_backend.core.horoscope_feed import SignHoroscopeFeed, all_feed_keys
+from src.margdarshak_backend.models.horoscope import Day, ZodiacSign
+
+
+class FakeFeed(SignHoroscopeFeed):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self.fail = False
+
+    async def _fetch(self, key):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return {"data": {"sign": key[1].value, "version": self.calls}}
+
+
+def test_all_feed_keys_covers_every_combination():
+    assert len(all_feed_keys()) == 48
+
+
+def test_serves_from_memory_after_first_fetch():
+    feed = FakeFeed()
+
+    async def run():
+        first = await feed.get_daily(ZodiacSign.LEO, Day.TODAY)
+        second = await feed.get_daily(ZodiacSign.LEO, Day.TODAY)
+        assert first is second
+
+    asyncio.run(run())
+    assert feed.calls == 1
+
+
+def test_keeps_last_good_copy_when_refresh_fails():
+    feed = FakeFeed()
+    key = ("daily", ZodiacSign.LEO, Day.TODAY)
+
+    async def run():
+        good = await feed.get(key)
+        data, _ = feed._entries[key]
+        feed._entries[key] = (data, datetime.now(timezone.utc) - timedelta(days=2))
+        feed.fail = True
+        assert await feed.get(key) is good
+        await asyncio.gather(*feed._background)
+        assert feed._entries[key][0] is good
+
+    asyncio.run(run())
+    assert feed.calls == 2
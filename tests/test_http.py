@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.http import HTTPClient
+
+
+def test_get_client_before_connect():
+    with pytest.raises(ConnectionError):
+        HTTPClient.get_client("astrology")
+
+
+def test_connect_creates_pooled_clients():
+    async def run():
+        await HTTPClient.connect()
+        try:
+            client = HTTPClient.get_client("astrology")
+            assert str(client.base_url).startswith(settings.ASTROLOGY_API_URL)
+            assert HTTPClient.get_client() is HTTPClient.get_client("default")
+        finally:
+            await HTTPClient.close()
+        assert HTTPClient.clients == {}
+
+    asyncio.run(run())
@@ -0,0 +1,95 @@
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from src.margdarshak_backend.core.horoscope_feed import seconds_until_refresh
+from src.margdarshak_backend.core.http_caching import (
+    HTTPCachingMiddleware,
+    accepts_gzip,
+    etag_matches,
+)
+from src.margdarshak_backend.main import app
+
+client = TestClient(app)
+
+small_app = FastAPI()
+small_app.add_middleware(HTTPCachingMiddleware, minimum_size=100)
+
+
+@small_app.get("/text")
+async def text() -> PlainTextResponse:
+    return PlainTextResponse("ruby " * 100)
+
+
+@small_app.get("/events")
+async def events() -> StreamingResponse:
+    async def stream():
+        for i in range(3):
+            yield f"data: {'x' * 200}{i}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+small_client = TestClient(small_app)
+
+
+def test_location_search_is_cacheable_and_revalidates():
+    response = client.get("/api/location/search", params={"q": "va"})
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=86400"
+    etag = response.headers["etag"]
+
+    again = client.get(
+        "/api/location/search", params={"q": "va"}, headers={"If-None-Match": etag}
+    )
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    assert again.headers["cache-control"] == "public, max-age=86400"
+
+    other = client.get(
+        "/api/location/search", params={"q": "ko"}, headers={"If-None-Match": etag}
+    )
+    assert other.status_code == 200
+
+
+def test_large_bodies_are_gzipped_for_clients_that_accept_it():
+    raw = small_client.get("/text", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers
+    assert raw.headers["vary"] == "Accept-Encoding"
+
+    compressed = small_client.get("/text", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.content == raw.content
+    assert int(compressed.headers["content-length"]) < len(raw.content)
+    # Each encoding has its own strong ETag, but either revalidates
+    assert compressed.headers["etag"] != raw.headers["etag"]
+    revalidated = small_client.get(
+        "/text",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": raw.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+
+
+def test_streaming_responses_pass_through():
+    response = small_client.get("/events", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert "etag" not in response.headers
+    assert response.text.count("data: ") == 3
+
+
+def test_header_parsing():
+    assert accepts_gzip("br, gzip;q=0.8")
+    assert not accepts_gzip("gzip;q=0, br")
+    assert not accepts_gzip("")
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"abc"', '"abd"')
+
+
+def test_daily_horoscopes_expire_at_the_ist_refresh():
+    # 18:00 UTC is 23:30 IST, 35 minutes before the 00:05 IST refresh
+    now = datetime(2024, 3, 1, 18, 0, tzinfo=timezone.utc)
+    assert seconds_until_refresh(now) == 35 * 60
@@ -0,0 +1,208 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from src.margdarshak_backend.api import horoscope
+from src.margdarshak_backend.core import metrics
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.core.database import MongoDB
+from src.margdarshak_backend.core.jobs import JobQueue, JobQueueFullError, job_queue
+from src.margdarshak_backend.main import app
+from src.margdarshak_backend.scripts import fakes
+from src.margdarshak_backend.scripts.fakes import InMemoryMongoClient
+
+
+@pytest.fixture(autouse=True)
+def in_memory_db(monkeypatch):
+    monkeypatch.setattr(MongoDB, "client", InMemoryMongoClient())
+
+
+def make_queue(**overrides):
+    options = dict(
+        workers=2, max_pending=10, timeout=1.0, ttl_seconds=60, poll_interval=0.01
+    )
+    options.update(overrides)
+    return JobQueue("test_jobs", **options)
+
+
+def test_long_poll_returns_the_result():
+    queue = make_queue()
+
+    async def handler(params):
+        await asyncio.sleep(0.05)
+        return {"doubled": params["n"] * 2}
+
+    queue.register("double", handler)
+
+    async def run():
+        job_id = await queue.submit("double", {"n": 21})
+        first = await queue.get(job_id)
+        done = await queue.get(job_id, wait=1.0)
+        await queue.stop()
+        return first, done
+
+    first, done = asyncio.run(run())
+    assert first["status"] in ("queued", "running")
+    assert done["status"] == "succeeded"
+    assert done["result"] == {"doubled": 42}
+    assert done["finished_at"] is not None
+
+
+def test_failed_job_keeps_the_http_error():
+    queue = make_queue()
+
+    async def handler(params):
+        raise HTTPException(status_code=404, detail="User not found")
+
+    queue.register("missing", handler)
+
+    async def run():
+        job_id = await queue.submit("missing", {})
+        return await queue.get(job_id, wait=1.0)
+
+    job = asyncio.run(run())
+    assert job["status"] == "failed"
+    assert job["error"] == {"status_code": 404, "detail": "User not found"}
+
+
+def test_full_queue_sheds_load_and_stop_fails_pending_jobs():
+    queue = make_queue(workers=1, max_pending=2)
+
+    async def handler(params):
+        await asyncio.sleep(10)
+
+    queue.register("slow", handler)
+
+    async def run():
+        job_ids = [await queue.submit("slow", {}) for _ in range(2)]
+        with pytest.raises(JobQueueFullError):
+            await queue.submit("slow", {})
+        await asyncio.sleep(0.01)
+        assert queue.stats()["running"] == 1
+        await queue.stop()
+        return [await queue.get(job_id) for job_id in job_ids]
+
+    jobs = asyncio.run(run())
+    assert [job["status"] for job in jobs] == ["failed", "failed"]
+    assert jobs[0]["error"]["status_code"] == 503
+    assert queue.stats()["rejected"] == 1
+
+
+def test_concurrent_submits_cannot_overfill_the_queue():
+    queue = make_queue(workers=1, max_pending=2)
+    collection = queue.jobs_collection
+
+    class SlowInserts:
+        def __getattr__(self, name):
+            return getattr(collection(), name)
+
+        async def insert_one(self, doc):
+            await asyncio.sleep(0.01)
+            return await collection().insert_one(doc)
+
+    queue.jobs_collection = SlowInserts
+
+    async def handler(params):
+        await asyncio.sleep(10)
+
+    queue.register("slow", handler)
+
+    async def run():
+        results = await asyncio.gather(
+            *(queue.submit("slow", {}) for _ in range(3)), return_exceptions=True
+        )
+        await queue.stop()
+        return results
+
+    results = asyncio.run(run())
+    assert sum(isinstance(r, JobQueueFullError) for r in results) == 1
+    assert queue.stats()["submitted"] == 2
+
+
+def test_gem_suggestion_in_background(monkeypatch):
+    async def load_user(user_id):
+        if user_id != "u1":
+            raise HTTPException(status_code=404, detail="User not found")
+
+    async def fetch_gem_suggestion(user):
+        return {"response": {"LIFE": {"name": "Ruby", "semi_gem": "Garnet"}}}
+
+    async def add_gem_descriptions(response):
+        await asyncio.sleep(0.05)
+        response["response"]["LIFE"]["gem_description"] = "Ruby is red"
+
+    monkeypatch.setattr(horoscope, "load_user", load_user)
+    monkeypatch.setattr(horoscope, "fetch_gem_suggestion", fetch_gem_suggestion)
+    monkeypatch.setattr(horoscope, "add_gem_descriptions", add_gem_descriptions)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://app"
+        ) as client:
+            missing = await client.post(
+                "/api/horoscope/gem-suggestion",
+                params={"user_id": "nobody", "background": True},
+            )
+            accepted = await client.post(
+                "/api/horoscope/gem-suggestion",
+                params={"user_id": "u1", "background": True},
+            )
+            polled = await client.get(accepted.headers["location"], params={"wait": 5})
+            unknown = await client.get("/api/jobs/nope")
+        await job_queue.stop()
+        return missing, accepted, polled, unknown
+
+    missing, accepted, polled, unknown = asyncio.run(run())
+    assert missing.status_code == 404
+    assert accepted.status_code == 202
+    assert accepted.json()["status"] == "queued"
+    job = polled.json()
+    assert job["status"] == "succeeded"
+    assert job["result"]["response"]["LIFE"]["gem_description"] == "Ruby is red"
+    assert unknown.status_code == 404
+
+
+def test_new_users_are_served_precomputed_results(monkeypatch):
+    monkeypatch.setattr(settings, "PREFETCH_ON_CREATE", True)
+    user = fakes.make_users(1)[0].model_dump(mode="json")
+
+    def upstream_calls():
+        return sum(
+            metrics.upstream_request_duration.count((name, "ok"))
+            for name in ("astrology", "vedicrishi")
+        )
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://app"
+        ) as client:
+            created = (await client.post("/api/user/", json=user)).json()
+            job = (
+                await client.get(
+                    f"/api/jobs/{created['prefetch_job_id']}", params={"wait": 5}
+                )
+            ).json()
+            # As on another worker: only the shared MongoDB tier is warm
+            horoscope.chart_cache.memory.clear()
+            before = upstream_calls()
+            chart = await client.post(
+                "/api/horoscope/rasi-chart", params={"user_id": user["user_id"]}
+            )
+            gems = await client.post(
+                "/api/horoscope/gem-suggestion", params={"user_id": user["user_id"]}
+            )
+            after = upstream_calls()
+        await job_queue.stop()
+        return job, chart, gems, after - before
+
+    with fakes.fake_environment(fakes.Faults(), fakes.Faults()):
+        job, chart, gems, calls = asyncio.run(run())
+    assert job["status"] == "succeeded"
+    assert job["result"]["errors"] == {}
+    assert chart.status_code == 200
+    assert all("gem_description" in gem for gem in gems.json()["response"].values())
+    assert calls == 0
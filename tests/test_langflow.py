@@ -0,0 +1,152 @@
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.margdarshak_backend.core import langflow as langflow_module
+from src.margdarshak_backend.core.http import HTTPClient
+from src.margdarshak_backend.core.langflow import FlowMap, LangflowGateway
+from src.margdarshak_backend.main import app
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def langflow_upstream(monkeypatch):
+    """Route the shared langflow client to an in-process handler."""
+    state = {"in_flight": 0, "peak": 0, "delay": 0.0, "urls": []}
+
+    async def handler(request):
+        state["urls"].append(str(request.url))
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        try:
+            await asyncio.sleep(state["delay"])
+        finally:
+            state["in_flight"] -= 1
+        if request.url.params.get("stream") == "true":
+            return httpx.Response(
+                200,
+                content=b'data: {"chunk": "Hel"}\n\ndata: {"chunk": "lo"}\n\n',
+                headers={"content-type": "text/event-stream"},
+            )
+        return httpx.Response(
+            200, json={"outputs": json.loads(request.content)["input_value"]}
+        )
+
+    monkeypatch.setitem(
+        HTTPClient.clients,
+        "langflow",
+        httpx.AsyncClient(
+            base_url="http://langflow.test", transport=httpx.MockTransport(handler)
+        ),
+    )
+    return state
+
+
+def write_flows(path, flows, mtime):
+    path.write_text(json.dumps(flows))
+    os.utime(path, (mtime, mtime))
+
+
+def test_flow_map_reloads_when_file_changes(tmp_path):
+    path = tmp_path / "flows.json"
+    write_flows(path, {"chat": "abc"}, 1000)
+    flows = FlowMap(str(path))
+    assert flows.get("chat").endpoint == "abc"
+    assert flows.get("raw-id").endpoint == "raw-id"
+    assert not flows.get("raw-id").configured
+
+    write_flows(
+        path, {"chat": {"endpoint": "def", "timeout": 5, "max_concurrency": 2}}, 2000
+    )
+    assert flows.get("chat") == ("def", 5.0, 2, True)
+
+    path.write_text("{not json")
+    os.utime(path, (3000, 3000))
+    assert flows.get("chat").endpoint == "def"
+
+
+def test_gateway_bounds_concurrency_and_times_out(tmp_path, langflow_upstream):
+    path = tmp_path / "flows.json"
+    write_flows(
+        path, {"chat": {"endpoint": "abc", "timeout": 0.2, "max_concurrency": 2}}, 1000
+    )
+    gateway = LangflowGateway(FlowMap(str(path)))
+    langflow_upstream["delay"] = 0.02
+
+    async def run_many():
+        return await asyncio.gather(
+            *(gateway.run("chat", {"input_value": str(i)}) for i in range(6))
+        )
+
+    results = asyncio.run(run_many())
+    assert [r["outputs"] for r in results] == [str(i) for i in range(6)]
+    assert langflow_upstream["peak"] == 2
+    assert "/run/abc" in langflow_upstream["urls"][0]
+
+    langflow_upstream["delay"] = 1.0
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(gateway.run("chat", {"input_value": "slow"}))
+    assert gateway.stats()["timeouts"] == 1
+    assert gateway.stats()["in_flight"] == 0
+
+
+def test_unknown_flow_names_share_one_limit(tmp_path, monkeypatch, langflow_upstream):
+    monkeypatch.setattr(langflow_module.settings, "LANGFLOW_MAX_CONCURRENCY", 3)
+    path = tmp_path / "flows.json"
+    write_flows(path, {"chat": {"endpoint": "abc", "max_concurrency": 2}}, 1000)
+    gateway = LangflowGateway(FlowMap(str(path)))
+    langflow_upstream["delay"] = 0.02
+
+    async def run_many():
+        await asyncio.gather(
+            *(gateway.run(f"bogus-{i}", {"input_value": str(i)}) for i in range(20))
+        )
+
+    asyncio.run(run_many())
+    assert langflow_upstream["peak"] == 3
+
+    asyncio.run(gateway.run("chat", {"input_value": "hi"}))
+    assert len(gateway._semaphores) == 2
+
+
+def test_gateway_timeout_covers_queueing_and_the_run(tmp_path, langflow_upstream):
+    path = tmp_path / "flows.json"
+    write_flows(
+        path, {"chat": {"endpoint": "abc", "timeout": 0.3, "max_concurrency": 1}}, 1000
+    )
+    gateway = LangflowGateway(FlowMap(str(path)))
+    # Each phase fits the timeout on its own, but not both together
+    langflow_upstream["delay"] = 0.2
+
+    async def run_two():
+        return await asyncio.gather(
+            *(gateway.run("chat", {"input_value": str(i)}) for i in range(2)),
+            return_exceptions=True,
+        )
+
+    first, second = asyncio.run(run_two())
+    assert first == {"outputs": "0"}
+    assert isinstance(second, asyncio.TimeoutError)
+    assert gateway.stats()["timeouts"] == 1
+
+
+def test_execute_ai_streams_langflow_output(monkeypatch, langflow_upstream):
+    monkeypatch.setattr(langflow_module.langflow, "flows", FlowMap("missing.json"))
+    body = {"message": "hi", "endpoint": "chat"}
+
+    response = client.post(
+        "/api/langflow/execute_ai", params={"stream": "true"}, json=body
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == 'data: {"chunk": "Hel"}\n\ndata: {"chunk": "lo"}\n\n'
+    assert langflow_module.langflow.stats()["in_flight"] == 0
+
+    assert client.post("/api/langflow/execute_ai", json=body).json() == {
+        "outputs": "hi"
+    }
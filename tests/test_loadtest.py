@@ -0,0 +1,28 @@
+import asyncio
+
+from src.margdarshak_backend.core.database import MongoDB
+from src.margdarshak_backend.core.http import HTTPClient
+from src.margdarshak_backend.scripts import loadtest
+
+
+def test_every_route_succeeds_against_the_fakes():
+    results = asyncio.run(
+        loadtest.run_load_test(requests=3, concurrency=2, user_count=3)
+    )
+
+    assert len(results) == len(loadtest.endpoints(["u"]))
+    assert {r.name: r.errors for r in results if r.errors} == {}
+    assert all(r.p50_ms <= r.p99_ms for r in results)
+    # The fakes are uninstalled afterwards
+    assert MongoDB.client is None
+    assert HTTPClient.clients == {}
+
+
+def test_percentile_picks_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert loadtest.percentile(values, 0.50) == 50.0
+    assert loadtest.percentile(values, 0.99) == 99.0
+    assert loadtest.percentile(values, 0.0) == 1.0
+    assert loadtest.percentile(values, 1.0) == 100.0
+    assert loadtest.percentile([7.0], 0.5) == 7.0
+    assert loadtest.percentile([], 0.5) == 0.0
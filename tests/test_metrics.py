@@ -0,0 +1,72 @@
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+from fastapi.testclient import TestClient
+
+from src.margdarshak_backend.core import metrics, users
+from src.margdarshak_backend.main import app
+
+client = TestClient(app)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = metrics.Histogram(
+        "test_latency_seconds", "Test", ("op",), buckets=(0.1, 1.0)
+    )
+    try:
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(("read",), value)
+        lines = histogram.render()
+    finally:
+        del metrics.Metric.registry["test_latency_seconds"]
+
+    assert 'test_latency_seconds_bucket{op="read",le="0.1"} 1' in lines
+    assert 'test_latency_seconds_bucket{op="read",le="1"} 3' in lines
+    assert 'test_latency_seconds_bucket{op="read",le="+Inf"} 4' in lines
+    assert 'test_latency_seconds_count{op="read"} 4' in lines
+    assert 'test_latency_seconds_sum{op="read"} 4.25' in lines
+
+
+def test_routes_are_labelled_by_template(monkeypatch):
+    async def get_user(user_id):
+        return None
+
+    monkeypatch.setattr(users, "get_user", get_user)
+    labels = ("GET", "/api/user/{user_id}", "404")
+    before = metrics.http_request_duration.count(labels)
+    client.get("/api/user/nobody-1")
+    client.get("/api/user/nobody-2")
+    assert metrics.http_request_duration.count(labels) == before + 2
+
+    body = client.get("/api/metrics").text
+    assert 'route="/api/user/{user_id}",status="404"' in body
+    assert "# TYPE cache_hit_ratio gauge" in body
+    assert "# TYPE cache_hits_total counter" in body
+    assert "# TYPE gemini_tokens_total counter" in body
+
+
+def test_transport_records_latency_and_server_errors():
+    async def handler(request):
+        return httpx.Response(503 if request.url.path == "/down" else 200)
+
+    transport = metrics.MetricsTransport("test_upstream", httpx.MockTransport(handler))
+
+    async def run():
+        async with httpx.AsyncClient(
+            base_url="http://upstream.test", transport=transport
+        ) as c:
+            await c.get("/up")
+            await c.get("/down")
+
+    asyncio.run(run())
+    assert metrics.upstream_request_duration.count(("test_upstream", "ok")) == 1
+    assert metrics.upstream_errors.value(("test_upstream", "HTTP 503")) == 1
+
+
+def test_mongo_listener_times_commands():
+    before = metrics.mongodb_command_duration.count(("find", "ok"))
+    metrics.MongoCommandMetrics().succeeded(
+        SimpleNamespace(command_name="find", duration_micros=1500)
+    )
+    assert metrics.mongodb_command_duration.count(("find", "ok")) == before + 1
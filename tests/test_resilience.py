@@ -0,0 +1,185 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from src.margdarshak_backend.core import resilience
+from src.margdarshak_backend.core.http import HTTPClient
+from src.margdarshak_backend.core.resilience import (
+    UpstreamGuard,
+    UpstreamUnavailableError,
+)
+from src.margdarshak_backend.main import app
+
+client = TestClient(app)
+
+
+def make_guard(name, **overrides):
+    options = dict(
+        failure_threshold=3,
+        reset_timeout=30.0,
+        max_retries=2,
+        retry_base_delay=0.001,
+        retry_budget_ratio=0.1,
+        retry_budget_min=10,
+    )
+    options.update(overrides)
+    return UpstreamGuard(name, **options)
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    yield
+    for name in [name for name in UpstreamGuard.registry if name.startswith("test")]:
+        del UpstreamGuard.registry[name]
+
+
+def failing(calls, error):
+    async def fn():
+        calls.append(1)
+        raise error
+
+    return fn
+
+
+def test_transient_errors_are_retried():
+    guard = make_guard("test_retry")
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise httpx.ConnectError("refused")
+        return "ok"
+
+    assert asyncio.run(guard.call(flaky)) == "ok"
+    assert len(attempts) == 3
+    assert guard.stats()["retries"] == 2
+    assert guard.breaker.state == resilience.CLOSED
+
+
+def test_client_errors_are_not_retried_and_keep_circuit_closed():
+    guard = make_guard("test_4xx", failure_threshold=1)
+    request = httpx.Request("POST", "http://upstream.test/")
+    error = httpx.HTTPStatusError(
+        "bad", request=request, response=httpx.Response(400, request=request)
+    )
+    calls = []
+
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(guard.call(failing(calls, error)))
+    assert len(calls) == 1
+    assert guard.breaker.state == resilience.CLOSED
+
+
+def test_open_circuit_fails_fast_then_half_opens(monkeypatch):
+    guard = make_guard("test_open", max_retries=0, reset_timeout=10.0)
+    calls = []
+    for _ in range(3):
+        with pytest.raises(httpx.ReadTimeout):
+            asyncio.run(guard.call(failing(calls, httpx.ReadTimeout("slow"))))
+    assert guard.breaker.state == resilience.OPEN
+
+    with pytest.raises(UpstreamUnavailableError) as info:
+        asyncio.run(guard.call(failing(calls, httpx.ReadTimeout("slow"))))
+    assert info.value.status_code == 503
+    assert len(calls) == 3
+
+    # After the reset timeout one trial call goes through and closes the circuit
+    now = resilience.time.monotonic()
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now + 11.0)
+
+    async def ok():
+        return "ok"
+
+    assert asyncio.run(guard.call(ok)) == "ok"
+    assert guard.breaker.state == resilience.CLOSED
+
+
+def test_failed_trial_reopens_circuit(monkeypatch):
+    guard = make_guard(
+        "test_trial", failure_threshold=1, max_retries=0, reset_timeout=10.0
+    )
+    calls = []
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(guard.call(failing(calls, httpx.ConnectError("refused"))))
+
+    now = resilience.time.monotonic()
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now + 11.0)
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(guard.call(failing(calls, httpx.ConnectError("refused"))))
+    assert guard.breaker.state == resilience.OPEN
+    assert guard.breaker.times_opened == 2
+
+
+def test_retry_budget_limits_retries():
+    guard = make_guard(
+        "test_budget", failure_threshold=100, retry_budget_min=2, retry_budget_ratio=0.0
+    )
+    calls = []
+    for _ in range(3):
+        with pytest.raises(httpx.ConnectError):
+            asyncio.run(guard.call(failing(calls, httpx.ConnectError("refused"))))
+    # Two retries from the budget, then every call is a single attempt
+    assert len(calls) == 5
+    assert guard.stats()["budget_exhausted"] == 2
+
+
+def test_request_json_fails_fast_when_upstream_is_down(monkeypatch):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(503)
+
+    monkeypatch.setitem(
+        HTTPClient.clients,
+        "test_upstream",
+        httpx.AsyncClient(
+            base_url="http://upstream.test", transport=httpx.MockTransport(handler)
+        ),
+    )
+    UpstreamGuard.registry["test_upstream"] = make_guard("test_upstream", max_retries=1)
+
+    async def run():
+        for _ in range(2):
+            with pytest.raises(httpx.HTTPStatusError):
+                await HTTPClient.request_json(
+                    "test_upstream", "POST", "/chart", json={}
+                )
+        with pytest.raises(UpstreamUnavailableError):
+            await HTTPClient.request_json("test_upstream", "POST", "/chart", json={})
+
+    asyncio.run(run())
+    assert len(requests) == 3
+
+    body = client.get("/api/health/upstreams").json()
+    assert body["status"] == "degraded"
+    assert body["upstreams"]["test_upstream"]["state"] == "open"
+    assert client.get("/api/health").json() == {"status": "healthy"}
+
+
+def test_retries_stop_at_the_call_deadline():
+    guard = make_guard(
+        "test_deadline", failure_threshold=10, max_retries=10, deadline=0.1
+    )
+    guard._backoff = lambda attempt: 0.06
+    attempts = []
+
+    async def slow_then_failing():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise httpx.ConnectError("refused")
+        await asyncio.sleep(1.0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(guard.call(slow_then_failing))
+    assert len(attempts) == 2
+
+    # The second backoff would end past the deadline, so it is not waited
+    calls = []
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(guard.call(failing(calls, httpx.ConnectError("refused"))))
+    assert len(calls) == 2
+    assert guard.stats()["deadline_exceeded"] == 2
@@ -1,4 +1,8 @@
+import subprocess
+import sys
+
 from fastapi.testclient import TestClient
+
 from src.margdarshak_backend.main import app
 
 client = TestClient(app)
@@ -12,3 +16,14 @@ def test_root():
     response = client.get("/api/")
     assert response.status_code == 200
     assert response.json() == {"message": "Welcome to MargDarshak Backend"}
+
+def test_app_import_defers_heavy_dependencies():
+    code = (
+        "import sys, src.margdarshak_backend.main; "
+        "heavy = ('numpy', 'PIL', 'google.generativeai'); "
+        "print([m for m in heavy if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,45 @@
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+
+from src.margdarshak_backend.core import server
+from src.margdarshak_backend.core.config import settings
+from src.margdarshak_backend.main import app
+
+client = TestClient(app)
+
+
+def test_development_runs_one_reloading_worker(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_ENV", "development")
+    options = server.uvicorn_options()
+    assert options["reload"] is True
+    assert options["workers"] == 1
+
+
+def test_production_runs_a_worker_per_core(monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_ENV", "production")
+    monkeypatch.setattr(settings, "SERVER_WORKERS", None)
+    monkeypatch.setattr(server.os, "cpu_count", lambda: 6)
+    options = server.uvicorn_options()
+    assert options["reload"] is False
+    assert options["workers"] == 6
+    assert options["loop"] == ("uvloop" if server.UVLOOP_AVAILABLE else "asyncio")
+    assert options["http"] == ("httptools" if server.HTTPTOOLS_AVAILABLE else "h11")
+
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 3)
+    assert server.uvicorn_options()["workers"] == 3
+
+
+def test_production_disables_debug(monkeypatch):
+    monkeypatch.setattr(settings, "DEBUG_MODE", True)
+    monkeypatch.setattr(settings, "SERVER_ENV", "production")
+    assert settings.debug_enabled is False
+
+
+def test_responses_are_encoded_with_orjson():
+    health = next(
+        route for route in app.routes if getattr(route, "path", "") == "/api/health"
+    )
+    assert health.response_class is ORJSONResponse
+    response = client.get("/api/health")
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == b'{"status":"healthy"}'
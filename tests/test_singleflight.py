@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from src.margdarshak_backend.core.singleflight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    group = SingleFlight("test-share")
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"ok": True}
+
+    async def run():
+        return await asyncio.gather(*(group.do("k", fetch) for _ in range(10)))
+
+    results = asyncio.run(run())
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+    assert group.stats() == {
+        "calls": 10,
+        "executions": 1,
+        "collapsed": 9,
+        "in_flight": 0,
+    }
+    SingleFlight.registry.pop("test-share")
+
+
+def test_errors_propagate_to_every_caller_and_are_not_cached():
+    group = SingleFlight("test-error")
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    async def run():
+        results = await asyncio.gather(
+            group.do("k", fail), group.do("k", fail), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+        with pytest.raises(RuntimeError):
+            await group.do("k", fail)
+
+    asyncio.run(run())
+    assert group.executions == 2
+    SingleFlight.registry.pop("test-error")
@@ -0,0 +1,260 @@
+import asyncio
+import json
+from datetime import datetime, time, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from pymongo.errors import BulkWriteError
+
+from src.margdarshak_backend.core import users
+from src.margdarshak_backend.core.cache import TTLCache
+from src.margdarshak_backend.main import app
+from src.margdarshak_backend.models.user import UserData
+
+client = TestClient(app)
+
+
+DATE_FIELDS = ("date_of_birth", "time_of_birth", "created_at")
+
+
+class FakeCollection:
+    def __init__(self):
+        self.docs = {}
+        self.finds = 0
+
+    async def find_one(self, query, projection=None):
+        self.finds += 1
+        doc = self.docs.get(query["user_id"])
+        return dict(doc) if doc else None
+
+    async def insert_one(self, doc):
+        self.docs[doc["user_id"]] = doc
+
+    async def insert_many(self, docs, ordered=True):
+        errors = []
+        for index, doc in enumerate(docs):
+            if doc["user_id"] in self.docs:
+                errors.append(
+                    {"index": index, "code": 11000, "errmsg": "duplicate key"}
+                )
+            else:
+                self.docs[doc["user_id"]] = doc
+        if errors:
+            raise BulkWriteError(
+                {"nInserted": len(docs) - len(errors), "writeErrors": errors}
+            )
+        return SimpleNamespace(inserted_ids=[doc["user_id"] for doc in docs])
+
+    def find(self, query, projection=None, batch_size=None):
+        async def cursor():
+            for doc in list(self.docs.values()):
+                if query and not any(isinstance(doc[f], str) for f in DATE_FIELDS):
+                    continue
+                yield doc
+        return cursor()
+
+    async def bulk_write(self, requests, ordered=True):
+        for request in requests:
+            user_id = request._filter["_id"]
+            self.docs[user_id].update(request._doc["$set"])
+        return SimpleNamespace(modified_count=len(requests))
+
+
+def make_user(**overrides):
+    fields = dict(
+        name="Test",
+        date_of_birth=datetime(1990, 5, 17),
+        time_of_birth=time(6, 30, 0),
+        gender="female",
+        state="Delhi",
+        city="Delhi",
+    )
+    fields.update(overrides)
+    return UserData(**fields)
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(
+        "src.margdarshak_backend.core.cache.time.monotonic", lambda: now[0]
+    )
+    cache = TTLCache(maxsize=2, ttl_seconds=10)
+
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    now[0] += 11
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_get_user_is_cached_and_create_assigns_id(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(users, "user_collection", lambda: collection)
+    monkeypatch.setattr(users, "user_cache", TTLCache(maxsize=10, ttl_seconds=60))
+
+    async def scenario():
+        user_id = await users.create_user(make_user())
+        first = await users.get_user(user_id)
+        second = await users.get_user(user_id)
+        missing = await users.get_user("nobody")
+        return user_id, first, second, missing
+
+    user_id, first, second, missing = asyncio.run(scenario())
+
+    assert len(user_id) == 32
+    assert first.user_id == user_id
+    assert first.time_of_birth == time(6, 30, 0)
+    assert second is first
+    assert missing is None
+    assert collection.finds == 2
+
+
+def test_precomputed_results_come_with_the_profile_and_expire(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(users, "user_collection", lambda: collection)
+    monkeypatch.setattr(users, "user_cache", TTLCache(maxsize=10, ttl_seconds=60))
+    # MongoDB returns stored UTC datetimes naive
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    stale = now - timedelta(seconds=users.settings.PRECOMPUTE_MAX_AGE_SECONDS + 60)
+    doc = make_user(user_id="u1").to_document()
+    doc["precomputed"] = {
+        "gem_suggestion": {"value": {"LIFE": "Ruby"}, "computed_at": now},
+        "old": {"value": 1, "computed_at": stale},
+    }
+    collection.docs[doc["user_id"]] = doc
+
+    async def scenario():
+        user = await users.get_user(doc["user_id"])
+        precomputed = await users.get_precomputed(doc["user_id"])
+        return user, precomputed
+
+    user, precomputed = asyncio.run(scenario())
+    assert user.user_id == doc["user_id"]
+    assert precomputed == {"gem_suggestion": {"LIFE": "Ruby"}}
+    assert collection.finds == 1
+
+
+def test_user_routes_return_created_id_and_404(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(users, "user_collection", lambda: collection)
+    monkeypatch.setattr(users, "user_cache", TTLCache(maxsize=10, ttl_seconds=60))
+
+    response = client.post("/api/user/", json=make_user(user_id="u42").model_dump())
+    assert response.status_code == 200
+    assert response.json()["user_id"] == "u42"
+    assert client.get("/api/user/u42").json()["name"] == "Test"
+    assert client.get("/api/user/missing").status_code == 404
+
+
+def test_bulk_import_reports_bad_lines_and_export_streams(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(users, "user_collection", lambda: collection)
+    monkeypatch.setattr(users.settings, "USER_IMPORT_CHUNK_SIZE", 2)
+    monkeypatch.setattr(users.settings, "USER_EXPORT_ENABLED", True)
+    records = [make_user(user_id=f"u{i}").model_dump() for i in range(3)]
+    body = "\n".join(
+        [json.dumps(records[0]), json.dumps(records[1]), "not json", "",
+         json.dumps(records[2]), json.dumps(records[0])]
+    )
+
+    response = client.post("/api/user/bulk", content=body.encode())
+    assert response.status_code == 200
+    report = response.json()
+    assert report["inserted"] == 3
+    assert report["failed"] == 2
+    assert [error["line"] for error in report["errors"]] == [3, 6]
+
+    exported = client.get("/api/user/export")
+    assert exported.headers["content-type"] == "application/x-ndjson"
+    lines = exported.text.splitlines()
+    assert [json.loads(line)["user_id"] for line in lines] == ["u0", "u1", "u2"]
+
+
+def test_iter_ndjson_handles_lines_split_across_chunks():
+    from src.margdarshak_backend.core.streaming import iter_ndjson
+
+    async def chunks():
+        for chunk in (b'{"a": 1}\n{"b"', b': 2}\n\n', b'{"c": 3}'):
+            yield chunk
+
+    async def collect():
+        return [item async for item in iter_ndjson(chunks())]
+
+    assert asyncio.run(collect()) == [
+        (1, b'{"a": 1}'),
+        (2, b'{"b": 2}'),
+        (4, b'{"c": 3}'),
+    ]
+
+
+def test_overlong_import_lines_are_rejected_and_export_is_gated(monkeypatch):
+    from src.margdarshak_backend.core.streaming import LineTooLongError, iter_ndjson
+
+    monkeypatch.setattr(users, "user_collection", lambda: FakeCollection())
+    monkeypatch.setattr(users.settings, "USER_IMPORT_MAX_LINE_BYTES", 16)
+
+    async def chunks():
+        yield b'{"a": 1}\n{"b": '
+        yield b"1" * 20
+
+    async def collect():
+        return [item async for item in iter_ndjson(chunks(), 16)]
+
+    with pytest.raises(LineTooLongError) as excinfo:
+        asyncio.run(collect())
+    assert excinfo.value.line_number == 2
+
+    line = b'{"name": "' + b"x" * 32 + b'"}\n'
+    response = client.post("/api/user/bulk", content=line)
+    assert response.status_code == 413
+    assert client.get("/api/user/export").status_code == 403
+
+
+def test_document_codec_round_trips_native_datetimes():
+    user = make_user(user_id="u1")
+    doc = user.to_document()
+
+    assert doc["date_of_birth"] == datetime(1990, 5, 17)
+    assert doc["time_of_birth"] == datetime(1990, 5, 17, 6, 30)
+    assert UserData.from_document(doc) == user
+    # Legacy string documents still decode
+    assert UserData.from_document(user.model_dump()) == user
+
+
+def test_document_codec_keeps_local_birth_time_with_offset():
+    ist = timezone(timedelta(hours=5, minutes=30))
+    user = make_user(
+        user_id="u1",
+        date_of_birth=datetime(1990, 5, 17, tzinfo=ist),
+        time_of_birth=time(6, 30, tzinfo=ist),
+    )
+    doc = user.to_document()
+
+    # Stored as the local wall clock, not shifted to 01:00 UTC
+    assert doc["date_of_birth"] == datetime(1990, 5, 17)
+    assert doc["time_of_birth"] == datetime(1990, 5, 17, 6, 30)
+    assert doc["birth_utc_offsets"] == {"date_of_birth": 330, "time_of_birth": 330}
+    decoded = UserData.from_document(doc)
+    assert decoded == user
+    assert decoded.time_of_birth.utcoffset() == timedelta(hours=5, minutes=30)
+
+
+def test_migrate_legacy_dates_rewrites_string_documents(monkeypatch):
+    collection = FakeCollection()
+    legacy = make_user(user_id="old").model_dump()
+    bad = {**legacy, "_id": "bad", "user_id": "bad", "date_of_birth": "someday"}
+    collection.docs = {
+        "old": {**legacy, "_id": "old"},
+        "bad": bad,
+        "new": make_user(user_id="new").to_document(),
+    }
+    monkeypatch.setattr(users, "user_collection", lambda: collection)
+
+    report = asyncio.run(users.migrate_legacy_dates())
+    assert (report["migrated"], report["skipped"]) == (1, 1)
+    assert report["errors"][0]["_id"] == "bad"
+    assert collection.docs["old"]["time_of_birth"] == datetime(1990, 5, 17, 6, 30)
+    assert collection.docs["bad"]["date_of_birth"] == "someday"
+    assert asyncio.run(users.migrate_legacy_dates())["migrated"] == 0
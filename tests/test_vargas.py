@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from src.margdarshak_backend.core.ephemeris import SIGNS
+from src.margdarshak_backend.core.vargas import VARGA_TABLES, derive_vargas, varga_signs
+from src.margdarshak_backend.models.horoscope import ChartType
+
+
+@pytest.mark.parametrize(
+    "chart_type, longitude, expected",
+    [
+        (ChartType.D1, 45.0, "Taurus"),
+        (ChartType.D2, 5.0, "Leo"),
+        (ChartType.D2, 50.0, "Leo"),
+        (ChartType.D3, 25.0, "Sagittarius"),
+        (ChartType.D9, 0.5, "Aries"),
+        (ChartType.D9, 29.9, "Sagittarius"),
+        (ChartType.D9, 30.5, "Capricorn"),
+        (ChartType.D10, 30.5, "Capricorn"),
+        (ChartType.D12, 29.9, "Pisces"),
+        (ChartType.D30, 6.0, "Aquarius"),
+        (ChartType.D30, 36.0, "Virgo"),
+        (ChartType.D60, 29.9, "Pisces"),
+    ],
+)
+def test_varga_sign_rules(chart_type, longitude, expected):
+    assert SIGNS[varga_signs(np.array([longitude]), chart_type)[0]] == expected
+
+
+def test_every_chart_type_has_a_table():
+    assert set(VARGA_TABLES) == set(ChartType)
+
+
+def test_derive_vargas_uses_whole_sign_houses_from_varga_ascendant():
+    charts = derive_vargas(
+        {"Ascendant": 45.0, "Sun": 100.0, "Moon": 200.0},
+        [ChartType.D1, ChartType.D9],
+    )
+    assert list(charts) == ["d1", "d9"]
+    d1 = charts["d1"]
+    assert d1["ascendant"] == {"sign": "Taurus", "sign_num": 2}
+    assert [(p["name"], p["sign"], p["house"]) for p in d1["planets"]] == [
+        ("Sun", "Cancer", 3),
+        ("Moon", "Libra", 6),
+    ]